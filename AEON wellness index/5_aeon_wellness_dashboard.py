@@ -7,317 +7,401 @@ This script creates a comprehensive wellness dashboard with 4 pillars:
 - ENV (20%): Environmental Factors
 - COG (10%): Cognitive/Digital Wellness
 
+Usage:
+    python 5_aeon_wellness_dashboard.py               # scores, dashboard PNG and summary report
+    python 5_aeon_wellness_dashboard.py --no-plots    # headless: never imports matplotlib/seaborn
+    python 5_aeon_wellness_dashboard.py --plots-only  # redraw the dashboard from the aeon_rollups/ cache
+    python 5_aeon_wellness_dashboard.py --incremental # score only minutes newer than aeon_index_state.npz
+    python 5_aeon_wellness_dashboard.py --plots-only --downsample none  # draw every minute (render-time baseline)
+
 Author: AEON Wellness Analytics
 """
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-# Set style for better visualizations
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+from aeon.index import STATE_FILE as AEON_STATE_FILE
+from aeon.components import CACHE_DIR as COMPONENT_CACHE_DIR
+from aeon.components import ComponentStore
+from aeon.downsample import METHODS as DOWNSAMPLE_METHODS
+from aeon.downsample import downsample_indices
+from aeon.index import AeonIndexer, to_utc_ns
+from aeon.rollups import CACHE_DIR as ROLLUP_CACHE_DIR
+from aeon.rollups import AeonRollups
+from features.loader import load_features, parse_datetimes
+from store.score_store import join_scores, read_scores
+
+AEON_INPUT_COLUMNS = [
+    'stress_level', 'heart_rate', 'body_battery', 'sleep_duration_of_day',
+    'rain_mm', 'wind_speed_kmh', 'temperature_celsius', 'screen_streak_minutes', 'phone_active',
+]
+CSV_PATH = 'health_net_features_2_normalize.csv'
+# Score store keyed by window-end timestamp (written by bio_exclusive_vae.py / score_bio_vae.py)
+BIO_SCORES_PATH = '../EXO-model/bio_stability_scores'
+SCORES_OUTPUT = 'aeon_wellness_scores.csv'
+DASHBOARD_OUTPUT = 'aeon_wellness_dashboard.png'
+DASHBOARD_DPI = 300
+
 
 # ============================================================================
 # 1. LOAD DATA
 # ============================================================================
-print("=" * 70)
-print("AEON WELLNESS INDEX DASHBOARD")
-print("=" * 70)
-print("\n[1/5] Loading data...")
-
-# Load normalized CSV data
-csv_path = 'health_net_features_2_normalize.csv'
-if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
-    try:
-        from store.cassandra_client import export_minute_features_csv
-
-        export_path = export_minute_features_csv(
-            output_path='output/streaming/exports/aeon_minute_features.csv',
-            limit=250000
-        )
-        if Path(export_path).exists():
-            csv_path = export_path
-            print(f"  Using Cassandra-exported data: {csv_path}")
-    except Exception as exc:
-        print(f"  ⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
-
-df = pd.read_csv(csv_path)
-df['datetime'] = pd.to_datetime(df['datetime'])
-
-# Load bio stability scores
-bio_scores = np.load('../EXO-model/bio_stability_scores.npy')
-
-# Align lengths - trim the start of CSV to match bio_scores length
-trim_amount = len(df) - len(bio_scores)
-df_aligned = df.iloc[trim_amount:].reset_index(drop=True)
-
-# Verify alignment
-assert len(df_aligned) == len(bio_scores), f"Length mismatch: {len(df_aligned)} vs {len(bio_scores)}"
-print(f"  Trimmed {trim_amount} records from start of CSV")
-print(f"✓ Data loaded: {len(df_aligned)} records aligned")
-print(f"  Date range: {df_aligned['datetime'].min()} to {df_aligned['datetime'].max()}")
+def resolve_csv_path(csv_path=CSV_PATH):
+    if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
+        try:
+            from store.export_cache import cached_minute_features_csv
+
+            export_path = cached_minute_features_csv()
+            if Path(export_path).exists():
+                print(f"  Using Cassandra-exported data: {export_path}")
+                return export_path
+        except Exception as exc:
+            print(f"  ⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
+    return csv_path
+
+
+def load_data(csv_path=CSV_PATH, bio_scores_path=BIO_SCORES_PATH, since=None):
+    """Pillar inputs joined with the bio stability scores on time: (df_aligned, bio_scores).
+
+    With `since`, only minutes from that instant on are read (incremental runs).
+    """
+    # Only the pillar inputs are read (float32, chunked); datetime becomes a parsed column again
+    df = load_features(csv_path, columns=AEON_INPUT_COLUMNS, since=since).reset_index()
+
+    if str(bio_scores_path).endswith('.npy'):
+        return _load_data_by_length(df, bio_scores_path)
+
+    # Each minute takes the score of the window ending on it; minutes without a score are dropped
+    scores = read_scores(bio_scores_path, start=df['datetime'].min(), end=df['datetime'].max(),
+                         columns=['bio_stability_score'])
+    df_aligned = join_scores(df, scores, on='datetime', columns=['bio_stability_score'])
+    bio_scores = df_aligned.pop('bio_stability_score').to_numpy()
+    if not len(df_aligned) and since is None:
+        raise ValueError(f"No bio stability scores in {bio_scores_path} match the minutes of {csv_path}")
+
+    print(f"  Joined {len(scores):,} scored windows on window-end time "
+          f"({len(df) - len(df_aligned):,} minutes without a score)")
+    print(f"✓ Data loaded: {len(df_aligned)} records aligned")
+    print(f"  Date range: {df_aligned['datetime'].min()} to {df_aligned['datetime'].max()}")
+    return df_aligned, bio_scores
+
+
+def _load_data_by_length(df, bio_scores_path):
+    # Legacy bio_stability_scores.npy has no timestamps: it only lines up with the tail of the CSV
+    # when both come from the same run
+    bio_scores = np.load(bio_scores_path)
+    trim_amount = len(df) - len(bio_scores)
+    df_aligned = df.iloc[trim_amount:].reset_index(drop=True)
+    assert len(df_aligned) == len(bio_scores), f"Length mismatch: {len(df_aligned)} vs {len(bio_scores)}"
+    print(f"  ⚠ Legacy .npy scores: trimmed {trim_amount} records from start of CSV")
+    print(f"✓ Data loaded: {len(df_aligned)} records aligned")
+    print(f"  Date range: {df_aligned['datetime'].min()} to {df_aligned['datetime'].max()}")
+    return df_aligned, bio_scores
+
 
 # ============================================================================
 # 2. DEFINE WELLNESS PILLARS (0-100 SCALE)
 # ============================================================================
-print("\n[2/5] Calculating wellness pillars...")
+def compute_pillars(df_aligned, bio_scores, indexer=None, components_dir=None, append=False):
+    """Pillar scores, AEON_Index and AEON_7Day_Avg via the aeon.index library.
 
-def z_to_score(z_score, invert=False):
-    """
-    Convert Z-Score to 0-100 scale.
-    
-    Args:
-        z_score: Standardized Z-score
-        invert: If True, higher Z-score = lower wellness (for "bad" metrics)
-    
-    Returns:
-        Score clipped between 0 and 100
+    Pass a loaded AeonIndexer to continue from persisted state; a fresh one
+    scores the whole history. With `components_dir`, the component z-values are
+    cached there for re-weighting (appended when `append`).
     """
-    if invert:
-        # For "bad" things like stress: higher Z = lower score
-        score = 50 - (z_score * 10)
-    else:
-        # For "good" things like battery: higher Z = higher score
-        score = 50 + (z_score * 10)
-    
-    return np.clip(score, 0, 100)
-
-# Create a copy for calculations
-wellness_df = df_aligned.copy()
-
-# --- BIO PILLAR (40%): Biological/Physical Health ---
-# Components: Inverted Stress, Inverted HR, Body Battery, Bio Stability Score
-wellness_df['stress_score'] = z_to_score(wellness_df['stress_level'], invert=True)
-wellness_df['hr_score'] = z_to_score(wellness_df['heart_rate'], invert=True)
-wellness_df['battery_score'] = z_to_score(wellness_df['body_battery'], invert=False)
-
-# Convert bio_stability_scores (reconstruction error) to 0-100 scale
-# Lower reconstruction error = better stability = higher score
-bio_stability_z = (bio_scores - bio_scores.mean()) / bio_scores.std()
-wellness_df['bio_stability_score'] = z_to_score(bio_stability_z, invert=True)
-
-wellness_df['BIO_Score'] = (
-    wellness_df['stress_score'] + 
-    wellness_df['hr_score'] + 
-    wellness_df['battery_score'] + 
-    wellness_df['bio_stability_score']
-) / 4
-
-# --- SLEEP PILLAR (30%): Sleep Quality ---
-wellness_df['SLEEP_Score'] = z_to_score(wellness_df['sleep_duration_of_day'], invert=False)
-
-# --- ENV PILLAR (20%): Environmental Factors ---
-wellness_df['rain_score'] = z_to_score(wellness_df['rain_mm'], invert=True)
-wellness_df['wind_score'] = z_to_score(wellness_df['wind_speed_kmh'], invert=True)
-
-# Temperature deviation (distance from comfortable 20°C)
-temp_deviation = np.abs(wellness_df['temperature_celsius'])
-temp_deviation_z = (temp_deviation - temp_deviation.mean()) / temp_deviation.std()
-wellness_df['temp_score'] = z_to_score(temp_deviation_z, invert=True)
-
-wellness_df['ENV_Score'] = (
-    wellness_df['rain_score'] + 
-    wellness_df['wind_score'] + 
-    wellness_df['temp_score']
-) / 3
-
-# --- COG PILLAR (10%): Cognitive/Digital Wellness ---
-wellness_df['screen_score'] = z_to_score(wellness_df['screen_streak_minutes'], invert=True)
-wellness_df['phone_score'] = z_to_score(wellness_df['phone_active'], invert=True)
-
-wellness_df['COG_Score'] = (
-    wellness_df['screen_score'] + 
-    wellness_df['phone_score']
-) / 2
-
-print("✓ Wellness pillars calculated:")
-print(f"  BIO Score:   {wellness_df['BIO_Score'].mean():.1f} ± {wellness_df['BIO_Score'].std():.1f}")
-print(f"  SLEEP Score: {wellness_df['SLEEP_Score'].mean():.1f} ± {wellness_df['SLEEP_Score'].std():.1f}")
-print(f"  ENV Score:   {wellness_df['ENV_Score'].mean():.1f} ± {wellness_df['ENV_Score'].std():.1f}")
-print(f"  COG Score:   {wellness_df['COG_Score'].mean():.1f} ± {wellness_df['COG_Score'].std():.1f}")
+    indexer = indexer or AeonIndexer()
+    wellness_df, component_z = indexer.update(df_aligned, bio_scores, return_components=True)
+    if wellness_df.empty:
+        print("✓ No new minutes to score")
+        return wellness_df
+    if components_dir:
+        ComponentStore.write(components_dir, wellness_df['datetime'], component_z, append=append)
+
+    print("✓ Wellness pillars calculated:")
+    print(f"  BIO Score:   {wellness_df['BIO_Score'].mean():.1f} ± {wellness_df['BIO_Score'].std():.1f}")
+    print(f"  SLEEP Score: {wellness_df['SLEEP_Score'].mean():.1f} ± {wellness_df['SLEEP_Score'].std():.1f}")
+    print(f"  ENV Score:   {wellness_df['ENV_Score'].mean():.1f} ± {wellness_df['ENV_Score'].std():.1f}")
+    print(f"  COG Score:   {wellness_df['COG_Score'].mean():.1f} ± {wellness_df['COG_Score'].std():.1f}")
+    return wellness_df
+
 
 # ============================================================================
 # 3. CALCULATE TOTAL AEON INDEX
 # ============================================================================
-print("\n[3/5] Computing AEON Wellness Index...")
-
-# Weighted sum of 4 pillars
-wellness_df['AEON_Index'] = (
-    wellness_df['BIO_Score'] * 0.40 +
-    wellness_df['SLEEP_Score'] * 0.30 +
-    wellness_df['ENV_Score'] * 0.20 +
-    wellness_df['COG_Score'] * 0.10
-)
-
-# Add 7-day rolling average for trend analysis
-wellness_df['AEON_7Day_Avg'] = wellness_df['AEON_Index'].rolling(
-    window=7*24*60,  # 7 days in minutes
-    min_periods=1
-).mean()
-
-print(f"✓ AEON Index computed:")
-print(f"  Overall Mean: {wellness_df['AEON_Index'].mean():.2f}")
-print(f"  Overall Std:  {wellness_df['AEON_Index'].std():.2f}")
-print(f"  Range: [{wellness_df['AEON_Index'].min():.2f}, {wellness_df['AEON_Index'].max():.2f}]")
+def compute_aeon_index(wellness_df, rollups=None):
+    """Fold the scored minutes into the rollup cache (built fresh when `rollups` is None)."""
+    # The weighted pillar sum and the time-based 7-day average come from the indexer;
+    # the minute/hour/day/weekday x hour rollups are built here in one pass over the new minutes
+    rollups = rollups.update(wellness_df) if rollups is not None else AeonRollups.build(wellness_df)
+    totals = rollups.totals().loc['AEON_Index']
+    hourly = rollups.hour
+    print(f"✓ AEON Index computed:")
+    print(f"  Overall Mean: {totals['mean']:.2f}")
+    print(f"  Overall Std:  {totals['std']:.2f}")
+    print(f"  Range: [{hourly['AEON_Index_min'].min():.2f}, {hourly['AEON_Index_max'].max():.2f}]")
+    return rollups
+
 
 # ============================================================================
 # 4. VISUALIZE THE DASHBOARD
 # ============================================================================
-print("\n[4/5] Creating visualizations...")
-
-fig = plt.figure(figsize=(20, 12))
-gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
-
-# --- PLOT 1: AEON Index Over Time ---
-ax1 = fig.add_subplot(gs[0, :])
-ax1.plot(wellness_df['datetime'], wellness_df['AEON_Index'], 
-         alpha=0.3, color='steelblue', linewidth=0.5, label='AEON Index')
-ax1.plot(wellness_df['datetime'], wellness_df['AEON_7Day_Avg'], 
-         color='darkblue', linewidth=2, label='7-Day Rolling Average')
-ax1.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label='Baseline (50)')
-ax1.fill_between(wellness_df['datetime'], 0, wellness_df['AEON_Index'], 
-                  alpha=0.1, color='steelblue')
-ax1.set_xlabel('Date', fontsize=12, fontweight='bold')
-ax1.set_ylabel('AEON Wellness Index (0-100)', fontsize=12, fontweight='bold')
-ax1.set_title('AEON Wellness Index Over Time', fontsize=16, fontweight='bold', pad=20)
-ax1.legend(loc='upper left', fontsize=10)
-ax1.grid(True, alpha=0.3)
-ax1.set_ylim(0, 100)
-
-# --- PLOT 2: Radar Chart (Spider Plot) ---
-ax2 = fig.add_subplot(gs[1, 0], projection='polar')
-
-# Calculate average scores for each pillar
-pillar_means = {
-    'BIO\n(40%)': wellness_df['BIO_Score'].mean(),
-    'SLEEP\n(30%)': wellness_df['SLEEP_Score'].mean(),
-    'ENV\n(20%)': wellness_df['ENV_Score'].mean(),
-    'COG\n(10%)': wellness_df['COG_Score'].mean()
-}
-
-categories = list(pillar_means.keys())
-values = list(pillar_means.values())
-values += values[:1]  # Complete the circle
-
-angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
-angles += angles[:1]
-
-ax2.plot(angles, values, 'o-', linewidth=2, color='darkgreen', label='Average')
-ax2.fill(angles, values, alpha=0.25, color='green')
-ax2.set_xticks(angles[:-1])
-ax2.set_xticklabels(categories, fontsize=10, fontweight='bold')
-ax2.set_ylim(0, 100)
-ax2.set_yticks([25, 50, 75, 100])
-ax2.set_yticklabels(['25', '50', '75', '100'], fontsize=8)
-ax2.set_title('Wellness Pillar Balance', fontsize=14, fontweight='bold', pad=20)
-ax2.grid(True, alpha=0.3)
-
-# --- PLOT 3: Heatmap (Day of Week vs Hour of Day) ---
-ax3 = fig.add_subplot(gs[1, 1:])
-
-# Extract hour and day of week (use unique names to avoid conflicts)
-wellness_df['hour_of_day'] = wellness_df['datetime'].dt.hour
-wellness_df['day_name'] = wellness_df['datetime'].dt.day_name()
-
-# Create heatmap data using groupby
-heatmap_data = wellness_df.groupby(['day_name', 'hour_of_day'])['AEON_Index'].mean().unstack()
-
-# Reorder days
-day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-heatmap_data = heatmap_data.reindex([d for d in day_order if d in heatmap_data.index])
-
-sns.heatmap(heatmap_data, cmap='RdYlGn', center=50, vmin=0, vmax=100,
-            cbar_kws={'label': 'AEON Index'}, ax=ax3, linewidths=0.5)
-ax3.set_xlabel('Hour of Day', fontsize=12, fontweight='bold')
-ax3.set_ylabel('Day of Week', fontsize=12, fontweight='bold')
-ax3.set_title('AEON Score Heatmap: Day vs Hour', fontsize=14, fontweight='bold', pad=20)
-
-# --- PLOT 4: Individual Pillar Trends ---
-ax4 = fig.add_subplot(gs[2, :])
-
-# Resample to daily for cleaner visualization
-daily_df = wellness_df.set_index('datetime').resample('D').mean(numeric_only=True)
-
-ax4.plot(daily_df.index, daily_df['BIO_Score'], label='BIO (40%)', linewidth=2, alpha=0.8)
-ax4.plot(daily_df.index, daily_df['SLEEP_Score'], label='SLEEP (30%)', linewidth=2, alpha=0.8)
-ax4.plot(daily_df.index, daily_df['ENV_Score'], label='ENV (20%)', linewidth=2, alpha=0.8)
-ax4.plot(daily_df.index, daily_df['COG_Score'], label='COG (10%)', linewidth=2, alpha=0.8)
-ax4.axhline(y=50, color='gray', linestyle='--', alpha=0.5)
-
-ax4.set_xlabel('Date', fontsize=12, fontweight='bold')
-ax4.set_ylabel('Pillar Score (0-100)', fontsize=12, fontweight='bold')
-ax4.set_title('Individual Wellness Pillar Trends (Daily Average)', fontsize=14, fontweight='bold', pad=20)
-ax4.legend(loc='upper left', fontsize=10, ncol=4)
-ax4.grid(True, alpha=0.3)
-ax4.set_ylim(0, 100)
-
-plt.suptitle('AEON WELLNESS INDEX DASHBOARD', 
-             fontsize=20, fontweight='bold', y=0.98)
-
-plt.savefig('aeon_wellness_dashboard.png', dpi=300, bbox_inches='tight')
-print("✓ Dashboard saved: aeon_wellness_dashboard.png")
+def downsample_minutes(minute_df, n_pixels, method='minmax', max_points=None):
+    """The minute rows worth drawing `n_pixels` wide (all rows when method is None)."""
+    if method is None:
+        return minute_df
+    n_buckets = min(n_pixels, max_points) if max_points else n_pixels
+    x = to_utc_ns(minute_df['datetime'])
+    rows = downsample_indices(x, minute_df['AEON_Index'].to_numpy(dtype=np.float64), n_buckets, method)
+    return minute_df.iloc[rows]
+
+
+def plot_dashboard(rollups, path=DASHBOARD_OUTPUT, downsample='minmax', max_points=None):
+    """Render the 4-panel dashboard to `path` from the rollup cache (Agg backend, nothing is shown).
+
+    The minute series is reduced to what the top panel can show at DASHBOARD_DPI
+    (`downsample` picks the method, None draws every minute; `max_points` caps
+    the buckets further), so render time no longer grows with the history.
+    """
+    started = time.perf_counter()
+    import matplotlib
+
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Set style for better visualizations
+    plt.style.use('seaborn-v0_8-darkgrid')
+    sns.set_palette("husl")
+
+    fig = plt.figure(figsize=(20, 12))
+    gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
+
+    # --- PLOT 1: AEON Index Over Time ---
+    ax1 = fig.add_subplot(gs[0, :])
+    n_pixels = int(ax1.get_position().width * fig.get_figwidth() * DASHBOARD_DPI)
+    wellness_df = downsample_minutes(rollups.minute, n_pixels, downsample, max_points)
+    ax1.plot(wellness_df['datetime'], wellness_df['AEON_Index'],
+             alpha=0.3, color='steelblue', linewidth=0.5, label='AEON Index')
+    ax1.plot(wellness_df['datetime'], wellness_df['AEON_7Day_Avg'],
+             color='darkblue', linewidth=2, label='7-Day Rolling Average')
+    ax1.axhline(y=50, color='gray', linestyle='--', alpha=0.5, label='Baseline (50)')
+    ax1.fill_between(wellness_df['datetime'], 0, wellness_df['AEON_Index'],
+                      alpha=0.1, color='steelblue')
+    ax1.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax1.set_ylabel('AEON Wellness Index (0-100)', fontsize=12, fontweight='bold')
+    ax1.set_title('AEON Wellness Index Over Time', fontsize=16, fontweight='bold', pad=20)
+    ax1.legend(loc='upper left', fontsize=10)
+    ax1.grid(True, alpha=0.3)
+    ax1.set_ylim(0, 100)
+
+    # --- PLOT 2: Radar Chart (Spider Plot) ---
+    ax2 = fig.add_subplot(gs[1, 0], projection='polar')
+
+    # Average scores for each pillar
+    totals = rollups.totals()['mean']
+    pillar_means = {
+        'BIO\n(40%)': totals['BIO_Score'],
+        'SLEEP\n(30%)': totals['SLEEP_Score'],
+        'ENV\n(20%)': totals['ENV_Score'],
+        'COG\n(10%)': totals['COG_Score'],
+    }
+
+    categories = list(pillar_means.keys())
+    values = list(pillar_means.values())
+    values += values[:1]  # Complete the circle
+
+    angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
+    angles += angles[:1]
+
+    ax2.plot(angles, values, 'o-', linewidth=2, color='darkgreen', label='Average')
+    ax2.fill(angles, values, alpha=0.25, color='green')
+    ax2.set_xticks(angles[:-1])
+    ax2.set_xticklabels(categories, fontsize=10, fontweight='bold')
+    ax2.set_ylim(0, 100)
+    ax2.set_yticks([25, 50, 75, 100])
+    ax2.set_yticklabels(['25', '50', '75', '100'], fontsize=8)
+    ax2.set_title('Wellness Pillar Balance', fontsize=14, fontweight='bold', pad=20)
+    ax2.grid(True, alpha=0.3)
+
+    # --- PLOT 3: Heatmap (Day of Week vs Hour of Day) ---
+    ax3 = fig.add_subplot(gs[1, 1:])
+
+    # Weekday x hour means from the cache (days ordered Monday first)
+    heatmap_data = rollups.heatmap('AEON_Index')
+
+    sns.heatmap(heatmap_data, cmap='RdYlGn', center=50, vmin=0, vmax=100,
+                cbar_kws={'label': 'AEON Index'}, ax=ax3, linewidths=0.5)
+    ax3.set_xlabel('Hour of Day', fontsize=12, fontweight='bold')
+    ax3.set_ylabel('Day of Week', fontsize=12, fontweight='bold')
+    ax3.set_title('AEON Score Heatmap: Day vs Hour', fontsize=14, fontweight='bold', pad=20)
+
+    # --- PLOT 4: Individual Pillar Trends ---
+    ax4 = fig.add_subplot(gs[2, :])
+
+    # Daily means from the cache (days without data stay empty)
+    daily_df = rollups.daily_means()
+
+    ax4.plot(daily_df.index, daily_df['BIO_Score'], label='BIO (40%)', linewidth=2, alpha=0.8)
+    ax4.plot(daily_df.index, daily_df['SLEEP_Score'], label='SLEEP (30%)', linewidth=2, alpha=0.8)
+    ax4.plot(daily_df.index, daily_df['ENV_Score'], label='ENV (20%)', linewidth=2, alpha=0.8)
+    ax4.plot(daily_df.index, daily_df['COG_Score'], label='COG (10%)', linewidth=2, alpha=0.8)
+    ax4.axhline(y=50, color='gray', linestyle='--', alpha=0.5)
+
+    ax4.set_xlabel('Date', fontsize=12, fontweight='bold')
+    ax4.set_ylabel('Pillar Score (0-100)', fontsize=12, fontweight='bold')
+    ax4.set_title('Individual Wellness Pillar Trends (Daily Average)', fontsize=14, fontweight='bold', pad=20)
+    ax4.legend(loc='upper left', fontsize=10, ncol=4)
+    ax4.grid(True, alpha=0.3)
+    ax4.set_ylim(0, 100)
+
+    plt.suptitle('AEON WELLNESS INDEX DASHBOARD',
+                 fontsize=20, fontweight='bold', y=0.98)
+
+    plt.savefig(path, dpi=DASHBOARD_DPI, bbox_inches='tight')
+    plt.close(fig)
+    print(f"✓ Dashboard saved: {path}")
+    print(f"  Rendered {len(wellness_df):,} of {len(rollups.minute):,} minutes "
+          f"({downsample or 'full resolution'}) in {time.perf_counter() - started:.2f}s")
+
 
 # ============================================================================
 # 5. PRINT SUMMARY
 # ============================================================================
-print("\n[5/5] Generating summary report...")
-print("\n" + "=" * 70)
-print("AEON WELLNESS INDEX SUMMARY REPORT")
-print("=" * 70)
-
-# Find best and worst days
-daily_aeon = wellness_df.groupby(wellness_df['datetime'].dt.date)['AEON_Index'].mean()
-
-best_day = daily_aeon.idxmax()
-best_score = daily_aeon.max()
-
-worst_day = daily_aeon.idxmin()
-worst_score = daily_aeon.min()
-
-print(f"\n📊 OVERALL STATISTICS:")
-print(f"   Total Records:     {len(wellness_df):,}")
-print(f"   Date Range:        {wellness_df['datetime'].min().date()} to {wellness_df['datetime'].max().date()}")
-print(f"   Average AEON:      {wellness_df['AEON_Index'].mean():.2f} / 100")
-print(f"   Std Deviation:     {wellness_df['AEON_Index'].std():.2f}")
-
-print(f"\n🏆 BEST DAY:")
-print(f"   Date:              {best_day}")
-print(f"   AEON Score:        {best_score:.2f} / 100")
-best_day_data = wellness_df[wellness_df['datetime'].dt.date == best_day]
-print(f"   BIO Score:         {best_day_data['BIO_Score'].mean():.2f}")
-print(f"   SLEEP Score:       {best_day_data['SLEEP_Score'].mean():.2f}")
-print(f"   ENV Score:         {best_day_data['ENV_Score'].mean():.2f}")
-print(f"   COG Score:         {best_day_data['COG_Score'].mean():.2f}")
-
-print(f"\n⚠️  WORST DAY:")
-print(f"   Date:              {worst_day}")
-print(f"   AEON Score:        {worst_score:.2f} / 100")
-worst_day_data = wellness_df[wellness_df['datetime'].dt.date == worst_day]
-print(f"   BIO Score:         {worst_day_data['BIO_Score'].mean():.2f}")
-print(f"   SLEEP Score:       {worst_day_data['SLEEP_Score'].mean():.2f}")
-print(f"   ENV Score:         {worst_day_data['ENV_Score'].mean():.2f}")
-print(f"   COG Score:         {worst_day_data['COG_Score'].mean():.2f}")
-
-print(f"\n💡 PILLAR AVERAGES:")
-print(f"   BIO (40%):         {wellness_df['BIO_Score'].mean():.2f} / 100")
-print(f"   SLEEP (30%):       {wellness_df['SLEEP_Score'].mean():.2f} / 100")
-print(f"   ENV (20%):         {wellness_df['ENV_Score'].mean():.2f} / 100")
-print(f"   COG (10%):         {wellness_df['COG_Score'].mean():.2f} / 100")
-
-print("\n" + "=" * 70)
-print("✓ AEON Wellness Dashboard Complete!")
-print("=" * 70)
-
-# Save the wellness dataframe for further analysis
-wellness_df.to_csv('aeon_wellness_scores.csv', index=False)
-print("\n📁 Wellness scores saved to: aeon_wellness_scores.csv")
-
-plt.show()
+def print_summary(rollups):
+    print("\n" + "=" * 70)
+    print("AEON WELLNESS INDEX SUMMARY REPORT")
+    print("=" * 70)
+
+    # Best and worst days straight from the daily rollup
+    best, worst = rollups.best_worst_days('AEON_Index')
+    totals = rollups.totals()
+    first, last = rollups.minute['datetime'].iloc[[0, -1]]
+
+    print(f"\n📊 OVERALL STATISTICS:")
+    print(f"   Total Records:     {rollups.record_count:,}")
+    print(f"   Date Range:        {first.date()} to {last.date()}")
+    print(f"   Average AEON:      {totals.loc['AEON_Index', 'mean']:.2f} / 100")
+    print(f"   Std Deviation:     {totals.loc['AEON_Index', 'std']:.2f}")
+    if 'p50' in totals:
+        print(f"   Median AEON:       {totals.loc['AEON_Index', 'p50']:.2f} "
+              f"(5th-95th pct: {totals.loc['AEON_Index', 'p05']:.2f} - {totals.loc['AEON_Index', 'p95']:.2f})")
+
+    days = (("🏆 BEST DAY:", best), ("⚠️  WORST DAY:", worst)) if best is not None else ()
+    if not days:
+        print("\n   No daily AEON means yet: best/worst days skipped")
+    for title, day in days:
+        print(f"\n{title}")
+        print(f"   Date:              {day.name.date()}")
+        print(f"   AEON Score:        {day['AEON_Index']:.2f} / 100")
+        print(f"   BIO Score:         {day['BIO_Score']:.2f}")
+        print(f"   SLEEP Score:       {day['SLEEP_Score']:.2f}")
+        print(f"   ENV Score:         {day['ENV_Score']:.2f}")
+        print(f"   COG Score:         {day['COG_Score']:.2f}")
+
+    print(f"\n💡 PILLAR AVERAGES:")
+    print(f"   BIO (40%):         {totals.loc['BIO_Score', 'mean']:.2f} / 100")
+    print(f"   SLEEP (30%):       {totals.loc['SLEEP_Score', 'mean']:.2f} / 100")
+    print(f"   ENV (20%):         {totals.loc['ENV_Score', 'mean']:.2f} / 100")
+    print(f"   COG (10%):         {totals.loc['COG_Score', 'mean']:.2f} / 100")
+
+    print("\n" + "=" * 70)
+    print("✓ AEON Wellness Dashboard Complete!")
+    print("=" * 70)
+
+
+def load_wellness_scores(path=SCORES_OUTPUT):
+    wellness_df = pd.read_csv(path)
+    wellness_df['datetime'] = parse_datetimes(wellness_df['datetime'])
+    return wellness_df
+
+
+def load_rollups(cache_dir=ROLLUP_CACHE_DIR, scores_path=SCORES_OUTPUT):
+    """The persisted rollup cache, rebuilt from the saved wellness scores if it is missing."""
+    if AeonRollups.exists(cache_dir):
+        return AeonRollups.load(cache_dir)
+    return AeonRollups.build(load_wellness_scores(scores_path))
+
+
+def run(no_plots=False, csv_path=CSV_PATH, bio_scores_path=BIO_SCORES_PATH, incremental=False,
+        state_path=AEON_STATE_FILE, rollup_dir=ROLLUP_CACHE_DIR, components_dir=COMPONENT_CACHE_DIR,
+        downsample='minmax', max_points=None):
+    if incremental and str(bio_scores_path).endswith('.npy'):
+        raise ValueError("--incremental needs a score store: legacy .npy scores only align with the full CSV")
+    print("=" * 70)
+    print("AEON WELLNESS INDEX DASHBOARD")
+    print("=" * 70)
+
+    # Incremental runs continue from the saved indexer state and rollup cache and only score minutes after it
+    resume = (incremental and Path(state_path).exists() and Path(SCORES_OUTPUT).exists()
+              and AeonRollups.exists(rollup_dir) and ComponentStore.exists(components_dir))
+    indexer = AeonIndexer.load(state_path) if resume else AeonIndexer()
+
+    print("\n[1/5] Loading data...")
+    df_aligned, bio_scores = load_data(resolve_csv_path(csv_path), bio_scores_path,
+                                       since=indexer.last_datetime if resume else None)
+
+    print("\n[2/5] Calculating wellness pillars...")
+    wellness_df = compute_pillars(df_aligned, bio_scores, indexer, components_dir=components_dir, append=resume)
+
+    print("\n[3/5] Computing AEON Wellness Index...")
+    rollups = compute_aeon_index(wellness_df, AeonRollups.load(rollup_dir) if resume else None)
+
+    if no_plots:
+        print("\n[4/5] Skipping visualizations (--no-plots)")
+    else:
+        print("\n[4/5] Creating visualizations...")
+        plot_dashboard(rollups, downsample=downsample, max_points=max_points)
+
+    print("\n[5/5] Generating summary report...")
+    print_summary(rollups)
+
+    # Save the wellness dataframe for further analysis (incremental runs append the new minutes)
+    if resume:
+        wellness_df.to_csv(SCORES_OUTPUT, mode='a', header=False, index=False)
+        print(f"\n📁 Appended {len(wellness_df):,} new minutes to: {SCORES_OUTPUT}")
+    else:
+        wellness_df.to_csv(SCORES_OUTPUT, index=False)
+        print(f"\n📁 Wellness scores saved to: {SCORES_OUTPUT}")
+    rollups.save(rollup_dir)
+    indexer.save(state_path)
+    print(f"📁 Rollup cache saved to: {rollup_dir}/ (component scores: {components_dir}/)")
+    return wellness_df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AEON Wellness Index dashboard")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--no-plots", action="store_true", help="Compute scores and the report without plotting")
+    mode.add_argument("--plots-only", action="store_true", help=f"Only redraw the dashboard from {ROLLUP_CACHE_DIR}/")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Only score minutes after the saved {AEON_STATE_FILE} and append them")
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--bio-scores", default=BIO_SCORES_PATH,
+                        help="Score store directory (or a legacy bio_stability_scores.npy, aligned by length; "
+                             "not with --incremental)")
+    parser.add_argument("--downsample", choices=list(DOWNSAMPLE_METHODS) + ["none"], default="minmax",
+                        help="How the minute series is reduced to the plot's pixel width ('none' draws every minute)")
+    parser.add_argument("--max-points", type=int,
+                        help="Cap on the downsampling buckets (default: one per pixel column at the saved dpi)")
+    args = parser.parse_args()
+    downsample = None if args.downsample == "none" else args.downsample
+    if args.incremental and args.bio_scores.endswith(".npy"):
+        parser.error("--incremental needs a score store directory for --bio-scores, not a legacy .npy")
+
+    if args.plots_only:
+        plot_dashboard(load_rollups(), downsample=downsample, max_points=args.max_points)
+        return
+    run(no_plots=args.no_plots, csv_path=args.csv, bio_scores_path=args.bio_scores, incremental=args.incremental,
+        downsample=downsample, max_points=args.max_points)
+
+
+if __name__ == "__main__":
+    main()
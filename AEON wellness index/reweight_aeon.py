@@ -0,0 +1,87 @@
+"""
+AEON what-if re-weighting
+==========================
+Recompute the AEON Index, its 7-day average and every rollup under new pillar
+weights or z -> score mappings, straight from the component cache written by
+5_aeon_wellness_dashboard.py (aeon_components/). No raw CSV is read.
+
+Usage:
+    python reweight_aeon.py --weights BIO=0.5,SLEEP=0.2,ENV=0.2,COG=0.1
+    python reweight_aeon.py --mapping '{"scale": 15, "stress": {"scale": 20}}'
+    python reweight_aeon.py --weights COG=0.3 --save aeon_rollups_whatif
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from aeon.components import CACHE_DIR, ComponentStore, resolve_weights, reweight
+from aeon.index import PILLAR_COLUMNS, PILLAR_WEIGHTS
+
+
+def parse_weights(text):
+    if not text:
+        return None
+    weights = {}
+    for item in text.split(","):
+        name, _, value = item.partition("=")
+        weights[name.strip().upper()] = float(value)
+    return weights
+
+
+def parse_mapping(text):
+    if not text:
+        return None
+    path = Path(text)
+    if path.exists():
+        with path.open("r", encoding="utf-8") as fp:
+            return json.load(fp)
+    return json.loads(text)
+
+
+def describe(label, rollups):
+    totals = rollups.totals()
+    best, worst = rollups.best_worst_days("AEON_Index")
+    pillars = "  ".join(f"{c.split('_')[0]} {totals.loc[c, 'mean']:.2f}" for c in PILLAR_COLUMNS)
+    days = ("no daily means" if best is None else
+            f"best {best.name.date()} ({best['AEON_Index']:.2f})  worst {worst.name.date()} ({worst['AEON_Index']:.2f})")
+    print(f"{label:<10} AEON {totals.loc['AEON_Index', 'mean']:.2f} ± {totals.loc['AEON_Index', 'std']:.2f}  {days}")
+    print(f"{'':<10} {pillars}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-weight the AEON Index from cached component scores")
+    parser.add_argument("--components", default=CACHE_DIR)
+    parser.add_argument("--weights", help="Pillar weights, e.g. BIO=0.5,SLEEP=0.2 (others keep their default); "
+                                          "all weights are then divided by their sum")
+    parser.add_argument("--mapping", help="JSON (or a JSON file) overriding center/scale/low/high/invert")
+    parser.add_argument("--save", help="Write the re-weighted rollup cache to this directory")
+    args = parser.parse_args()
+
+    weights, mapping = parse_weights(args.weights), parse_mapping(args.mapping)
+    store = ComponentStore.load(args.components)
+    print(f"Loaded {len(store):,} cached minutes x {len(store.columns)} components")
+
+    started = time.perf_counter()
+    _, baseline = reweight(store)
+    baseline_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    # Quantile sketches only matter for a saved cache; interactive what-ifs skip them
+    wellness_df, rollups = reweight(store, weights, mapping, sketch=bool(args.save))
+    seconds = time.perf_counter() - started
+
+    describe("baseline", baseline)
+    describe("what-if", rollups)
+    print("Weights:   " + "  ".join(f"{name} {w:.3f}" for name, w in zip(PILLAR_WEIGHTS, resolve_weights(weights))))
+    print(f"✓ Recomputed index + rollups in {seconds:.3f}s (baseline {baseline_seconds:.3f}s)")
+    if args.save:
+        rollups.save(args.save)
+        print(f"📁 What-if rollup cache saved to: {args.save}/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+AEON aggregate service
+=======================
+Serve pillar scores, rollups and best/worst days as JSON from the rollup cache
+written by 5_aeon_wellness_dashboard.py (aeon_rollups/). The cache is re-read
+when a dashboard run (full or --incremental) rewrites it, so the service can
+stay up while new minutes are scored.
+
+Usage:
+    python serve_aeon.py                       # http://127.0.0.1:8765
+    python serve_aeon.py --port 9000 --quiet
+    curl 'http://127.0.0.1:8765/rollups/day?start=2024-01-01&end=2024-01-31'
+    curl 'http://127.0.0.1:8765/minute?since=2024-02-01T12:00:00Z&max_points=2000'
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from aeon.rollups import CACHE_DIR
+from aeon.server import DEFAULT_HOST, DEFAULT_PORT, make_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the AEON rollup cache as JSON")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--quiet", action="store_true", help="Do not log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.cache_dir, args.host, args.port, quiet=args.quiet)
+    print(f"✓ Serving {args.cache_dir}/ on http://{args.host}:{server.server_port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Numpy vs Keras BioVAE inference benchmark
+==========================================
+Checks that the pure-numpy forward pass (bio_vae_weights.npz) matches Keras with
+deterministic z_mean, and reports cold start and throughput of both engines.
+
+Usage:
+    python benchmark_numpy_inference.py [--windows X_test_bio.npy] [--skip-keras]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.numpy_inference import NPZ_WEIGHTS_FILE, benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark numpy BioVAE inference against Keras")
+    parser.add_argument("--windows", default="X_test_bio.npy")
+    parser.add_argument("--npz", default=NPZ_WEIGHTS_FILE)
+    parser.add_argument("--model-dir", default=".")
+    parser.add_argument("--batch-size", type=int, default=65536)
+    parser.add_argument("--skip-keras", action="store_true", help="Only time the numpy engine")
+    args = parser.parse_args()
+
+    windows = np.load(args.windows, mmap_mode="r")
+    windows = np.ascontiguousarray(windows, dtype=np.float32)
+    print(f"Benchmarking on {len(windows):,} windows {windows.shape[1:]}")
+
+    vae = None
+    keras_cold_start = None
+    if not args.skip_keras:
+        started = time.perf_counter()
+        from bio_vae.model import load_bio_vae
+
+        vae, _ = load_bio_vae(args.model_dir)
+        keras_cold_start = time.perf_counter() - started
+
+    report = benchmark(args.npz, windows, vae=vae, batch_size=args.batch_size)
+    report["keras_cold_start_s"] = keras_cold_start
+
+    print(f"\n  numpy cold start:   {report['numpy_cold_start_s']:.3f}s")
+    print(f"  numpy throughput:   {report['numpy_windows_per_s']:,.0f} windows/s")
+    if vae is not None:
+        print(f"  keras cold start:   {keras_cold_start:.3f}s (TensorFlow import + weight load)")
+        print(f"  keras throughput:   {report['keras_windows_per_s']:,.0f} windows/s")
+        print(f"  max |error diff|:   {report['max_abs_diff']:.2e}")
+        print(f"  {'✓ matches Keras within tolerance' if report['matches_keras'] else '✗ does NOT match Keras'}")
+
+    with open("bio_vae_inference_benchmark.json", "w", encoding="utf-8") as fp:
+        json.dump(report, fp, indent=2)
+    print("\n✓ Saved 'bio_vae_inference_benchmark.json'")
+    if vae is not None and not report["matches_keras"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
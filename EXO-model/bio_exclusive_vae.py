@@ -11,90 +11,34 @@ Features used:
 - sleep_duration_of_day
 - stress_rolling_mean_30
 - stress_volatility_30
+
+Usage:
+    python bio_exclusive_vae.py               # train, score, save artifacts and plots
+    python bio_exclusive_vae.py --no-plots    # headless: never imports matplotlib
+    python bio_exclusive_vae.py --plots-only  # redraw plots from saved artifacts (no TensorFlow)
+
+TensorFlow and matplotlib are imported only inside the steps that need them, and
+figures are saved to files instead of being shown, so nothing blocks.
 """
 
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import tensorflow as tf
-from tensorflow import keras
-from tensorflow.keras import layers, Model
-from tensorflow.keras.callbacks import EarlyStopping
-import seaborn as sns
+import argparse
+import json
 import os
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
-
-# Set random seeds for reproducibility
-np.random.seed(42)
-tf.random.set_seed(42)
-
-print("=" * 80)
-print("BIO-EXCLUSIVE VAE - ANOMALY DETECTION")
-print("=" * 80)
+import numpy as np
 
-# ============================================================================
-# STEP 1: Feature Slicing - Extract Biological Features Only
-# ============================================================================
-print("\n[STEP 1] Loading data and extracting biological features...")
-
-# Load column names
-features_path = 'health_net_features_2_normalize.csv'
-if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
-    try:
-        from store.cassandra_client import export_minute_features_csv
-
-        exported = export_minute_features_csv(
-            output_path='output/streaming/exports/exo_minute_features.csv',
-            limit=250000
-        )
-        if Path(exported).exists():
-            features_path = exported
-            print(f"Using Cassandra-exported dataset: {features_path}")
-    except Exception as exc:
-        print(f"⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
-
-features_df = pd.read_csv(features_path, nrows=0)
-column_names = features_df.columns.tolist()
-print(f"Total features in dataset: {len(column_names)}")
-
-# Define biological features we want to keep
-bio_features = [
-    'heart_rate',
-    'stress_level', 
-    'body_battery',
-    'sleep_duration_of_day',
-    'stress_rolling_mean_30',
-    'stress_volatility_30'
-]
-
-# Find indices of biological features
-bio_indices = [column_names.index(feat) for feat in bio_features]
-print(f"\nBiological features selected: {bio_features}")
-print(f"Feature indices: {bio_indices}")
-
-# Load training and test data
-X_train = np.load('X_train.npy')
-X_test = np.load('X_test.npy')
-
-print(f"\nOriginal shapes:")
-print(f"  X_train: {X_train.shape}")
-print(f"  X_test: {X_test.shape}")
-
-# Slice to keep only biological features
-X_train_bio = X_train[:, :, bio_indices]
-X_test_bio = X_test[:, :, bio_indices]
-
-print(f"\nBio-sliced shapes:")
-print(f"  X_train_bio: {X_train_bio.shape}")
-print(f"  X_test_bio: {X_test_bio.shape}")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
-# ============================================================================
-# STEP 2: Define VAE Architecture
-# ============================================================================
-print("\n[STEP 2] Building Bio-Exclusive VAE architecture...")
+from bio_vae.config import BIO_FEATURES, MODEL_CONFIG_FILE, WEIGHTS_FILE
+from bio_vae.numpy_inference import NPZ_WEIGHTS_FILE
+from bio_vae.scoring import SCORES_FILE as SCORE_STORE
+from bio_vae.scoring import SKETCH_FILE, append_scores, calibrate_scaling_factor, errors_to_scores, update_sketches
+from bio_vae.scoring import reconstruction_errors as window_errors
+from bio_vae.training import load_bio_data, train_vae
+from features.normalization import NormalizationStats, stats_sidecar
+from features.sketches import StreamSketch, save_sketches
 
 # Hyperparameters
 TIMESTEPS = 60
@@ -104,324 +48,343 @@ HIDDEN_DIM = 16
 LEARNING_RATE = 0.001
 EPOCHS = 30
 BATCH_SIZE = 32
+SHUFFLE_BUFFER = 10000   # window positions held by the tf.data shuffle buffer
+
+# Target: Average score = 80 (meaning average error deducts 20 points)
+TARGET_AVG_SCORE = 80.0
 
-# Custom Sampling Layer (Reparameterization Trick)
-class Sampling(layers.Layer):
-    """Uses (z_mean, z_log_var) to sample z, the vector encoding a digit."""
-    
-    def call(self, inputs):
-        z_mean, z_log_var = inputs
-        batch = tf.shape(z_mean)[0]
-        dim = tf.shape(z_mean)[1]
-        epsilon = tf.keras.backend.random_normal(shape=(batch, dim))
-        return z_mean + tf.exp(0.5 * z_log_var) * epsilon
-
-
-# Encoder
-def build_encoder(timesteps, num_features, latent_dim, hidden_dim):
-    """Build the encoder network."""
-    encoder_inputs = keras.Input(shape=(timesteps, num_features), name='encoder_input')
-    
-    # Flatten the input
-    x = layers.Flatten()(encoder_inputs)
-    
-    # Hidden layer
-    x = layers.Dense(hidden_dim, activation='relu', name='encoder_hidden')(x)
-    
-    # Latent space parameters
-    z_mean = layers.Dense(latent_dim, name='z_mean')(x)
-    z_log_var = layers.Dense(latent_dim, name='z_log_var')(x)
-    
-    # Sample from latent space
-    z = Sampling()([z_mean, z_log_var])
-    
-    encoder = Model(encoder_inputs, [z_mean, z_log_var, z], name='encoder')
-    return encoder
-
-
-# Decoder
-def build_decoder(timesteps, num_features, latent_dim, hidden_dim):
-    """Build the decoder network."""
-    latent_inputs = keras.Input(shape=(latent_dim,), name='decoder_input')
-    
-    # Hidden layer
-    x = layers.Dense(hidden_dim, activation='relu', name='decoder_hidden')(latent_inputs)
-    
-    # Output layer
-    x = layers.Dense(timesteps * num_features, activation='linear', name='decoder_output')(x)
-    
-    # Reshape to original dimensions
-    decoder_outputs = layers.Reshape((timesteps, num_features))(x)
-    
-    decoder = Model(latent_inputs, decoder_outputs, name='decoder')
-    return decoder
-
-
-# Custom VAE Model
-class BioVAE(Model):
-    """Bio-Exclusive Variational Autoencoder."""
-    
-    def __init__(self, encoder, decoder, **kwargs):
-        super(BioVAE, self).__init__(**kwargs)
-        self.encoder = encoder
-        self.decoder = decoder
-        self.total_loss_tracker = keras.metrics.Mean(name="total_loss")
-        self.reconstruction_loss_tracker = keras.metrics.Mean(name="reconstruction_loss")
-        self.kl_loss_tracker = keras.metrics.Mean(name="kl_loss")
-    
-    @property
-    def metrics(self):
-        return [
-            self.total_loss_tracker,
-            self.reconstruction_loss_tracker,
-            self.kl_loss_tracker,
-        ]
-    
-    def train_step(self, data):
-        with tf.GradientTape() as tape:
-            # Forward pass
-            z_mean, z_log_var, z = self.encoder(data)
-            reconstruction = self.decoder(z)
-            
-            # Reconstruction loss (MSE)
-            reconstruction_loss = tf.reduce_mean(
-                tf.reduce_sum(
-                    keras.losses.mean_squared_error(data, reconstruction),
-                    axis=1
-                )
-            )
-            
-            # KL divergence loss
-            kl_loss = -0.5 * tf.reduce_mean(
-                tf.reduce_sum(
-                    1 + z_log_var - tf.square(z_mean) - tf.exp(z_log_var),
-                    axis=1
-                )
-            )
-            
-            # Total loss
-            total_loss = reconstruction_loss + kl_loss
-        
-        # Backpropagation
-        grads = tape.gradient(total_loss, self.trainable_weights)
-        self.optimizer.apply_gradients(zip(grads, self.trainable_weights))
-        
-        # Update metrics
-        self.total_loss_tracker.update_state(total_loss)
-        self.reconstruction_loss_tracker.update_state(reconstruction_loss)
-        self.kl_loss_tracker.update_state(kl_loss)
-        
-        return {
-            "total_loss": self.total_loss_tracker.result(),
-            "reconstruction_loss": self.reconstruction_loss_tracker.result(),
-            "kl_loss": self.kl_loss_tracker.result(),
-        }
-    
-    def call(self, inputs):
-        """Forward pass through the VAE."""
-        z_mean, z_log_var, z = self.encoder(inputs)
-        reconstruction = self.decoder(z)
-        return reconstruction
-
-
-# Build the model
-print("\nBuilding encoder...")
-encoder = build_encoder(TIMESTEPS, NUM_BIO_FEATURES, LATENT_DIM, HIDDEN_DIM)
-encoder.summary()
-
-print("\nBuilding decoder...")
-decoder = build_decoder(TIMESTEPS, NUM_BIO_FEATURES, LATENT_DIM, HIDDEN_DIM)
-decoder.summary()
-
-print("\nBuilding Bio-Exclusive VAE...")
-vae = BioVAE(encoder, decoder)
+FEATURES_FILE = 'health_net_features_2_normalize.csv'
+SCORES_FILE = 'bio_stability_scores.npy'
+ERRORS_FILE = 'bio_reconstruction_errors.npy'
+HISTORY_FILE = 'bio_vae_history.json'
+PIPELINE_REPORT_FILE = 'bio_vae_input_pipeline_report.json'
 
-# ============================================================================
-# STEP 3: Train the VAE
-# ============================================================================
-print("\n[STEP 3] Training the Bio-Exclusive VAE...")
-
-# Compile the model
-vae.compile(optimizer=keras.optimizers.Adam(learning_rate=LEARNING_RATE))
-
-# Early stopping callback
-early_stopping = EarlyStopping(
-    monitor='total_loss',
-    patience=5,
-    restore_best_weights=True,
-    verbose=1
-)
-
-# Train the model
-history = vae.fit(
-    X_train_bio,
-    epochs=EPOCHS,
-    batch_size=BATCH_SIZE,
-    callbacks=[early_stopping],
-    verbose=1
-)
-
-print("\n✓ Training complete!")
-
-# Plot training history
-plt.figure(figsize=(15, 4))
-
-plt.subplot(1, 3, 1)
-plt.plot(history.history['total_loss'])
-plt.title('Total Loss')
-plt.xlabel('Epoch')
-plt.ylabel('Loss')
-plt.grid(True, alpha=0.3)
-
-plt.subplot(1, 3, 2)
-plt.plot(history.history['reconstruction_loss'])
-plt.title('Reconstruction Loss')
-plt.xlabel('Epoch')
-plt.ylabel('Loss')
-plt.grid(True, alpha=0.3)
-
-plt.subplot(1, 3, 3)
-plt.plot(history.history['kl_loss'])
-plt.title('KL Divergence Loss')
-plt.xlabel('Epoch')
-plt.ylabel('Loss')
-plt.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('bio_vae_training_history.png', dpi=150, bbox_inches='tight')
-print("✓ Training history plot saved as 'bio_vae_training_history.png'")
-plt.show()
 
 # ============================================================================
-# STEP 4: Calculate Bio-Stability Scores
+# STEP 1: Feature Slicing - Extract Biological Features Only
 # ============================================================================
-print("\n[STEP 4] Calculating Bio-Stability Scores...")
-
-# Get reconstructions for test set
-reconstructions = vae.predict(X_test_bio, verbose=0)
+def resolve_features_path(features_path=FEATURES_FILE):
+    if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
+        try:
+            from store.export_cache import cached_minute_features_csv
+
+            exported = cached_minute_features_csv()
+            if Path(exported).exists():
+                print(f"Using Cassandra-exported dataset: {exported}")
+                return exported
+        except Exception as exc:
+            print(f"⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
+    return features_path
+
+
+def load_training_normalization(features_path, stats_path=None, bio_features=BIO_FEATURES):
+    """Mean/std the training CSV was normalized with (its normalize_features.py sidecar, or `stats_path`).
+
+    Stored in the model config so stream scoring normalizes raw minutes the same way; None when unknown.
+    """
+    stats_path = Path(stats_path) if stats_path else stats_sidecar(features_path)
+    if not stats_path.exists():
+        print(f"⚠ No normalization stats at '{stats_path}'; stream scoring will refuse this model "
+              f"until spark.bioVae.normalizationStats is set")
+        return None
+    print(f"Training normalization: {stats_path}")
+    return NormalizationStats.load(stats_path).params(bio_features)
 
-# Calculate reconstruction error (MSE) for each sample
-reconstruction_errors = np.mean(np.square(X_test_bio - reconstructions), axis=(1, 2))
 
-print(f"\nReconstruction Error Statistics:")
-print(f"  Mean: {reconstruction_errors.mean():.6f}")
-print(f"  Std:  {reconstruction_errors.std():.6f}")
-print(f"  Min:  {reconstruction_errors.min():.6f}")
-print(f"  Max:  {reconstruction_errors.max():.6f}")
+# ============================================================================
+# STEP 2 + 3: Build and Train the VAE
+# ============================================================================
+def print_pipeline_report(pipeline_summary, report_path=PIPELINE_REPORT_FILE):
+    from sequences.tf_data import record_pipeline_run
 
-# Auto-calculate scaling factor
-# Target: Average score = 80 (meaning average error deducts 20 points)
-TARGET_AVG_SCORE = 80.0
-TARGET_AVG_DEDUCTION = 100.0 - TARGET_AVG_SCORE
-mean_error = reconstruction_errors.mean()
-scaling_factor = TARGET_AVG_DEDUCTION / mean_error
+    summary = dict(pipeline_summary)
+    pipeline_report = record_pipeline_run(report_path, summary.pop("mode"), summary)
+    print(f"\nInput pipeline report (run other modes with BDA_INPUT_PIPELINE to compare):")
+    print(f"  {'mode':<10} {'epochs':>6} {'1st epoch s':>12} {'mean epoch s':>13} {'peak RSS MB':>12}")
+    for mode, run in pipeline_report.items():
+        fmt = lambda v, spec: format(v, spec) if v is not None else 'n/a'
+        print(f"  {mode:<10} {run['epochs']:>6} {fmt(run['first_epoch_seconds'], '>12.2f')} "
+              f"{fmt(run['mean_epoch_seconds'], '>13.2f')} {fmt(run['peak_rss_mb'], '>12.1f')}")
 
-print(f"\nScaling Factor Calculation:")
-print(f"  Target Average Score: {TARGET_AVG_SCORE}")
-print(f"  Mean Reconstruction Error: {mean_error:.6f}")
-print(f"  Calculated Scaling Factor: {scaling_factor:.2f}")
 
-# Calculate Bio-Stability Scores
-# Score = max(0, 100 - (Error * Scaling_Factor))
-bio_stability_scores = np.maximum(0, 100 - (reconstruction_errors * scaling_factor))
+# ============================================================================
+# STEP 4: Calculate Bio-Stability Scores
+# ============================================================================
+def compute_scores(vae, X_test_bio, target_avg_score=TARGET_AVG_SCORE):
+    """Reconstruction errors, auto-calibrated scaling factor and Bio-Stability Scores of the test windows."""
+    # Reconstruction error (MSE) of each test window from the deterministic z_mean path, the same
+    # definition score_bio_vae.py (numpy or keras engine) and the stream scorer use with this scaling factor
+    reconstruction_errors = window_errors(vae, X_test_bio)
+
+    # Summary statistics and calibration read the streaming sketch (the same one score_bio_vae.py extends)
+    error_sketch = StreamSketch().update(reconstruction_errors)
+    print(f"\nReconstruction Error Statistics:")
+    print(f"  Mean: {error_sketch.mean:.6f}")
+    print(f"  Std:  {error_sketch.std:.6f}")
+    print(f"  Min:  {error_sketch.min:.6f}")
+    print(f"  Max:  {error_sketch.max:.6f}")
+    print(f"  P50 / P95: {error_sketch.quantile(0.5):.6f} / {error_sketch.quantile(0.95):.6f}")
+
+    # Auto-calculate scaling factor
+    mean_error = error_sketch.mean
+    scaling_factor = calibrate_scaling_factor(mean_error, target_avg_score)
+
+    print(f"\nScaling Factor Calculation:")
+    print(f"  Target Average Score: {target_avg_score}")
+    print(f"  Mean Reconstruction Error: {mean_error:.6f}")
+    print(f"  Calculated Scaling Factor: {scaling_factor:.2f}")
+
+    # Score = max(0, 100 - (Error * Scaling_Factor))
+    bio_stability_scores = errors_to_scores(reconstruction_errors, scaling_factor)
+
+    score_sketch = StreamSketch().update(bio_stability_scores)
+    print(f"\nBio-Stability Score Statistics:")
+    print(f"  Mean: {score_sketch.mean:.2f}")
+    print(f"  Std:  {score_sketch.std:.2f}")
+    print(f"  Min:  {score_sketch.min:.2f}")
+    print(f"  Max:  {score_sketch.max:.2f}")
+    return reconstruction_errors, scaling_factor, bio_stability_scores
 
-print(f"\nBio-Stability Score Statistics:")
-print(f"  Mean: {bio_stability_scores.mean():.2f}")
-print(f"  Std:  {bio_stability_scores.std():.2f}")
-print(f"  Min:  {bio_stability_scores.min():.2f}")
-print(f"  Max:  {bio_stability_scores.max():.2f}")
 
 # ============================================================================
 # STEP 5: Save Results & Visualize
 # ============================================================================
-print("\n[STEP 5] Saving results and creating visualizations...")
-
-# Save the scores
-np.save('bio_stability_scores.npy', bio_stability_scores)
-print("✓ Saved 'bio_stability_scores.npy'")
-
-# Save the sliced test data
-np.save('X_test_bio.npy', X_test_bio)
-print("✓ Saved 'X_test_bio.npy'")
-
-# Save the model
-vae.save_weights('bio_vae_weights.h5')
-print("✓ Saved model weights as 'bio_vae_weights.h5'")
-
-# Visualization 1: Bio-Stability Score Over Time
-plt.figure(figsize=(16, 6))
-
-plt.subplot(2, 1, 1)
-plt.plot(bio_stability_scores, linewidth=0.8, alpha=0.7, color='#2E86AB')
-plt.axhline(y=bio_stability_scores.mean(), color='red', linestyle='--', 
-            label=f'Mean: {bio_stability_scores.mean():.2f}', linewidth=2)
-plt.fill_between(range(len(bio_stability_scores)), 0, bio_stability_scores, 
-                 alpha=0.2, color='#2E86AB')
-plt.title('Bio-Stability Score Over Time', fontsize=14, fontweight='bold')
-plt.xlabel('Sample Index (Time)', fontsize=11)
-plt.ylabel('Bio-Stability Score', fontsize=11)
-plt.ylim(0, 105)
-plt.grid(True, alpha=0.3)
-plt.legend()
-
-# Visualization 2: Score Distribution
-plt.subplot(2, 1, 2)
-plt.hist(bio_stability_scores, bins=50, color='#A23B72', alpha=0.7, edgecolor='black')
-plt.axvline(x=bio_stability_scores.mean(), color='red', linestyle='--', 
-            label=f'Mean: {bio_stability_scores.mean():.2f}', linewidth=2)
-plt.title('Bio-Stability Score Distribution', fontsize=14, fontweight='bold')
-plt.xlabel('Bio-Stability Score', fontsize=11)
-plt.ylabel('Frequency', fontsize=11)
-plt.grid(True, alpha=0.3, axis='y')
-plt.legend()
-
-plt.tight_layout()
-plt.savefig('bio_stability_scores_visualization.png', dpi=150, bbox_inches='tight')
-print("✓ Saved visualization as 'bio_stability_scores_visualization.png'")
-plt.show()
-
-# Additional Visualization: Reconstruction Error vs Score
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-# Reconstruction Error Over Time
-axes[0].plot(reconstruction_errors, linewidth=0.8, alpha=0.7, color='#F18F01')
-axes[0].axhline(y=reconstruction_errors.mean(), color='red', linestyle='--', 
-                label=f'Mean: {reconstruction_errors.mean():.4f}', linewidth=2)
-axes[0].set_title('Reconstruction Error Over Time', fontsize=13, fontweight='bold')
-axes[0].set_xlabel('Sample Index (Time)', fontsize=11)
-axes[0].set_ylabel('MSE Reconstruction Error', fontsize=11)
-axes[0].grid(True, alpha=0.3)
-axes[0].legend()
-
-# Scatter: Error vs Score
-axes[1].scatter(reconstruction_errors, bio_stability_scores, alpha=0.5, s=10, color='#6A4C93')
-axes[1].set_title('Reconstruction Error vs Bio-Stability Score', fontsize=13, fontweight='bold')
-axes[1].set_xlabel('Reconstruction Error (MSE)', fontsize=11)
-axes[1].set_ylabel('Bio-Stability Score', fontsize=11)
-axes[1].grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('bio_reconstruction_analysis.png', dpi=150, bbox_inches='tight')
-print("✓ Saved analysis plot as 'bio_reconstruction_analysis.png'")
-plt.show()
-
-# Summary Statistics
-print("\n" + "=" * 80)
-print("SUMMARY")
-print("=" * 80)
-print(f"✓ Biological features extracted: {NUM_BIO_FEATURES}")
-print(f"✓ Training samples: {X_train_bio.shape[0]}")
-print(f"✓ Test samples: {X_test_bio.shape[0]}")
-print(f"✓ Latent dimension: {LATENT_DIM}")
-print(f"✓ Average Bio-Stability Score: {bio_stability_scores.mean():.2f}")
-print(f"✓ Scaling Factor: {scaling_factor:.2f}")
-print(f"✓ Model trained for {len(history.history['total_loss'])} epochs")
-print("=" * 80)
-print("\n✓ All files saved successfully!")
-print("  - bio_stability_scores.npy")
-print("  - X_test_bio.npy")
-print("  - bio_vae_weights.h5")
-print("  - bio_vae_training_history.png")
-print("  - bio_stability_scores_visualization.png")
-print("  - bio_reconstruction_analysis.png")
-print("\n" + "=" * 80)
+def save_results(vae, history, X_test_bio, reconstruction_errors, scaling_factor, bio_stability_scores,
+                 bio_features=BIO_FEATURES, latent_dim=LATENT_DIM, hidden_dim=HIDDEN_DIM, window_ends=None,
+                 normalization=None):
+    from bio_vae.config import save_model_config
+    from bio_vae.numpy_inference import export_npz
+
+    # Save the scores, plus the raw errors and loss history so --plots-only can redraw everything
+    np.save(SCORES_FILE, bio_stability_scores)
+    print(f"✓ Saved '{SCORES_FILE}'")
+    # Timestamp-keyed copy for downstream joins (AEON); reruns replace the overlapping windows
+    if window_ends is not None:
+        append_scores(SCORE_STORE, window_ends, reconstruction_errors, bio_stability_scores)
+        print(f"✓ Stored {len(window_ends):,} test-window scores in '{SCORE_STORE}/'")
+    else:
+        print(f"⚠ Test windows carry no timestamps; fill '{SCORE_STORE}/' with score_bio_vae.py")
+    np.save(ERRORS_FILE, reconstruction_errors)
+    print(f"✓ Saved '{ERRORS_FILE}'")
+    # Fresh sketches for the new model; score_bio_vae.py folds later windows into them
+    save_sketches(SKETCH_FILE, update_sketches({}, reconstruction_errors, bio_stability_scores))
+    print(f"✓ Saved error/score sketches as '{SKETCH_FILE}'")
+    with open(HISTORY_FILE, 'w', encoding='utf-8') as fp:
+        json.dump(history, fp, indent=2)
+    print(f"✓ Saved '{HISTORY_FILE}'")
+
+    # Save the sliced test data
+    np.save('X_test_bio.npy', X_test_bio)
+    print("✓ Saved 'X_test_bio.npy'")
+
+    # Save the model and the scoring calibration, so new windows can be scored without retraining
+    vae.save_weights(WEIGHTS_FILE)
+    print(f"✓ Saved model weights as '{WEIGHTS_FILE}'")
+    model_config = save_model_config(
+        MODEL_CONFIG_FILE, bio_features, X_test_bio.shape[1], latent_dim, hidden_dim, scaling_factor,
+        mean_error=float(reconstruction_errors.mean()), weights_file=WEIGHTS_FILE, normalization=normalization,
+    )
+    print(f"✓ Saved model config and scaling factor as '{MODEL_CONFIG_FILE}'")
+    export_npz(vae, model_config, NPZ_WEIGHTS_FILE)
+    print(f"✓ Exported numpy inference weights as '{NPZ_WEIGHTS_FILE}'")
+
+
+def _pyplot():
+    import matplotlib
+
+    # Render to files only; never open a window that blocks the run.
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def plot_training_history(history, path='bio_vae_training_history.png'):
+    plt = _pyplot()
+    plt.figure(figsize=(15, 4))
+
+    panels = [
+        ('total_loss', 'Total Loss'),
+        ('reconstruction_loss', 'Reconstruction Loss'),
+        ('kl_loss', 'KL Divergence Loss'),
+    ]
+    for position, (key, title) in enumerate(panels, start=1):
+        plt.subplot(1, 3, position)
+        plt.plot(history[key])
+        plt.title(title)
+        plt.xlabel('Epoch')
+        plt.ylabel('Loss')
+        plt.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Training history plot saved as '{path}'")
+
+
+def plot_scores(bio_stability_scores, path='bio_stability_scores_visualization.png'):
+    plt = _pyplot()
+    plt.figure(figsize=(16, 6))
+
+    # Visualization 1: Bio-Stability Score Over Time
+    plt.subplot(2, 1, 1)
+    plt.plot(bio_stability_scores, linewidth=0.8, alpha=0.7, color='#2E86AB')
+    plt.axhline(y=bio_stability_scores.mean(), color='red', linestyle='--',
+                label=f'Mean: {bio_stability_scores.mean():.2f}', linewidth=2)
+    plt.fill_between(range(len(bio_stability_scores)), 0, bio_stability_scores,
+                     alpha=0.2, color='#2E86AB')
+    plt.title('Bio-Stability Score Over Time', fontsize=14, fontweight='bold')
+    plt.xlabel('Sample Index (Time)', fontsize=11)
+    plt.ylabel('Bio-Stability Score', fontsize=11)
+    plt.ylim(0, 105)
+    plt.grid(True, alpha=0.3)
+    plt.legend()
+
+    # Visualization 2: Score Distribution
+    plt.subplot(2, 1, 2)
+    plt.hist(bio_stability_scores, bins=50, color='#A23B72', alpha=0.7, edgecolor='black')
+    plt.axvline(x=bio_stability_scores.mean(), color='red', linestyle='--',
+                label=f'Mean: {bio_stability_scores.mean():.2f}', linewidth=2)
+    plt.title('Bio-Stability Score Distribution', fontsize=14, fontweight='bold')
+    plt.xlabel('Bio-Stability Score', fontsize=11)
+    plt.ylabel('Frequency', fontsize=11)
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.legend()
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close()
+    print(f"✓ Saved visualization as '{path}'")
+
+
+def plot_reconstruction_analysis(reconstruction_errors, bio_stability_scores, path='bio_reconstruction_analysis.png'):
+    plt = _pyplot()
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    # Reconstruction Error Over Time
+    axes[0].plot(reconstruction_errors, linewidth=0.8, alpha=0.7, color='#F18F01')
+    axes[0].axhline(y=reconstruction_errors.mean(), color='red', linestyle='--',
+                    label=f'Mean: {reconstruction_errors.mean():.4f}', linewidth=2)
+    axes[0].set_title('Reconstruction Error Over Time', fontsize=13, fontweight='bold')
+    axes[0].set_xlabel('Sample Index (Time)', fontsize=11)
+    axes[0].set_ylabel('MSE Reconstruction Error', fontsize=11)
+    axes[0].grid(True, alpha=0.3)
+    axes[0].legend()
+
+    # Scatter: Error vs Score
+    axes[1].scatter(reconstruction_errors, bio_stability_scores, alpha=0.5, s=10, color='#6A4C93')
+    axes[1].set_title('Reconstruction Error vs Bio-Stability Score', fontsize=13, fontweight='bold')
+    axes[1].set_xlabel('Reconstruction Error (MSE)', fontsize=11)
+    axes[1].set_ylabel('Bio-Stability Score', fontsize=11)
+    axes[1].grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+    print(f"✓ Saved analysis plot as '{path}'")
+
+
+def make_plots(history=None, reconstruction_errors=None, bio_stability_scores=None):
+    """Render every figure; anything not passed in is read from the saved artifacts."""
+    if history is None:
+        with open(HISTORY_FILE, 'r', encoding='utf-8') as fp:
+            history = json.load(fp)
+    if reconstruction_errors is None:
+        reconstruction_errors = np.load(ERRORS_FILE)
+    if bio_stability_scores is None:
+        bio_stability_scores = np.load(SCORES_FILE)
+
+    plot_training_history(history)
+    plot_scores(bio_stability_scores)
+    plot_reconstruction_analysis(reconstruction_errors, bio_stability_scores)
+
+
+def run(no_plots=False, features_path=FEATURES_FILE, input_pipeline=None, normalization_stats=None):
+    print("=" * 80)
+    print("BIO-EXCLUSIVE VAE - ANOMALY DETECTION")
+    print("=" * 80)
+
+    print("\n[STEP 1] Loading data and extracting biological features...")
+    features_path = resolve_features_path(features_path)
+    normalization = load_training_normalization(features_path, normalization_stats)
+    data = load_bio_data(features_path)
+
+    print("\n[STEP 2] Building Bio-Exclusive VAE architecture...")
+    print("\n[STEP 3] Training the Bio-Exclusive VAE...")
+    vae, history, pipeline_summary = train_vae(
+        data, TIMESTEPS, NUM_BIO_FEATURES, LATENT_DIM, HIDDEN_DIM, LEARNING_RATE, EPOCHS, BATCH_SIZE,
+        input_pipeline=input_pipeline, shuffle_buffer=SHUFFLE_BUFFER,
+    )
+    print_pipeline_report(pipeline_summary)
+    print("\n✓ Training complete!")
+
+    print("\n[STEP 4] Calculating Bio-Stability Scores...")
+    X_test_bio = data['X_test_bio']
+    reconstruction_errors, scaling_factor, bio_stability_scores = compute_scores(vae, X_test_bio)
+
+    print("\n[STEP 5] Saving results and creating visualizations...")
+    save_results(vae, history, X_test_bio, reconstruction_errors, scaling_factor, bio_stability_scores,
+                 window_ends=data['test_window_ends'], normalization=normalization)
+    if not no_plots:
+        make_plots(history, reconstruction_errors, bio_stability_scores)
+
+    # Summary Statistics
+    print("\n" + "=" * 80)
+    print("SUMMARY")
+    print("=" * 80)
+    print(f"✓ Biological features extracted: {NUM_BIO_FEATURES}")
+    print(f"✓ Training samples: {data['num_train_samples']}")
+    print(f"✓ Test samples: {X_test_bio.shape[0]}")
+    print(f"✓ Latent dimension: {LATENT_DIM}")
+    print(f"✓ Average Bio-Stability Score: {bio_stability_scores.mean():.2f}")
+    print(f"✓ Scaling Factor: {scaling_factor:.2f}")
+    print(f"✓ Model trained for {len(history['total_loss'])} epochs")
+    print("=" * 80)
+    print("\n✓ All files saved successfully!")
+    print(f"  - {SCORES_FILE}")
+    if data['test_window_ends'] is not None:
+        print(f"  - {SCORE_STORE}/")
+    print(f"  - {ERRORS_FILE}")
+    print(f"  - {SKETCH_FILE}")
+    print(f"  - {HISTORY_FILE}")
+    print("  - X_test_bio.npy")
+    print(f"  - {WEIGHTS_FILE}")
+    print(f"  - {MODEL_CONFIG_FILE}")
+    print(f"  - {NPZ_WEIGHTS_FILE}")
+    print(f"  - {PIPELINE_REPORT_FILE}")
+    if not no_plots:
+        print("  - bio_vae_training_history.png")
+        print("  - bio_stability_scores_visualization.png")
+        print("  - bio_reconstruction_analysis.png")
+    print("\n" + "=" * 80)
+    return {
+        'vae': vae,
+        'history': history,
+        'reconstruction_errors': reconstruction_errors,
+        'scaling_factor': scaling_factor,
+        'bio_stability_scores': bio_stability_scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the Bio-Exclusive VAE and compute Bio-Stability Scores")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--no-plots", action="store_true", help="Skip all figures (matplotlib is never imported)")
+    mode.add_argument("--plots-only", action="store_true",
+                      help="Only redraw figures from saved scores/errors/history (TensorFlow is never imported)")
+    parser.add_argument("--features", default=FEATURES_FILE)
+    parser.add_argument("--input-pipeline", choices=["tfdata", "generator", "memory"], default=None,
+                        help="Defaults to BDA_INPUT_PIPELINE, else tfdata when a window index exists")
+    parser.add_argument("--normalization-stats", default=None,
+                        help="Stats the features were normalized with (default: the <features>.normalization.json sidecar)")
+    args = parser.parse_args()
+
+    if args.plots_only:
+        make_plots()
+        return
+    run(no_plots=args.no_plots, features_path=args.features, input_pipeline=args.input_pipeline,
+        normalization_stats=args.normalization_stats)
+
+
+if __name__ == "__main__":
+    main()
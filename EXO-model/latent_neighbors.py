@@ -0,0 +1,69 @@
+"""
+Bio-Exclusive VAE latent neighbours
+====================================
+Persist every window's encoder z_mean with its window-end timestamp and find the
+k most similar historical windows.
+
+Usage:
+    python latent_neighbors.py update [--features <normalized.csv|.parquet>]
+    python latent_neighbors.py update --rebuild   # after retraining: re-encode every window
+    python latent_neighbors.py query --at "2024-03-10 14:30" -k 5
+    python latent_neighbors.py query --z 0.12 -0.8 -k 10
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.latent_index import LATENTS_FILE, LatentIndex, update_latents
+from bio_vae.numpy_inference import NPZ_WEIGHTS_FILE, NumpyBioVAE
+
+
+def cmd_update(args):
+    model = NumpyBioVAE.load(args.npz)
+    try:
+        added = update_latents(model, args.features, path=args.latents, rebuild=args.rebuild)
+    except ValueError as exc:
+        sys.exit(f"✗ {exc} (pass --rebuild)")
+    print(f"✓ Added {added:,} window latents to {args.latents}")
+
+
+def cmd_query(args):
+    index = LatentIndex.load(args.latents)
+    if args.at:
+        result = index.query_time(args.at, k=args.k, exclude_minutes=args.exclude_minutes)
+    else:
+        result = index.query(args.z, k=args.k)
+    print(f"{args.k} nearest of {len(index):,} windows:")
+    print(result.to_string(index=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latent-space nearest-neighbour search over BioVAE windows")
+    parser.add_argument("--latents", default=LATENTS_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    update = sub.add_parser("update", help="Encode windows newer than the persisted latents")
+    update.add_argument("--features", default="health_net_features_2_normalize.csv")
+    update.add_argument("--npz", default=NPZ_WEIGHTS_FILE)
+    update.add_argument("--rebuild", action="store_true",
+                        help="Re-encode every window when the latents were written by another model")
+    update.set_defaults(func=cmd_update)
+
+    query = sub.add_parser("query", help="k most similar historical windows")
+    target = query.add_mutually_exclusive_group(required=True)
+    target.add_argument("--at", help="Window-end time of the query window (UTC if no offset)")
+    target.add_argument("--z", type=float, nargs="+", help="Latent vector to search around")
+    query.add_argument("-k", type=int, default=5)
+    query.add_argument("--exclude-minutes", type=int, default=60,
+                       help="With --at, skip windows ending this close to the query window")
+    query.set_defaults(func=cmd_query)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
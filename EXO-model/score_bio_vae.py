@@ -0,0 +1,84 @@
+"""
+Bio-Exclusive VAE scoring
+==========================
+Score new minutes with the trained BioVAE (bio_vae_weights.npz, or bio_vae_weights.h5 +
+bio_vae_config.json, written by bio_exclusive_vae.py) without retraining. Only windows ending after the
+last scored window are scored, and their scores are upserted into the Parquet score store keyed by
+the window-end timestamp (UTC). Errors and scores are folded into bio_score_sketches.json, whose running
+error mean shows how far the training-time calibration has drifted.
+
+Usage:
+    python score_bio_vae.py
+    python score_bio_vae.py --features <normalized.csv|.parquet> --scores bio_stability_scores
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.numpy_inference import NPZ_WEIGHTS_FILE, NumpyBioVAE
+from bio_vae.scoring import SCORES_FILE, SKETCH_FILE, calibrate_scaling_factor, score_new_windows
+from features.sketches import load_sketches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally score new windows with a trained BioVAE")
+    parser.add_argument("--features", default="health_net_features_2_normalize.csv")
+    parser.add_argument("--model-dir", default=".", help="Directory holding the weights and bio_vae_config.json")
+    parser.add_argument("--scores", default=SCORES_FILE, help="Score store directory")
+    parser.add_argument("--sketches", help=f"Error/score sketches to extend (default: <model-dir>/{SKETCH_FILE})")
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--engine", choices=["auto", "numpy", "keras"], default="auto",
+                        help="numpy uses bio_vae_weights.npz (no TensorFlow); auto picks it when present")
+    args = parser.parse_args()
+
+    features_path = args.features
+    if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
+        try:
+            from store.export_cache import cached_minute_features_csv
+
+            exported = cached_minute_features_csv()
+            if Path(exported).exists():
+                features_path = exported
+                print(f"Using Cassandra-exported dataset: {features_path}")
+        except Exception as exc:
+            print(f"⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
+
+    npz_path = Path(args.model_dir) / NPZ_WEIGHTS_FILE
+    engine = args.engine
+    if engine == "auto":
+        engine = "numpy" if npz_path.exists() else "keras"
+
+    started = time.perf_counter()
+    if engine == "numpy":
+        vae = NumpyBioVAE.load(npz_path)
+        config = vae.config
+    else:
+        from bio_vae.model import load_bio_vae
+
+        vae, config = load_bio_vae(args.model_dir)
+    print(f"✓ Loaded BioVAE [{engine}] (scaling factor {config['scaling_factor']:.2f}) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    sketch_path = args.sketches or str(Path(args.model_dir) / SKETCH_FILE)
+    written = score_new_windows(vae, config, features_path, scores_path=args.scores, batch_size=args.batch_size,
+                                sketch_path=sketch_path)
+    print(f"✓ Stored {written:,} window scores in {args.scores}")
+
+    errors = load_sketches(sketch_path).get("reconstruction_error")
+    if errors is not None and errors.count:
+        print(f"✓ Error sketch: {errors.count:,} windows, mean {errors.mean:.6f}, "
+              f"p50 {errors.quantile(0.5):.6f}, p95 {errors.quantile(0.95):.6f}")
+        if config.get("mean_error"):
+            # Same target deduction as at training time, calibrated on every window scored so far
+            target = 100.0 - config["scaling_factor"] * config["mean_error"]
+            print(f"  Scaling factor at the training target ({target:.0f}): {config['scaling_factor']:.2f} "
+                  f"trained, {calibrate_scaling_factor(errors.mean, target):.2f} from the sketch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Bio-Exclusive VAE hyperparameter sweep
+=======================================
+Trains one BioVAE per combination of the given values in parallel worker processes
+(each with its own thread limit), caches every result by config + data fingerprint,
+and writes a ranked table of reconstruction/KL losses.
+
+Usage:
+    python sweep_bio_vae.py --latent-dim 2 4 8 --hidden-dim 16 32 --workers 4 --threads-per-worker 2
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.sweep import DEFAULT_CACHE_DIR, run_sweep
+
+RESULTS_FILE = 'bio_vae_sweep_results.csv'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel, cached BioVAE hyperparameter sweep")
+    parser.add_argument("--latent-dim", type=int, nargs="+", default=[2, 4, 8])
+    parser.add_argument("--hidden-dim", type=int, nargs="+", default=[16, 32])
+    parser.add_argument("--learning-rate", type=float, nargs="+", default=[0.001])
+    parser.add_argument("--epochs", type=int, nargs="+", default=[30])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[32])
+    parser.add_argument("--workers", type=int, default=None, help="Default: CPUs // threads-per-worker")
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--data-dir", default=".", help="Directory with window_index.npz (or X_train/X_test.npy)")
+    parser.add_argument("--features", default="health_net_features_2_normalize.csv",
+                        help="Only needed to resolve column names for legacy X_*.npy windows")
+    parser.add_argument("--input-pipeline", choices=["tfdata", "generator", "memory"], default=None)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="Retrain every config (results are still cached)")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    args = parser.parse_args()
+
+    grid = {
+        'latent_dim': args.latent_dim,
+        'hidden_dim': args.hidden_dim,
+        'learning_rate': args.learning_rate,
+        'epochs': args.epochs,
+        'batch_size': args.batch_size,
+    }
+    table = run_sweep(
+        grid,
+        data_dir=args.data_dir,
+        features_path=args.features,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        input_pipeline=args.input_pipeline,
+    )
+
+    columns = ['rank', 'latent_dim', 'hidden_dim', 'learning_rate', 'epochs', 'batch_size',
+               'test_reconstruction_error', 'reconstruction_loss', 'kl_loss', 'epochs_run', 'cached']
+    print("\n" + "=" * 80)
+    print("RANKED CONFIGURATIONS (lowest held-out reconstruction error first)")
+    print("=" * 80)
+    print(table[columns].to_string(index=False))
+    table.to_csv(args.output, index=False)
+    print(f"\n✓ Saved ranked results to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-import pandas as pd
 import numpy as np
 import os
 import sys
@@ -11,30 +10,20 @@ print("Loading normalized data...")
 data_path = r'c:\Users\shaba\Documents\Collage\BDA-netsec-DataAnalysis\LSTM model\health_net_features_2_normalize.csv'
 if os.getenv("BDA_USE_CASSANDRA", "0") == "1":
     try:
-        from store.cassandra_client import export_minute_features_csv
+        from store.export_cache import cached_minute_features_csv
 
-        exported = export_minute_features_csv(
-            output_path='output/streaming/exports/lstm_minute_features.csv',
-            limit=250000
-        )
+        exported = cached_minute_features_csv()
         if Path(exported).exists():
             data_path = exported
             print(f"Using Cassandra-exported dataset: {data_path}")
     except Exception as exc:
         print(f"⚠ Cassandra export unavailable, using local CSV. Reason: {exc}")
 
-df = pd.read_csv(data_path)
+# Only feature columns are read, chunk by chunk, straight into float32 with a parsed datetime index
+from features.loader import load_features
 
-print(f"Original shape: {df.shape}")
-print(f"Columns: {list(df.columns)}")
-
-# 2. Drop non-numeric timestamp columns
-timestamp_columns = ['datetime', 'date', 'time', 'hour', 'minute', 'day_of_week', 'day_numeric']
-print(f"\nDropping timestamp columns: {timestamp_columns}")
-
-# Keep only numeric feature columns
-df_features = df.drop(columns=timestamp_columns)
-print(f"Features shape after dropping timestamps: {df_features.shape}")
+df_features = load_features(data_path)
+print(f"Features shape: {df_features.shape}")
 print(f"Feature columns: {list(df_features.columns)}")
 
 # Convert to numpy array
@@ -46,90 +35,119 @@ target_column = 'stress_level'
 target_column_index = df_features.columns.get_loc(target_column)
 print(f"Target column '{target_column}' is at index: {target_column_index}")
 
-# 3. Define function to create sequences
-def create_sequences(data, target_column_index, window_size=60):
-    """
-    Create sliding window sequences for LSTM.
-    
-    Parameters:
-    - data: numpy array of shape (samples, features)
-    - target_column_index: index of the target column in the data
-    - window_size: number of time steps to look back
-    
-    Returns:
-    - X: 3D array of shape (num_sequences, window_size, num_features)
-    - y: 1D array of shape (num_sequences,) containing target values
-    """
-    X = []
-    y = []
-    
-    # Loop through the data, creating sequences
-    for i in range(window_size, len(data)):
-        # Get the past 'window_size' minutes of all features
-        X.append(data[i - window_size:i, :])
-        
-        # Get the stress_level at the current time step (61st minute)
-        y.append(data[i, target_column_index])
-    
-    return np.array(X), np.array(y)
-
-# 4. Create sequences
-print(f"\n{'='*80}")
-print("Creating sequences with window_size=60...")
-print(f"{'='*80}")
+# 3. Window settings
+#    Windows never span watch-off gaps or midnight; set BDA_MATERIALIZE_WINDOWS=1 to also
+#    write the legacy fully windowed X_train.npy/X_test.npy files.
+from sequences.windows import (
+    chronological_split,
+    sliding_windows,
+    save_window_dataset,
+    valid_window_starts,
+    walk_forward_folds,
+)
 
 window_size = 60
-X, y = create_sequences(data_array, target_column_index, window_size)
+stride = 1
+forecast_horizons = [1]          # minutes after the last input row
+target_columns = [target_column]
+walk_forward_fold_count = 5
+materialize_windows = os.getenv("BDA_MATERIALIZE_WINDOWS", "0") == "1"
 
-print(f"\nSequences created!")
-print(f"X shape: {X.shape}  (samples, time_steps, features)")
-print(f"y shape: {y.shape}  (samples,)")
+# 4. Build the gap-aware window index
+print(f"\n{'='*80}")
+print(f"Indexing windows (window_size={window_size}, stride={stride}, horizons={forecast_horizons})...")
+print(f"{'='*80}")
 
-# 5. Split into Train (80%) and Test (20%) - chronologically
+timestamps = df_features.index
+starts = valid_window_starts(
+    timestamps,
+    window_size,
+    horizons=forecast_horizons,
+    stride=stride,
+    break_on_day=True,
+)
+contiguous_count = max(0, (len(data_array) - window_size - max(forecast_horizons) + 1 + stride - 1) // stride)
+
+print(f"\nValid windows: {len(starts):,} of {contiguous_count:,} "
+      f"({contiguous_count - len(starts):,} dropped for spanning a gap or day boundary)")
+print(f"X shape: ({len(starts)}, {window_size}, {data_array.shape[1]})  (samples, time_steps, features)")
+
+# 5. Split into Train (80%) and Test (20%) - chronologically, as index ranges
 print(f"\n{'='*80}")
 print("Splitting data chronologically (80% train, 20% test)...")
 print(f"{'='*80}")
 
-split_index = int(len(X) * 0.8)
+purge = window_size + max(forecast_horizons) - 1
+splits = chronological_split(len(starts), train_fraction=0.8, purge=purge)
+folds = walk_forward_folds(len(starts), n_folds=walk_forward_fold_count, purge=purge)
+
+train_starts = starts[splits['train'][0]:splits['train'][1]]
+test_starts = starts[splits['test'][0]:splits['test'][1]]
+
+# Targets are small, so they are gathered directly: (samples, horizons, targets)
+target_indices = [df_features.columns.get_loc(c) for c in target_columns]
+def gather_targets(window_starts):
+    rows = window_starts[:, None] + (window_size - 1) + np.asarray(forecast_horizons)
+    targets = data_array[rows[..., None], target_indices]
+    return targets[:, 0, 0] if targets.shape[1:] == (1, 1) else targets
 
-X_train = X[:split_index]
-y_train = y[:split_index]
-X_test = X[split_index:]
-y_test = y[split_index:]
+y_train = gather_targets(train_starts)
+y_test = gather_targets(test_starts)
 
 # 6. Print shapes
 print(f"\nTrain set:")
-print(f"  X_train shape: {X_train.shape}")
+print(f"  X_train shape: ({len(train_starts)}, {window_size}, {data_array.shape[1]})")
 print(f"  y_train shape: {y_train.shape}")
 
 print(f"\nTest set:")
-print(f"  X_test shape: {X_test.shape}")
+print(f"  X_test shape: ({len(test_starts)}, {window_size}, {data_array.shape[1]})")
 print(f"  y_test shape: {y_test.shape}")
 
-# 7. Save arrays as .npy files
+print(f"\nWalk-forward folds (window positions, train [lo, hi) / test [lo, hi)):")
+for k, (train_lo, train_hi, test_lo, test_hi) in enumerate(folds):
+    print(f"  Fold {k}: train [{train_lo}, {train_hi})  test [{test_lo}, {test_hi})")
+
+# 7. Save the base matrix + window index (mmap-friendly); full window tensors only on request
 print(f"\n{'='*80}")
-print("Saving arrays to .npy files...")
+print("Saving base feature matrix and window index...")
 print(f"{'='*80}")
 
 output_dir = r'c:\Users\shaba\Documents\Collage\BDA-netsec-DataAnalysis\LSTM model'
 
-np.save(os.path.join(output_dir, 'X_train.npy'), X_train)
+features_file, index_file = save_window_dataset(
+    output_dir,
+    data_array,
+    list(df_features.columns),
+    starts,
+    splits,
+    window_size,
+    target_columns,
+    horizons=forecast_horizons,
+    folds=folds,
+    timestamps=timestamps,
+)
 np.save(os.path.join(output_dir, 'y_train.npy'), y_train)
-np.save(os.path.join(output_dir, 'X_test.npy'), X_test)
 np.save(os.path.join(output_dir, 'y_test.npy'), y_test)
 
-print(f"\n✓ Saved: X_train.npy")
+print(f"\n✓ Saved: {os.path.basename(features_file)} (float32, open with mmap_mode='r')")
+print(f"✓ Saved: {os.path.basename(index_file)} (valid window starts, split ranges, folds)")
 print(f"✓ Saved: y_train.npy")
-print(f"✓ Saved: X_test.npy")
 print(f"✓ Saved: y_test.npy")
 
+if materialize_windows:
+    windows = sliding_windows(data_array, window_size)
+    np.save(os.path.join(output_dir, 'X_train.npy'), windows[train_starts])
+    np.save(os.path.join(output_dir, 'X_test.npy'), windows[test_starts])
+    print(f"✓ Saved: X_train.npy")
+    print(f"✓ Saved: X_test.npy")
+
 print(f"\n{'='*80}")
 print("SUMMARY")
 print(f"{'='*80}")
 print(f"Window size: {window_size} minutes")
-print(f"Number of features: {X.shape[2]}")
-print(f"Total sequences: {len(X):,}")
-print(f"Training sequences: {len(X_train):,} ({len(X_train)/len(X)*100:.1f}%)")
-print(f"Testing sequences: {len(X_test):,} ({len(X_test)/len(X)*100:.1f}%)")
+print(f"Number of features: {data_array.shape[1]}")
+print(f"Total sequences: {len(starts):,}")
+print(f"Training sequences: {len(train_starts):,} ({len(train_starts)/len(starts)*100:.1f}%)")
+print(f"Testing sequences: {len(test_starts):,} ({len(test_starts)/len(starts)*100:.1f}%)")
 print(f"\nAll files saved to: {output_dir}")
 print("\n✓ Data preparation complete! Ready for LSTM training.")
@@ -0,0 +1,156 @@
+"""
+AEON component cache and re-weighting
+The z-value behind every component score is persisted column by column
+(float32 .npy, memory-mapped on load). New pillar weights or z -> score
+mappings are then applied to the cached columns one at a time — an
+elementwise mapping accumulated into the pillars and the index — instead of
+recomputing everything from the raw CSV, and without ever stacking the
+columns into one in-memory matrix.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aeon.index import COMPONENTS, PILLAR_COLUMNS, PILLAR_WEIGHTS, RollingMean, from_utc_ns
+from aeon.rollups import AeonRollups
+
+CACHE_DIR = 'aeon_components'
+# z_to_score: score = clip(center -/+ scale * z, low, high), minus for inverted components
+DEFAULT_MAPPING = {'center': 50.0, 'scale': 10.0, 'low': 0.0, 'high': 100.0}
+
+
+def resolve_weights(weights=None):
+    """Pillar weights in PILLAR_WEIGHTS order, divided by their sum so the index stays on the 0-100 scale.
+
+    Unspecified pillars keep their default weight before the division, so
+    {'COG': 0.3} means COG 0.3 : BIO 0.4 : SLEEP 0.3 : ENV 0.2.
+    """
+    merged = {**PILLAR_WEIGHTS, **(weights or {})}
+    unknown = set(merged) - set(PILLAR_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown pillars {sorted(unknown)}, expected {list(PILLAR_WEIGHTS)}")
+    vector = np.array([merged[name] for name in PILLAR_WEIGHTS], dtype=np.float64)
+    if (vector < 0).any() or vector.sum() <= 0:
+        raise ValueError(f"Pillar weights must be non-negative with a positive sum, got {merged}")
+    return vector / vector.sum()
+
+
+def resolve_mapping(mapping=None):
+    """(center, scale, low, high, sign) vectors over COMPONENTS.
+
+    `mapping` may hold DEFAULT_MAPPING keys (applied to every component), per
+    component overrides under the component name, and `invert` per component.
+    """
+    mapping = mapping or {}
+    unknown = set(mapping) - set(DEFAULT_MAPPING) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown mapping keys {sorted(unknown)}")
+    base = {**DEFAULT_MAPPING, **{k: v for k, v in mapping.items() if k in DEFAULT_MAPPING}}
+    rows = []
+    for name, (_, invert) in COMPONENTS.items():
+        spec = {**base, 'invert': invert, **mapping.get(name, {})}
+        rows.append([spec['center'], spec['scale'], spec['low'], spec['high'], -1.0 if spec['invert'] else 1.0])
+    return np.array(rows, dtype=np.float64).T
+
+
+def pillar_matrix():
+    """(COMPONENTS x pillars) matrix that averages each pillar's components."""
+    pillars = list(PILLAR_WEIGHTS)
+    matrix = np.zeros((len(COMPONENTS), len(pillars)))
+    for row, (pillar, _) in enumerate(COMPONENTS.values()):
+        matrix[row, pillars.index(pillar)] = 1.0
+    return matrix / matrix.sum(axis=0)
+
+
+def component_scores(columns, mapping=None):
+    """Score column of every component (in COMPONENTS order), mapped one z column at a time."""
+    for column, (center, scale, low, high, sign) in zip(columns, resolve_mapping(mapping).T):
+        scores = np.array(column, dtype=np.float64)
+        scores *= sign * scale
+        scores += center
+        yield np.clip(scores, low, high, out=scores)
+
+
+def index_vector(weights=None):
+    """Per-component weight, so AEON_Index = component_scores @ index_vector."""
+    return pillar_matrix() @ resolve_weights(weights)
+
+
+class ComponentStore:
+    """Column-per-file cache of component z-values keyed by minute (`columns` in COMPONENTS order)."""
+
+    def __init__(self, datetime_ns, columns, tz):
+        self.datetime_ns = np.asarray(datetime_ns, dtype=np.int64)
+        self.columns = list(columns)
+        self.tz = str(tz)
+
+    def __len__(self):
+        return len(self.datetime_ns)
+
+    @property
+    def datetime(self):
+        return from_utc_ns(self.datetime_ns, self.tz)
+
+    @classmethod
+    def exists(cls, cache_dir=CACHE_DIR):
+        return (Path(cache_dir) / 'meta.json').exists()
+
+    @classmethod
+    def load(cls, cache_dir=CACHE_DIR, mmap=True):
+        cache_dir = Path(cache_dir)
+        with (cache_dir / 'meta.json').open('r', encoding='utf-8') as fp:
+            meta = json.load(fp)
+        if meta['components'] != list(COMPONENTS):
+            raise ValueError(f"{cache_dir} was written for components {meta['components']}")
+        mode = 'r' if mmap else None
+        columns = [np.load(cache_dir / f"{name}.npy", mmap_mode=mode) for name in meta['components']]
+        return cls(np.load(cache_dir / 'datetime.npy'), columns, meta['tz'])
+
+    @classmethod
+    def write(cls, cache_dir, datetimes, columns, append=False):
+        """Persist (or with append, extend) the z `columns` (COMPONENTS order); returns the resulting store."""
+        datetimes = pd.DatetimeIndex(pd.to_datetime(datetimes))
+        tz = datetimes.tz or 'UTC'
+        ns = datetimes.tz_convert('UTC').as_unit('ns').asi8 if datetimes.tz else datetimes.as_unit('ns').asi8
+        columns = [np.asarray(column, dtype=np.float32) for column in columns]
+        if append and cls.exists(cache_dir):
+            old = cls.load(cache_dir, mmap=False)
+            fresh = ns > (old.datetime_ns[-1] if len(old) else np.iinfo(np.int64).min)
+            ns = np.concatenate([old.datetime_ns, ns[fresh]])
+            columns = [np.concatenate([prev, column[fresh]]) for prev, column in zip(old.columns, columns)]
+            tz = old.tz
+
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for name, column in [('datetime', ns)] + list(zip(COMPONENTS, columns)):
+            tmp = cache_dir / f"{name}.tmp.npy"
+            np.save(tmp, np.ascontiguousarray(column))
+            tmp.replace(cache_dir / f"{name}.npy")
+        with (cache_dir / 'meta.json').open('w', encoding='utf-8') as fp:
+            json.dump({'components': list(COMPONENTS), 'tz': str(tz), 'rows': int(len(ns))}, fp, indent=2)
+        return cls(ns, columns, tz)
+
+
+def reweight(store, weights=None, mapping=None, window='7D', sketch=False):
+    """AEON pillars, index and 7-day average under new weights/mappings, plus their rollups.
+
+    Returns (wellness_df, rollups) where wellness_df carries datetime, the
+    pillar scores, AEON_Index and AEON_7Day_Avg. Quantile sketches are only
+    built with `sketch` (e.g. for a rollup cache that will be saved); without
+    them totals() reports count/mean/std from the hourly sums.
+    """
+    pillars = np.zeros((len(store), len(PILLAR_COLUMNS)))
+    index = np.zeros(len(store))
+    for scores, shares, weight in zip(component_scores(store.columns, mapping), pillar_matrix(),
+                                      index_vector(weights)):
+        pillar = int(np.flatnonzero(shares)[0])
+        pillars[:, pillar] += shares[pillar] * scores
+        index += weight * scores
+    wellness_df = pd.DataFrame(pillars, columns=PILLAR_COLUMNS)
+    wellness_df.insert(0, 'datetime', store.datetime)
+    wellness_df['AEON_Index'] = index
+    wellness_df['AEON_7Day_Avg'] = RollingMean(window).update(store.datetime_ns, wellness_df['AEON_Index'].to_numpy())
+    return wellness_df, AeonRollups.build(wellness_df, sketch=sketch)
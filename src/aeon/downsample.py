@@ -0,0 +1,69 @@
+"""
+Pixel-width downsampling for time series plots
+A figure can only show one column of pixels per x bucket, so drawing every
+minute of a long series mostly repaints the same pixels. These helpers pick
+the few points that keep the drawn shape: the min and max of every bucket
+(the visible envelope, spikes included) or Largest-Triangle-Three-Buckets.
+Both return sorted row indices into the original series.
+"""
+
+import numpy as np
+
+METHODS = ('minmax', 'lttb')
+
+
+def minmax_indices(x, y, n_buckets):
+    """Indices of the first/last point and the min and max of `y` within each of `n_buckets`
+    equal-width x buckets (at most 2 * n_buckets + 2 points). `x` must be sorted; NaNs are skipped.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.flatnonzero(~np.isnan(y))
+    if len(keep) <= 2 * n_buckets + 2:
+        return keep
+    xs, ys = x[keep], y[keep]
+    span = xs[-1] - xs[0]
+    bucket = np.minimum(((xs - xs[0]) / span * n_buckets).astype(np.int64), n_buckets - 1) if span else \
+        np.zeros(len(xs), dtype=np.int64)
+    # Within each bucket (buckets are contiguous because x is sorted) the first row of
+    # the y-sorted order is the minimum and the last one the maximum.
+    order = np.lexsort((ys, bucket))
+    sorted_bucket = bucket[order]
+    firsts = np.flatnonzero(np.concatenate([[True], sorted_bucket[1:] != sorted_bucket[:-1]]))
+    lasts = np.append(firsts[1:] - 1, len(order) - 1)
+    picked = np.concatenate([[0, len(xs) - 1], order[firsts], order[lasts]])
+    return keep[np.unique(picked)]
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: `n_out` indices (first and last included) that keep the
+    visual shape of the series. `x` must be sorted; NaNs are skipped.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = np.flatnonzero(~np.isnan(y))
+    if n_out < 3 or len(keep) <= n_out:
+        return keep
+    xs, ys = x[keep], y[keep]
+    edges = np.linspace(1, len(xs) - 1, n_out - 1).astype(np.int64)
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, len(xs) - 1
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Third vertex: the mean of the next bucket (the last point for the final bucket)
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else len(xs)
+        cx, cy = xs[nxt_lo:nxt_hi].mean(), ys[nxt_lo:nxt_hi].mean()
+        ax, ay = xs[picked[i]], ys[picked[i]]
+        area = np.abs((ax - cx) * (ys[lo:hi] - ay) - (ax - xs[lo:hi]) * (cy - ay))
+        picked[i + 1] = lo + int(np.argmax(area))
+    return keep[picked]
+
+
+def downsample_indices(x, y, n_pixels, method='minmax'):
+    """Row indices to draw for a series plotted `n_pixels` wide; `method` is one of METHODS."""
+    n_pixels = max(int(n_pixels), 2)
+    if method == 'minmax':
+        return minmax_indices(x, y, n_pixels)
+    if method == 'lttb':
+        return lttb_indices(x, y, n_pixels)
+    raise ValueError(f"Unknown downsampling method {method!r}, expected one of {METHODS}")
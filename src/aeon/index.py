@@ -0,0 +1,253 @@
+"""
+AEON Wellness Index
+Vectorized pillar math (BIO/SLEEP/ENV/COG, AEON_Index, AEON_7Day_Avg) with an
+incremental API: an AeonIndexer carries the running statistics and the 7-day
+ring buffer, so feeding a new day of minutes costs one day of compute.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from features.normalization import RunningStats
+
+PILLAR_WEIGHTS = {'BIO': 0.40, 'SLEEP': 0.30, 'ENV': 0.20, 'COG': 0.10}
+PILLAR_COLUMNS = [f"{name}_Score" for name in PILLAR_WEIGHTS]
+# Component -> (pillar, invert): each is a z-value mapped to 0-100 by z_to_score, pillars average them
+COMPONENTS = {
+    'stress': ('BIO', True),
+    'hr': ('BIO', True),
+    'battery': ('BIO', False),
+    'bio_stability': ('BIO', True),
+    'sleep': ('SLEEP', False),
+    'rain': ('ENV', True),
+    'wind': ('ENV', True),
+    'temp': ('ENV', True),
+    'screen': ('COG', True),
+    'phone': ('COG', True),
+}
+AVG_WINDOW = '7D'
+STATE_FILE = 'aeon_index_state.npz'
+
+
+def z_to_score(z_score, invert=False):
+    """
+    Convert Z-Score to 0-100 scale.
+
+    Args:
+        z_score: Standardized Z-score
+        invert: If True, higher Z-score = lower wellness (for "bad" metrics)
+
+    Returns:
+        Score clipped between 0 and 100
+    """
+    if invert:
+        # For "bad" things like stress: higher Z = lower score
+        score = 50 - (z_score * 10)
+    else:
+        # For "good" things like battery: higher Z = higher score
+        score = 50 + (z_score * 10)
+
+    return np.clip(score, 0, 100)
+
+
+def to_utc_ns(timestamps):
+    """int64 UTC nanoseconds of datetimes (already-int64 input is passed through)."""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype.kind in 'iu':
+        return timestamps.astype(np.int64, copy=False)
+    return pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True)).as_unit('ns').asi8
+
+
+def from_utc_ns(ns, tz='UTC'):
+    return pd.DatetimeIndex(np.asarray(ns, dtype=np.int64).view('M8[ns]')).tz_localize('UTC').tz_convert(tz)
+
+
+def _zscore(values, stats, ddof):
+    std = np.sqrt(stats.m2[0] / max(stats.count[0] - ddof, 1))
+    return (values - stats.mean[0]) / std
+
+
+class RollingMean:
+    """Time-based rolling mean over the trailing `window` (NaNs skipped), like pandas rolling('7D').
+
+    The entries still inside the window live in a ring buffer together with
+    their running sum, so each update only touches the new values and the ones
+    that fall out of the window. Timestamps must be strictly increasing; with
+    unique minutes the buffer never holds more than window-in-minutes entries.
+    """
+
+    def __init__(self, window=AVG_WINDOW, capacity=None):
+        self.window = pd.Timedelta(window)
+        self.capacity = int(capacity or self.window // pd.Timedelta(minutes=1))
+        self.ring_ns = np.zeros(self.capacity, dtype=np.int64)
+        self.ring = np.full(self.capacity, np.nan)
+        self.start = 0     # slot of the oldest entry
+        self.count = 0     # entries inside the window
+        self.total = 0.0   # sum of the non-NaN entries
+        self.valid = 0     # number of non-NaN entries
+
+    def _slots(self):
+        return (self.start + np.arange(self.count)) % self.capacity
+
+    def ordered(self):
+        """(timestamps ns, values) of the entries inside the window, oldest first."""
+        slots = self._slots()
+        return self.ring_ns[slots], self.ring[slots]
+
+    def update(self, timestamps, values):
+        """Push time-ordered (timestamp, value) pairs and return the rolling mean at each one."""
+        ts = to_utc_ns(timestamps)
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if not n:
+            return values
+        old_ns, old_values = self.ordered()
+        all_ns = np.concatenate([old_ns, ts])
+        if np.any(np.diff(all_ns) <= 0):
+            raise ValueError("RollingMean timestamps must be strictly increasing")
+
+        # Entry k of (buffer + values) has left the window of time t once all_ns[k] <= t - window.
+        leaving = np.concatenate([old_values, values])
+        out_sum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(leaving))])
+        out_valid = np.concatenate([[0], np.cumsum(~np.isnan(leaving))])
+        gone = np.searchsorted(all_ns, ts - self.window.value, side='right')
+
+        sums = self.total + np.cumsum(np.nan_to_num(values)) - out_sum[gone]
+        valid = self.valid + np.cumsum(~np.isnan(values)) - out_valid[gone]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(valid > 0, sums / np.maximum(valid, 1), np.nan)
+
+        # Drop what left the window, then append the new entries that are still inside it.
+        dropped = int(gone[-1])
+        dropped_old = min(dropped, self.count)
+        self.start = (self.start + dropped_old) % self.capacity
+        self.count -= dropped_old
+        kept = n - (dropped - dropped_old)
+        if self.count + kept > self.capacity:
+            raise ValueError(f"More than {self.capacity} entries inside a {self.window} window")
+        slots = (self.start + self.count + np.arange(kept)) % self.capacity
+        self.ring_ns[slots], self.ring[slots] = ts[n - kept:], values[n - kept:]
+        self.count += kept
+        self.total, self.valid = float(sums[-1]), int(valid[-1])
+        return means
+
+
+class AeonIndexer:
+    """Incremental AEON Index over minutes fed in time order.
+
+    The bio-stability and temperature-deviation z-scores use running
+    statistics that include each new batch, so scoring the full history in
+    one update matches a batch computation; later batches are scored against
+    everything seen so far and earlier minutes are not rescored.
+    """
+
+    def __init__(self, weights=None, window=AVG_WINDOW):
+        self.weights = dict(weights or PILLAR_WEIGHTS)
+        self.bio_stats = RunningStats(1)
+        self.temp_stats = RunningStats(1)
+        self.rolling = RollingMean(window)
+        self.last_datetime = None
+
+    def update(self, df, bio_scores, return_components=False):
+        """Pillar scores, AEON_Index and AEON_7Day_Avg for new minutes.
+
+        `df` holds a `datetime` column plus the AEON input columns; `bio_scores`
+        is aligned with its rows. Minutes at or before the last one already fed
+        are dropped. With return_components, also returns the float32 z-value column
+        of every component (COMPONENTS order) behind the scores.
+        """
+        order = np.argsort(pd.to_datetime(df['datetime'], utc=True).to_numpy(), kind='stable')
+        wellness_df = df.iloc[order].reset_index(drop=True)
+        bio_scores = np.asarray(bio_scores, dtype=np.float64)[order]
+        if self.last_datetime is not None:
+            fresh = (pd.to_datetime(wellness_df['datetime'], utc=True) > self.last_datetime).to_numpy()
+            wellness_df, bio_scores = wellness_df[fresh].reset_index(drop=True), bio_scores[fresh]
+        if wellness_df.empty:
+            return (wellness_df, [np.empty(0, dtype=np.float32)] * len(COMPONENTS)) if return_components else wellness_df
+
+        # --- BIO PILLAR (40%): Inverted Stress, Inverted HR, Body Battery, Bio Stability Score ---
+        wellness_df['stress_score'] = z_to_score(wellness_df['stress_level'], invert=True)
+        wellness_df['hr_score'] = z_to_score(wellness_df['heart_rate'], invert=True)
+        wellness_df['battery_score'] = z_to_score(wellness_df['body_battery'], invert=False)
+        self.bio_stats.update(bio_scores)
+        bio_z = _zscore(bio_scores, self.bio_stats, ddof=0)
+        wellness_df['bio_stability_score'] = z_to_score(bio_z, invert=True)
+        wellness_df['BIO_Score'] = wellness_df[
+            ['stress_score', 'hr_score', 'battery_score', 'bio_stability_score']].sum(axis=1, skipna=False) / 4
+
+        # --- SLEEP PILLAR (30%) ---
+        wellness_df['SLEEP_Score'] = z_to_score(wellness_df['sleep_duration_of_day'], invert=False)
+
+        # --- ENV PILLAR (20%): rain, wind, temperature deviation ---
+        wellness_df['rain_score'] = z_to_score(wellness_df['rain_mm'], invert=True)
+        wellness_df['wind_score'] = z_to_score(wellness_df['wind_speed_kmh'], invert=True)
+        temp_deviation = np.abs(wellness_df['temperature_celsius'].to_numpy(dtype=np.float64))
+        self.temp_stats.update(temp_deviation)
+        temp_z = _zscore(temp_deviation, self.temp_stats, ddof=1)
+        wellness_df['temp_score'] = z_to_score(temp_z, invert=True)
+        wellness_df['ENV_Score'] = wellness_df[
+            ['rain_score', 'wind_score', 'temp_score']].sum(axis=1, skipna=False) / 3
+
+        # --- COG PILLAR (10%): screen streaks and phone activity ---
+        wellness_df['screen_score'] = z_to_score(wellness_df['screen_streak_minutes'], invert=True)
+        wellness_df['phone_score'] = z_to_score(wellness_df['phone_active'], invert=True)
+        wellness_df['COG_Score'] = wellness_df[['screen_score', 'phone_score']].sum(axis=1, skipna=False) / 2
+
+        wellness_df['AEON_Index'] = sum(wellness_df[f"{name}_Score"] * w for name, w in self.weights.items())
+        # Time-based: the mean over the trailing 7 days of minutes, however many rows that is across gaps
+        wellness_df['AEON_7Day_Avg'] = self.rolling.update(
+            wellness_df['datetime'], wellness_df['AEON_Index'].to_numpy())
+
+        self.last_datetime = pd.Timestamp(pd.to_datetime(wellness_df['datetime'], utc=True).max())
+        if not return_components:
+            return wellness_df
+        component_z = [np.asarray(column, dtype=np.float32) for column in (
+            wellness_df['stress_level'], wellness_df['heart_rate'], wellness_df['body_battery'], bio_z,
+            wellness_df['sleep_duration_of_day'],
+            wellness_df['rain_mm'], wellness_df['wind_speed_kmh'], temp_z,
+            wellness_df['screen_streak_minutes'], wellness_df['phone_active'],
+        )]
+        return wellness_df, component_z
+
+    def save(self, path=STATE_FILE):
+        rolling = self.rolling
+        tmp = Path(str(path) + '.tmp.npz')
+        np.savez(
+            tmp,
+            weights=np.array([self.weights[name] for name in PILLAR_WEIGHTS]),
+            bio_stats=np.concatenate([self.bio_stats.count, self.bio_stats.mean, self.bio_stats.m2]),
+            temp_stats=np.concatenate([self.temp_stats.count, self.temp_stats.mean, self.temp_stats.m2]),
+            window_ns=np.array([rolling.window.value], dtype=np.int64),
+            ring_ns=rolling.ring_ns,
+            ring=rolling.ring,
+            ring_meta=np.array([rolling.start, rolling.count, rolling.valid], dtype=np.int64),
+            ring_total=np.array([rolling.total]),
+            last_datetime=np.array([-1 if self.last_datetime is None else self.last_datetime.value], dtype=np.int64),
+        )
+        tmp.replace(path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path=STATE_FILE):
+        with np.load(path) as state:
+            indexer = cls(dict(zip(PILLAR_WEIGHTS, state['weights'].tolist())),
+                          window=pd.Timedelta(int(state['window_ns'][0]), unit='ns'))
+            for stats, packed in ((indexer.bio_stats, state['bio_stats']), (indexer.temp_stats, state['temp_stats'])):
+                stats.count, stats.mean, stats.m2 = (packed[i:i + 1].copy() for i in range(3))
+            indexer.rolling.capacity = len(state['ring'])
+            indexer.rolling.ring_ns, indexer.rolling.ring = state['ring_ns'].copy(), state['ring'].copy()
+            indexer.rolling.start, indexer.rolling.count, indexer.rolling.valid = (int(v) for v in state['ring_meta'])
+            indexer.rolling.total = float(state['ring_total'][0])
+            last = int(state['last_datetime'][0])
+            indexer.last_datetime = None if last < 0 else pd.Timestamp(last, unit='ns', tz='UTC')
+        return indexer
+
+    @classmethod
+    def load_or_new(cls, path=STATE_FILE):
+        return cls.load(path) if Path(path).exists() else cls()
+
+
+def compute_wellness(df, bio_scores, weights=None):
+    """One-shot AEON computation over a full history (a fresh AeonIndexer fed once)."""
+    return AeonIndexer(weights).update(df, bio_scores)
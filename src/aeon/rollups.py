@@ -0,0 +1,197 @@
+"""
+AEON rollup cache
+One pass over the scored minutes builds hourly sums; days and the weekday x hour
+profile are derived from the hours. Every level is persisted as Parquet, so the
+dashboard panels and the summary report never regroup minute rows. Overall
+moments and quantiles of each metric come from a streaming sketch per metric
+(sketches.json) that new minutes are folded into.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aeon.index import PILLAR_COLUMNS, from_utc_ns, to_utc_ns
+from features.sketches import StreamSketch, load_sketches, save_sketches
+
+ROLLUP_METRICS = PILLAR_COLUMNS + ['AEON_Index']
+MINUTE_COLUMNS = ['datetime', 'AEON_Index', 'AEON_7Day_Avg']
+STATS = ['count', 'sum', 'sum_sq', 'min', 'max']
+LEVELS = ['minute', 'hour', 'day', 'weekday_hour']
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+CACHE_DIR = 'aeon_rollups'
+SKETCH_FILE = 'sketches.json'
+SUMMARY_QUANTILES = (0.05, 0.5, 0.95)
+HOUR_NS = 3600 * 1_000_000_000
+
+
+def hourly_stats(wellness_df, metrics=ROLLUP_METRICS):
+    """Per-hour count/sum/sum_sq/min/max of each metric in one vectorized pass over the minutes.
+
+    Hours are keyed by their UTC start (`hour_ts`); NaNs are skipped per metric.
+    """
+    ts = to_utc_ns(wellness_df['datetime'])
+    values = wellness_df[list(metrics)].to_numpy(dtype=np.float64)
+    if np.any(np.diff(ts) < 0):
+        order = np.argsort(ts, kind='stable')
+        ts, values = ts[order], values[order]
+    hours = ts // HOUR_NS
+    starts = np.flatnonzero(np.concatenate([[True], np.diff(hours) != 0]))
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+
+    out = {
+        'hour_ts': from_utc_ns(hours[starts] * HOUR_NS),
+        'minute_count': np.diff(np.append(starts, len(hours))),
+    }
+    for i, metric in enumerate(metrics):
+        out[f"{metric}_count"] = np.add.reduceat(present[:, i], starts).astype(np.int64)
+        out[f"{metric}_sum"] = np.add.reduceat(filled[:, i], starts)
+        out[f"{metric}_sum_sq"] = np.add.reduceat(filled[:, i] ** 2, starts)
+        out[f"{metric}_min"] = np.minimum.reduceat(np.where(present[:, i], values[:, i], np.inf), starts)
+        out[f"{metric}_max"] = np.maximum.reduceat(np.where(present[:, i], values[:, i], -np.inf), starts)
+    frame = pd.DataFrame(out)
+    for metric in metrics:
+        empty = frame[f"{metric}_count"] == 0
+        frame.loc[empty, [f"{metric}_min", f"{metric}_max"]] = np.nan
+    return frame
+
+
+def _combine(frame, keys, metrics):
+    """Merge partial stats rows that share `keys` (counts and sums add, min/max combine)."""
+    agg = {'minute_count': 'sum'}
+    for metric in metrics:
+        agg.update({f"{metric}_count": 'sum', f"{metric}_sum": 'sum', f"{metric}_sum_sq": 'sum',
+                    f"{metric}_min": 'min', f"{metric}_max": 'max'})
+    return frame.groupby(keys, sort=True).agg(agg).reset_index()
+
+
+def derive_levels(hour, tz, metrics=ROLLUP_METRICS):
+    """Day (local calendar date) and weekday x hour (local) rollups from the hourly rollup."""
+    local = hour['hour_ts'].dt.tz_convert(tz)
+    keyed = hour.assign(
+        day=local.dt.tz_localize(None).dt.normalize(),
+        day_name=local.dt.day_name(),
+        hour_of_day=local.dt.hour,
+    )
+    day = _combine(keyed.drop(columns=['hour_ts', 'day_name', 'hour_of_day']), ['day'], metrics)
+    weekday_hour = _combine(keyed.drop(columns=['hour_ts', 'day']), ['day_name', 'hour_of_day'], metrics)
+    return day, weekday_hour
+
+
+def means(frame, metrics=ROLLUP_METRICS):
+    """<metric> mean columns of a rollup level."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({m: frame[f"{m}_sum"] / frame[f"{m}_count"].replace(0, np.nan) for m in metrics},
+                            index=frame.index)
+
+
+class AeonRollups:
+    """Minute series plus hour/day/weekday x hour rollups of the AEON scores."""
+
+    def __init__(self, minute, hour, tz, metrics=ROLLUP_METRICS, sketches=None):
+        self.minute = minute
+        self.hour = hour
+        self.tz = str(tz)
+        self.metrics = list(metrics)
+        # None for caches written before sketches existed; totals() then falls back to the hourly sums
+        self.sketches = sketches if sketches and set(self.metrics) <= set(sketches) else None
+        self.day, self.weekday_hour = derive_levels(hour, self.tz, self.metrics)
+
+    @classmethod
+    def build(cls, wellness_df, metrics=ROLLUP_METRICS, sketch=True):
+        """Every level from scored minutes; `sketch=False` skips the per-metric quantile sketches."""
+        tz = wellness_df['datetime'].dt.tz
+        minute = wellness_df[MINUTE_COLUMNS]
+        if not minute['datetime'].is_monotonic_increasing:
+            minute = minute.sort_values('datetime', kind='stable')
+        minute = minute.reset_index(drop=True)
+        sketches = ({m: StreamSketch().update(wellness_df[m].to_numpy(dtype=np.float64)) for m in metrics}
+                    if sketch else None)
+        return cls(minute, hourly_stats(wellness_df, metrics), tz, metrics, sketches)
+
+    def update(self, new_df):
+        """Fold newly scored minutes into every level; only the new minutes are scanned."""
+        if new_df.empty:
+            return self
+        fresh = hourly_stats(new_df, self.metrics)
+        hour = _combine(pd.concat([self.hour, fresh], ignore_index=True), ['hour_ts'], self.metrics)
+        minute = pd.concat([self.minute, new_df[MINUTE_COLUMNS]], ignore_index=True)
+        minute['datetime'] = pd.to_datetime(minute['datetime'], utc=True).dt.tz_convert(self.tz)
+        sketches = None
+        if self.sketches is not None:
+            sketches = {m: self.sketches[m].copy().update(new_df[m].to_numpy(dtype=np.float64))
+                        for m in self.metrics}
+        return type(self)(minute, hour, self.tz, self.metrics, sketches)
+
+    # ---- summaries read by the dashboard and the report ----
+    def totals(self, quantiles=SUMMARY_QUANTILES):
+        """Overall count, mean and sample std of each metric, plus p05/p50/p95 (`quantiles`) when sketched."""
+        if self.sketches is not None:
+            summaries = [self.sketches[m].summary(quantiles) for m in self.metrics]
+            return pd.DataFrame(summaries, index=self.metrics).drop(columns=['min', 'max'])
+        count = self.hour[[f"{m}_count" for m in self.metrics]].sum().to_numpy(dtype=np.float64)
+        total = self.hour[[f"{m}_sum" for m in self.metrics]].sum().to_numpy()
+        total_sq = self.hour[[f"{m}_sum_sq" for m in self.metrics]].sum().to_numpy()
+        mean = total / np.maximum(count, 1)
+        variance = (total_sq - count * mean ** 2) / np.maximum(count - 1, 1)
+        return pd.DataFrame({'count': count, 'mean': mean, 'std': np.sqrt(np.clip(variance, 0, None))},
+                            index=self.metrics)
+
+    def daily_means(self, fill_gaps=True):
+        """Daily metric means indexed by local date; with fill_gaps, days without data are NaN rows."""
+        daily = means(self.day, self.metrics).set_axis(pd.DatetimeIndex(self.day['day']))
+        return daily.asfreq('D') if fill_gaps and len(daily) else daily
+
+    def heatmap(self, metric='AEON_Index'):
+        """Mean of `metric` by weekday (rows, Monday first) x local hour of day (columns)."""
+        table = self.weekday_hour.assign(value=means(self.weekday_hour, [metric])[metric])
+        table = table.pivot(index='day_name', columns='hour_of_day', values='value')
+        return table.reindex([d for d in DAY_ORDER if d in table.index])
+
+    def best_worst_days(self, metric='AEON_Index'):
+        """(best, worst): daily mean rows of every metric for the days with the highest/lowest `metric`.
+
+        (None, None) when no day has a mean of `metric` yet (empty cache or all-NaN metric).
+        """
+        daily = self.daily_means(fill_gaps=False)
+        if not daily[metric].notna().any():
+            return None, None
+        return daily.loc[daily[metric].idxmax()], daily.loc[daily[metric].idxmin()]
+
+    @property
+    def record_count(self):
+        return int(self.hour['minute_count'].sum())
+
+    # ---- persistence ----
+    def save(self, cache_dir=CACHE_DIR):
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        for level in LEVELS:
+            target = cache_dir / f"{level}.parquet"
+            tmp = target.with_name(target.name + '.tmp')
+            getattr(self, level).to_parquet(tmp, index=False)
+            tmp.replace(target)
+        if self.sketches is not None:
+            save_sketches(cache_dir / SKETCH_FILE, self.sketches)
+        with (cache_dir / 'meta.json').open('w', encoding='utf-8') as fp:
+            json.dump({'tz': self.tz, 'metrics': self.metrics}, fp, indent=2)
+        return str(cache_dir)
+
+    @classmethod
+    def load(cls, cache_dir=CACHE_DIR):
+        cache_dir = Path(cache_dir)
+        with (cache_dir / 'meta.json').open('r', encoding='utf-8') as fp:
+            meta = json.load(fp)
+        minute = pd.read_parquet(cache_dir / 'minute.parquet')
+        minute['datetime'] = pd.to_datetime(minute['datetime'], utc=True).dt.tz_convert(meta['tz'])
+        hour = pd.read_parquet(cache_dir / 'hour.parquet')
+        hour['hour_ts'] = pd.to_datetime(hour['hour_ts'], utc=True)
+        # day / weekday_hour are re-derived from the hours (tiny), the persisted copies serve external readers
+        return cls(minute, hour, meta['tz'], meta['metrics'], load_sketches(cache_dir / SKETCH_FILE))
+
+    @classmethod
+    def exists(cls, cache_dir=CACHE_DIR):
+        return (Path(cache_dir) / 'meta.json').exists()
@@ -0,0 +1,235 @@
+"""
+AEON aggregate service
+A small read-only HTTP/JSON front for the rollup cache (aeon_rollups/). The
+cache is loaded once and re-read only when its files change, every response
+carries an ETag derived from the cache version and the request, and
+`If-None-Match` polls are answered with 304 before any payload is built.
+
+Endpoints (GET, all JSON):
+    /health                         cache version, record count, first/last minute
+    /pillars                        count, mean, std and p05/p50/p95 of every pillar and AEON_Index
+    /best-worst?metric=AEON_Index   daily means of the best and worst day (404 while no day has a mean)
+    /rollups/hour|day?start=&end=&since=&raw=1
+    /rollups/weekday_hour
+    /minute?start=&end=&since=&max_points=
+
+`start`/`end` are inclusive ISO timestamps (naive ones are read in the cache's
+timezone); `since` is exclusive, so a poller passes the last timestamp it holds
+to fetch only what was appended.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from aeon.downsample import downsample_indices
+from aeon.index import to_utc_ns
+from aeon.rollups import CACHE_DIR, LEVELS, STATS, AeonRollups, means
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+RANGE_LEVELS = {'hour': 'hour_ts', 'day': 'day'}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+class NotFound(LookupError):
+    pass
+
+
+def _number(value):
+    return None if pd.isna(value) else float(value)
+
+
+def _to_json(frame):
+    """JSON array of records; timestamps as ISO-8601 UTC, NaN as null."""
+    return frame.to_json(orient='records', date_format='iso', date_unit='s')
+
+
+class RollupCache:
+    """The rollup cache of `cache_dir`, reloaded when its files change (checked at most every `check_interval` s)."""
+
+    def __init__(self, cache_dir=CACHE_DIR, check_interval=1.0):
+        self.cache_dir = Path(cache_dir)
+        self.check_interval = check_interval
+        self.rollups = None
+        self.version = None
+        self.minute_ns = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _signature(self):
+        files = [self.cache_dir / 'meta.json'] + [self.cache_dir / f"{level}.parquet" for level in LEVELS]
+        stats = [(f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in files if f.exists()]
+        return hashlib.sha1(repr(stats).encode()).hexdigest()[:16] if len(stats) == len(files) else None
+
+    def refresh(self, force=False):
+        """Reload the cache if it changed on disk; a half-written cache keeps the previous version."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self.rollups is not None and now - self._checked < self.check_interval:
+                return self
+            self._checked = now
+            signature = self._signature()
+            if signature is None or signature == self.version:
+                return self
+            try:
+                rollups = AeonRollups.load(self.cache_dir)
+            except (OSError, ValueError, KeyError):
+                return self
+            if self._signature() == signature:
+                self.rollups, self.version = rollups, signature
+                self.minute_ns = to_utc_ns(rollups.minute['datetime'])
+            return self
+
+    # ---- range handling ----
+    def timestamp(self, text):
+        try:
+            stamp = pd.Timestamp(text)
+        except ValueError as exc:
+            raise BadRequest(f"Invalid timestamp {text!r}") from exc
+        return stamp.tz_localize(self.rollups.tz) if stamp.tz is None else stamp
+
+    def _bounds(self, query):
+        """(start, end, since) as tz-aware Timestamps or None."""
+        return tuple(self.timestamp(query[key]) if query.get(key) else None for key in ('start', 'end', 'since'))
+
+    # ---- payloads ----
+    def health(self, query):
+        minute = self.rollups.minute
+        first, last = (minute['datetime'].iloc[[0, -1]] if len(minute) else (None, None))
+        return {'version': self.version, 'tz': self.rollups.tz, 'records': self.rollups.record_count,
+                'first_minute': first.isoformat() if first is not None else None,
+                'last_minute': last.isoformat() if last is not None else None}
+
+    def pillars(self, query):
+        totals = self.rollups.totals()
+        return {metric: {'count': int(row['count']), **{k: _number(v) for k, v in row.drop('count').items()}}
+                for metric, row in totals.iterrows()}
+
+    def best_worst(self, query):
+        metric = query.get('metric', 'AEON_Index')
+        if metric not in self.rollups.metrics:
+            raise BadRequest(f"Unknown metric {metric!r}, expected one of {self.rollups.metrics}")
+        best, worst = self.rollups.best_worst_days(metric)
+        if best is None:
+            raise NotFound(f"No daily means of {metric} in the cache yet")
+        return {'metric': metric,
+                **{label: {'day': str(day.name.date()), **{m: _number(v) for m, v in day.items()}}
+                   for label, day in (('best', best), ('worst', worst))}}
+
+    def rollup(self, level, query):
+        frame = getattr(self.rollups, level)
+        start, end, since = self._bounds(query)
+        if level in RANGE_LEVELS:
+            key = frame[RANGE_LEVELS[level]]
+            if level == 'day':
+                # days are local calendar dates (naive)
+                start, end, since = (None if t is None else t.tz_convert(self.rollups.tz).tz_localize(None).normalize()
+                                     for t in (start, end, since))
+            mask = np.ones(len(frame), dtype=bool)
+            if start is not None:
+                mask &= (key >= start).to_numpy()
+            if end is not None:
+                mask &= (key <= end).to_numpy()
+            if since is not None:
+                mask &= (key > since).to_numpy()
+            frame = frame[mask]
+        elif start is not None or end is not None or since is not None:
+            raise BadRequest(f"{level} is a profile over the whole history and takes no range")
+        if query.get('raw') in (None, '0', 'false'):
+            stats = [f"{m}_{s}" for m in self.rollups.metrics for s in STATS]
+            frame = pd.concat([frame.drop(columns=stats), means(frame, self.rollups.metrics)], axis=1)
+        return frame.assign(day=frame['day'].dt.strftime('%Y-%m-%d')) if level == 'day' else frame
+
+    def minute(self, query):
+        start, end, since = self._bounds(query)
+        lo, hi = 0, len(self.minute_ns)
+        if start is not None:
+            lo = max(lo, int(np.searchsorted(self.minute_ns, start.value, side='left')))
+        if since is not None:
+            lo = max(lo, int(np.searchsorted(self.minute_ns, since.value, side='right')))
+        if end is not None:
+            hi = int(np.searchsorted(self.minute_ns, end.value, side='right'))
+        frame = self.rollups.minute.iloc[lo:max(lo, hi)]
+        if query.get('max_points'):
+            try:
+                max_points = int(query['max_points'])
+            except ValueError as exc:
+                raise BadRequest("max_points must be an integer") from exc
+            rows = downsample_indices(self.minute_ns[lo:max(lo, hi)], frame['AEON_Index'].to_numpy(dtype=np.float64),
+                                      max(max_points // 2 - 1, 1))
+            frame = frame.iloc[rows]
+        return frame
+
+
+def make_handler(cache):
+    """BaseHTTPRequestHandler subclass that answers from `cache` (a RollupCache)."""
+
+    class AeonHandler(BaseHTTPRequestHandler):
+        server_version = 'AEONAggregates/1.0'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            parts = [p for p in url.path.split('/') if p]
+            routes = {('health',): cache.health, ('pillars',): cache.pillars,
+                      ('best-worst',): cache.best_worst, ('minute',): cache.minute}
+            routes.update({('rollups', level): (lambda q, level=level: cache.rollup(level, q))
+                           for level in LEVELS if level != 'minute'})
+            route = routes.get(tuple(parts))
+            if route is None:
+                return self._send(404, {'error': f"Unknown endpoint {url.path}", 'endpoints': sorted(
+                    '/' + '/'.join(key) for key in routes)})
+
+            cache.refresh()
+            if cache.rollups is None:
+                return self._send(503, {'error': f"No rollup cache in {cache.cache_dir}/ yet"})
+            etag = '"{}-{}"'.format(cache.version, hashlib.sha1(self.path.encode()).hexdigest()[:12])
+            if etag in [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]:
+                return self._send(304, None, etag)
+            try:
+                payload = route(query)
+            except BadRequest as exc:
+                return self._send(400, {'error': str(exc)})
+            except NotFound as exc:
+                return self._send(404, {'error': str(exc)})
+            self._send(200, payload, etag)
+
+        def _send(self, status, payload, etag=None):
+            body = b''
+            if payload is not None:
+                text = _to_json(payload) if isinstance(payload, pd.DataFrame) else json.dumps(payload)
+                body = text.encode('utf-8')
+            self.send_response(status)
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+            if status != 304:
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if not getattr(self.server, 'quiet', False):
+                super().log_message(format, *args)
+
+    return AeonHandler
+
+
+def make_server(cache_dir=CACHE_DIR, host=DEFAULT_HOST, port=DEFAULT_PORT, quiet=False):
+    """ThreadingHTTPServer answering from the rollup cache of `cache_dir` (call serve_forever())."""
+    cache = RollupCache(cache_dir).refresh(force=True)
+    server = ThreadingHTTPServer((host, port), make_handler(cache))
+    server.quiet = quiet
+    return server
@@ -0,0 +1,39 @@
+"""
+Bio-Exclusive VAE configuration
+Feature list, artifact names and the persisted model config (architecture +
+calibrated scaling_factor). Kept free of TensorFlow so scoring/plotting can import it.
+"""
+
+import json
+
+BIO_FEATURES = [
+    'heart_rate',
+    'stress_level',
+    'body_battery',
+    'sleep_duration_of_day',
+    'stress_rolling_mean_30',
+    'stress_volatility_30',
+]
+
+MODEL_CONFIG_FILE = 'bio_vae_config.json'
+WEIGHTS_FILE = 'bio_vae_weights.h5'
+
+
+def save_model_config(path, bio_features, timesteps, latent_dim, hidden_dim, scaling_factor, **extra):
+    """Persist everything scoring needs besides the weights, including the calibrated scaling_factor."""
+    config = {
+        'bio_features': list(bio_features),
+        'timesteps': int(timesteps),
+        'latent_dim': int(latent_dim),
+        'hidden_dim': int(hidden_dim),
+        'scaling_factor': float(scaling_factor),
+        **extra,
+    }
+    with open(path, 'w', encoding='utf-8') as fp:
+        json.dump(config, fp, indent=2)
+    return config
+
+
+def load_model_config(path):
+    with open(path, 'r', encoding='utf-8') as fp:
+        return json.load(fp)
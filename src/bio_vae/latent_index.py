@@ -0,0 +1,132 @@
+"""
+BioVAE latent-space index
+Persist the deterministic encoder output (z_mean) of every window together with
+its window-end timestamp (plus the fingerprint of the model that encoded them),
+and answer "which historical windows looked most like
+this one?" with a KD-tree over the latent vectors.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bio_vae.scoring import gather_windows, pending_windows
+
+LATENTS_FILE = 'bio_vae_latents.npz'
+
+
+def load_latents(path=LATENTS_FILE):
+    """(z_mean array, window_end UTC DatetimeIndex); empty if nothing was persisted yet."""
+    if not Path(path).exists():
+        return np.empty((0, 0), dtype=np.float32), pd.DatetimeIndex([], tz='UTC')
+    with np.load(path) as data:
+        return data['z_mean'], pd.DatetimeIndex(pd.to_datetime(data['window_end'], utc=True))
+
+
+def latents_fingerprint(path=LATENTS_FILE):
+    """Fingerprint of the model that encoded the persisted latents; None if unknown (or nothing persisted)."""
+    if not Path(path).exists():
+        return None
+    with np.load(path) as data:
+        return str(data['fingerprint']) if 'fingerprint' in data.files else None
+
+
+def save_latents(path, z_mean, window_end, fingerprint):
+    tmp = Path(str(path) + '.tmp.npz')
+    np.savez(tmp, z_mean=np.asarray(z_mean, dtype=np.float32),
+             window_end=pd.DatetimeIndex(window_end).tz_convert('UTC').as_unit('ns').asi8,
+             fingerprint=np.array(fingerprint))
+    tmp.replace(path)
+
+
+def update_latents(model, features_path, path=LATENTS_FILE, chunk_windows=50_000, rebuild=False):
+    """Encode windows ending after the last persisted one and append them; returns the number added.
+
+    `model` is a NumpyBioVAE (deterministic z_mean, no TensorFlow needed).
+    Latents of another model (retrained weights or normalization) live in a
+    different space, so appending to them raises ValueError; with `rebuild`
+    every window is re-encoded instead.
+    """
+    z_old, ends_old = load_latents(path)
+    stale = bool(len(ends_old)) and latents_fingerprint(path) != model.fingerprint
+    if stale:
+        if not rebuild:
+            raise ValueError(f"{path} was encoded by a different model; rebuild it for this one")
+        z_old, ends_old = z_old[:0], ends_old[:0]
+    after = ends_old[-1] if len(ends_old) else None
+    timesteps = model.timesteps
+    data, starts, ends = pending_windows(features_path, model.config['bio_features'], timesteps, after=after)
+    if not len(starts):
+        if stale:
+            save_latents(path, z_old, ends_old, model.fingerprint)
+        return 0
+
+    z_new = np.concatenate([
+        model.encode(gather_windows(data, starts[i:i + chunk_windows], timesteps))
+        for i in range(0, len(starts), chunk_windows)
+    ])
+    z_all = np.concatenate([z_old, z_new]) if len(z_old) else z_new
+    save_latents(path, z_all, ends_old.append(ends) if len(ends_old) else ends, model.fingerprint)
+    return len(z_new)
+
+
+class LatentIndex:
+    """k-nearest-neighbour search over persisted window latents."""
+
+    def __init__(self, z_mean, window_end):
+        from scipy.spatial import cKDTree
+
+        self.z_mean = np.asarray(z_mean, dtype=np.float64)
+        self.window_end = pd.DatetimeIndex(window_end)
+        self.tree = cKDTree(self.z_mean)
+
+    @classmethod
+    def load(cls, path=LATENTS_FILE):
+        z_mean, window_end = load_latents(path)
+        if not len(window_end):
+            raise FileNotFoundError(f"No latents persisted at {path}; run update_latents first")
+        return cls(z_mean, window_end)
+
+    def __len__(self):
+        return len(self.window_end)
+
+    def query(self, z, k=5, exclude_around=None, exclude_minutes=0):
+        """The k windows whose latents are closest to `z`.
+
+        Windows ending within `exclude_minutes` of `exclude_around` are skipped, so
+        a window's own overlapping neighbours do not crowd out real matches.
+        """
+        z = np.asarray(z, dtype=np.float64).reshape(-1)
+        excluded = 0
+        if exclude_around is not None and exclude_minutes:
+            center = pd.Timestamp(exclude_around)
+            center = center.tz_localize('UTC') if center.tzinfo is None else center
+            window = pd.Timedelta(minutes=exclude_minutes)
+            lo = self.window_end.searchsorted(center - window, side='left')
+            hi = self.window_end.searchsorted(center + window, side='right')
+            excluded = hi - lo
+        else:
+            lo = hi = 0
+
+        wanted = min(len(self), k + excluded)
+        distances, positions = self.tree.query(z, k=wanted)
+        distances, positions = np.atleast_1d(distances), np.atleast_1d(positions)
+        keep = (positions < lo) | (positions >= hi)
+        distances, positions = distances[keep][:k], positions[keep][:k]
+        return pd.DataFrame({
+            'rank': np.arange(1, len(positions) + 1),
+            'window_end': self.window_end[positions],
+            'distance': distances,
+            'position': positions,
+        })
+
+    def query_time(self, window_end, k=5, exclude_minutes=60):
+        """Neighbours of the persisted window ending at (or just before) `window_end`."""
+        ts = pd.Timestamp(window_end)
+        ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts
+        position = self.window_end.searchsorted(ts, side='right') - 1
+        if position < 0:
+            raise KeyError(f"No window ends at or before {window_end}")
+        return self.query(self.z_mean[position], k=k, exclude_around=self.window_end[position],
+                          exclude_minutes=exclude_minutes)
@@ -0,0 +1,154 @@
+"""
+Bio-Exclusive VAE model
+Encoder/decoder builders and the BioVAE training model, shared by the training
+script (EXO-model/bio_exclusive_vae.py) and the scoring entry point.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers, Model
+
+from bio_vae.config import MODEL_CONFIG_FILE, WEIGHTS_FILE, load_model_config
+
+
+# Custom Sampling Layer (Reparameterization Trick)
+class Sampling(layers.Layer):
+    """Uses (z_mean, z_log_var) to sample z, the vector encoding a digit."""
+    
+    def call(self, inputs):
+        z_mean, z_log_var = inputs
+        batch = tf.shape(z_mean)[0]
+        dim = tf.shape(z_mean)[1]
+        epsilon = tf.keras.backend.random_normal(shape=(batch, dim))
+        return z_mean + tf.exp(0.5 * z_log_var) * epsilon
+
+
+# Encoder
+def build_encoder(timesteps, num_features, latent_dim, hidden_dim):
+    """Build the encoder network."""
+    encoder_inputs = keras.Input(shape=(timesteps, num_features), name='encoder_input')
+    
+    # Flatten the input
+    x = layers.Flatten()(encoder_inputs)
+    
+    # Hidden layer
+    x = layers.Dense(hidden_dim, activation='relu', name='encoder_hidden')(x)
+    
+    # Latent space parameters
+    z_mean = layers.Dense(latent_dim, name='z_mean')(x)
+    z_log_var = layers.Dense(latent_dim, name='z_log_var')(x)
+    
+    # Sample from latent space
+    z = Sampling()([z_mean, z_log_var])
+    
+    encoder = Model(encoder_inputs, [z_mean, z_log_var, z], name='encoder')
+    return encoder
+
+
+# Decoder
+def build_decoder(timesteps, num_features, latent_dim, hidden_dim):
+    """Build the decoder network."""
+    latent_inputs = keras.Input(shape=(latent_dim,), name='decoder_input')
+    
+    # Hidden layer
+    x = layers.Dense(hidden_dim, activation='relu', name='decoder_hidden')(latent_inputs)
+    
+    # Output layer
+    x = layers.Dense(timesteps * num_features, activation='linear', name='decoder_output')(x)
+    
+    # Reshape to original dimensions
+    decoder_outputs = layers.Reshape((timesteps, num_features))(x)
+    
+    decoder = Model(latent_inputs, decoder_outputs, name='decoder')
+    return decoder
+
+
+# Custom VAE Model
+class BioVAE(Model):
+    """Bio-Exclusive Variational Autoencoder."""
+    
+    def __init__(self, encoder, decoder, **kwargs):
+        super(BioVAE, self).__init__(**kwargs)
+        self.encoder = encoder
+        self.decoder = decoder
+        self.total_loss_tracker = keras.metrics.Mean(name="total_loss")
+        self.reconstruction_loss_tracker = keras.metrics.Mean(name="reconstruction_loss")
+        self.kl_loss_tracker = keras.metrics.Mean(name="kl_loss")
+    
+    @property
+    def metrics(self):
+        return [
+            self.total_loss_tracker,
+            self.reconstruction_loss_tracker,
+            self.kl_loss_tracker,
+        ]
+    
+    def train_step(self, data):
+        with tf.GradientTape() as tape:
+            # Forward pass
+            z_mean, z_log_var, z = self.encoder(data)
+            reconstruction = self.decoder(z)
+            
+            # Reconstruction loss (MSE)
+            reconstruction_loss = tf.reduce_mean(
+                tf.reduce_sum(
+                    keras.losses.mean_squared_error(data, reconstruction),
+                    axis=1
+                )
+            )
+            
+            # KL divergence loss
+            kl_loss = -0.5 * tf.reduce_mean(
+                tf.reduce_sum(
+                    1 + z_log_var - tf.square(z_mean) - tf.exp(z_log_var),
+                    axis=1
+                )
+            )
+            
+            # Total loss
+            total_loss = reconstruction_loss + kl_loss
+        
+        # Backpropagation
+        grads = tape.gradient(total_loss, self.trainable_weights)
+        self.optimizer.apply_gradients(zip(grads, self.trainable_weights))
+        
+        # Update metrics
+        self.total_loss_tracker.update_state(total_loss)
+        self.reconstruction_loss_tracker.update_state(reconstruction_loss)
+        self.kl_loss_tracker.update_state(kl_loss)
+        
+        return {
+            "total_loss": self.total_loss_tracker.result(),
+            "reconstruction_loss": self.reconstruction_loss_tracker.result(),
+            "kl_loss": self.kl_loss_tracker.result(),
+        }
+    
+    def call(self, inputs):
+        """Forward pass through the VAE."""
+        z_mean, z_log_var, z = self.encoder(inputs)
+        reconstruction = self.decoder(z)
+        return reconstruction
+
+
+def build_bio_vae(timesteps, num_features, latent_dim, hidden_dim):
+    """Encoder + decoder wrapped in a BioVAE, built so weights can be loaded into it."""
+    vae = BioVAE(
+        build_encoder(timesteps, num_features, latent_dim, hidden_dim),
+        build_decoder(timesteps, num_features, latent_dim, hidden_dim),
+    )
+    vae(np.zeros((1, timesteps, num_features), dtype=np.float32))
+    return vae
+
+
+def load_bio_vae(model_dir='.', config=None):
+    """Rebuild the BioVAE from its saved config and load the trained weights (no retraining)."""
+    model_dir = Path(model_dir)
+    config = config or load_model_config(model_dir / MODEL_CONFIG_FILE)
+    vae = build_bio_vae(
+        config['timesteps'], len(config['bio_features']), config['latent_dim'], config['hidden_dim']
+    )
+    vae.load_weights(str(model_dir / config.get('weights_file', WEIGHTS_FILE)))
+    return vae, config
@@ -0,0 +1,121 @@
+"""
+Pure-numpy BioVAE inference
+Export the trained Dense weights to .npz and run the deterministic forward pass
+(encoder z_mean -> decoder) in large vectorized batches, without TensorFlow.
+"""
+
+import hashlib
+import json
+import time
+
+import numpy as np
+
+NPZ_WEIGHTS_FILE = 'bio_vae_weights.npz'
+
+# Dense layers of the encoder/decoder built in bio_vae.model, in forward order.
+ENCODER_LAYERS = ['encoder_hidden', 'z_mean']
+DECODER_LAYERS = ['decoder_hidden', 'decoder_output']
+
+
+def export_npz(vae, config, path=NPZ_WEIGHTS_FILE):
+    """Write every Dense kernel/bias of the trained BioVAE plus its scoring config to one .npz."""
+    arrays = {}
+    for model, names in ((vae.encoder, ENCODER_LAYERS), (vae.decoder, DECODER_LAYERS)):
+        for name in names:
+            kernel, bias = model.get_layer(name).get_weights()
+            arrays[f'{name}/kernel'] = kernel.astype(np.float32)
+            arrays[f'{name}/bias'] = bias.astype(np.float32)
+    np.savez(path, config=np.array(json.dumps(config)), **arrays)
+    return str(path)
+
+
+def _relu(x):
+    return np.maximum(x, 0, out=x)
+
+
+class NumpyBioVAE:
+    """Deterministic BioVAE forward pass: reconstruction = decoder(z_mean(x))."""
+
+    def __init__(self, weights, config):
+        self.config = config
+        self.timesteps = int(config['timesteps'])
+        self.num_features = len(config['bio_features'])
+        self.w = {k: np.ascontiguousarray(v, dtype=np.float32) for k, v in weights.items()}
+
+    @classmethod
+    def load(cls, path=NPZ_WEIGHTS_FILE):
+        with np.load(path) as data:
+            config = json.loads(str(data['config']))
+            weights = {k: data[k] for k in data.files if k != 'config'}
+        return cls(weights, config)
+
+    @property
+    def fingerprint(self):
+        """sha1 of the weights and the windowing/normalization config: equal only for the same trained model."""
+        digest = hashlib.sha1()
+        for name in sorted(self.w):
+            digest.update(name.encode())
+            digest.update(self.w[name].tobytes())
+        scoring = {k: self.config.get(k) for k in ('timesteps', 'bio_features', 'normalization')}
+        digest.update(json.dumps(scoring, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _dense(self, x, name):
+        return x @ self.w[f'{name}/kernel'] + self.w[f'{name}/bias']
+
+    def encode(self, windows):
+        """z_mean for (batch, timesteps, features) windows."""
+        flat = np.asarray(windows, dtype=np.float32).reshape(len(windows), -1)
+        return self._dense(_relu(self._dense(flat, 'encoder_hidden')), 'z_mean')
+
+    def decode(self, z):
+        out = self._dense(_relu(self._dense(z, 'decoder_hidden')), 'decoder_output')
+        return out.reshape(len(z), self.timesteps, self.num_features)
+
+    def reconstruct(self, windows):
+        return self.decode(self.encode(windows))
+
+    def predict(self, windows, batch_size=65536, verbose=0):
+        """Keras-compatible predict() so scoring code can use either engine."""
+        return np.concatenate(
+            [self.reconstruct(windows[i:i + batch_size]) for i in range(0, len(windows), batch_size)]
+        ) if len(windows) else np.empty((0, self.timesteps, self.num_features), dtype=np.float32)
+
+    def reconstruction_errors(self, windows, batch_size=65536):
+        """Per-window MSE, computed batch by batch without keeping the reconstructions."""
+        errors = np.empty(len(windows), dtype=np.float32)
+        for i in range(0, len(windows), batch_size):
+            batch = np.asarray(windows[i:i + batch_size], dtype=np.float32)
+            diff = batch - self.reconstruct(batch)
+            errors[i:i + len(batch)] = np.einsum('btf,btf->b', diff, diff) / (self.timesteps * self.num_features)
+        return errors
+
+
+def keras_deterministic_errors(vae, windows, batch_size=4096):
+    """Reference errors from Keras using z_mean (no sampling), matching NumpyBioVAE."""
+    z_mean = vae.encoder.predict(windows, batch_size=batch_size, verbose=0)[0]
+    reconstructions = vae.decoder.predict(z_mean, batch_size=batch_size, verbose=0)
+    return np.mean(np.square(windows - reconstructions), axis=(1, 2))
+
+
+def benchmark(npz_path, windows, vae=None, batch_size=65536, repeats=3, rtol=1e-4, atol=1e-5):
+    """Cold start, throughput and (given the Keras model) agreement of the numpy path."""
+    started = time.perf_counter()
+    model = NumpyBioVAE.load(npz_path)
+    model.reconstruction_errors(windows[:1])
+    report = {'numpy_cold_start_s': time.perf_counter() - started, 'windows': int(len(windows))}
+
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        errors = model.reconstruction_errors(windows, batch_size=batch_size)
+        timings.append(time.perf_counter() - started)
+    report['numpy_windows_per_s'] = len(windows) / min(timings)
+
+    if vae is not None:
+        started = time.perf_counter()
+        reference = keras_deterministic_errors(vae, windows)
+        report['keras_windows_per_s'] = len(windows) / (time.perf_counter() - started)
+        report['max_abs_diff'] = float(np.max(np.abs(errors - reference))) if len(windows) else 0.0
+        report['matches_keras'] = bool(np.allclose(errors, reference, rtol=rtol, atol=atol))
+    return report
@@ -0,0 +1,111 @@
+"""
+Bio-Stability scoring
+Score windows with a trained BioVAE and upsert the scores into the score store
+keyed by window-end timestamp, so new minutes are scored without retraining.
+Errors and scores are also folded into streaming sketches (bio_score_sketches.json)
+that calibration and summary statistics read in constant memory.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bio_vae.numpy_inference import keras_deterministic_errors
+from features.loader import load_features
+from features.sketches import StreamSketch, load_sketches, save_sketches
+from sequences.windows import valid_window_starts
+from store.score_store import last_window_end, write_scores
+
+# Month-partitioned Parquet score store (see store/score_store.py), relative to EXO-model/.
+SCORES_FILE = 'bio_stability_scores'
+SCORE_COLUMNS = ['window_end', 'reconstruction_error', 'bio_stability_score']
+SKETCH_FILE = 'bio_score_sketches.json'
+
+
+def calibrate_scaling_factor(mean_error, target_avg_score):
+    """Scaling factor that makes an average error deduct 100 - target_avg_score points."""
+    return (100.0 - target_avg_score) / mean_error
+
+
+def errors_to_scores(errors, scaling_factor):
+    """Score = max(0, 100 - (Error * Scaling_Factor))"""
+    return np.maximum(0, 100 - (np.asarray(errors) * scaling_factor))
+
+
+def reconstruction_errors(vae, windows, batch_size=4096):
+    """Per-window MSE of the deterministic reconstruction decoder(z_mean(x)) (Keras model or NumpyBioVAE).
+
+    Calibration, batch scoring and the stream scorer all use this definition;
+    vae.predict() would decode a randomly sampled z instead.
+    """
+    if hasattr(vae, 'reconstruction_errors'):
+        return vae.reconstruction_errors(windows, batch_size=batch_size)
+    return keras_deterministic_errors(vae, windows, batch_size=batch_size)
+
+
+def last_scored_window_end(scores_path):
+    return last_window_end(scores_path)
+
+
+def pending_windows(features_path, bio_features, timesteps, after=None, break_on_day=True):
+    """Windows whose last minute is newer than `after`, as (data, starts, window_end UTC index).
+
+    Only the bio columns from `timesteps` minutes before `after` onward are read;
+    windows are gathered from `data` per scoring chunk with gather_windows().
+    """
+    since = None if after is None else after - pd.Timedelta(minutes=timesteps)
+    df = load_features(features_path, columns=bio_features, since=since)
+    data = df.to_numpy(dtype=np.float32)
+    if len(df) < timesteps:
+        return data, np.empty(0, dtype=np.int64), pd.DatetimeIndex([], tz='UTC')
+
+    starts = valid_window_starts(df.index, timesteps, horizons=(0,), break_on_day=break_on_day)
+    ends = df.index[starts + timesteps - 1]
+    # Naive datetimes (e.g. a Cassandra export's minute_ts) are UTC, as in load_features(since=)
+    ends = ends.tz_localize('UTC') if ends.tz is None else ends.tz_convert('UTC')
+    if after is not None:
+        keep = ends > after
+        starts, ends = starts[keep], ends[keep]
+    return data, starts, ends
+
+
+def gather_windows(data, starts, timesteps):
+    return data[starts[:, None] + np.arange(timesteps)]
+
+
+def append_scores(scores_path, window_end, errors, scores):
+    frame = pd.DataFrame({
+        'window_end': pd.DatetimeIndex(window_end).tz_convert('UTC'),
+        'reconstruction_error': np.asarray(errors, dtype=np.float64),
+        'bio_stability_score': np.asarray(scores, dtype=np.float64),
+    }, columns=SCORE_COLUMNS)
+    return write_scores(scores_path, frame)
+
+
+def update_sketches(sketches, errors, scores):
+    """Fold a batch of errors and scores into the named sketches (created when missing)."""
+    for name, values in (('reconstruction_error', errors), ('bio_stability_score', scores)):
+        sketches.setdefault(name, StreamSketch()).update(values)
+    return sketches
+
+
+def score_new_windows(vae, config, features_path, scores_path=SCORES_FILE, batch_size=4096, chunk_windows=50_000,
+                      sketch_path=None):
+    """Score every window ending after the last scored one and append the results.
+
+    Windows are scored `chunk_windows` at a time, so the store grows
+    incrementally and an interrupted run resumes where it stopped. With
+    `sketch_path`, each chunk is also folded into the persisted sketches.
+    """
+    after = last_scored_window_end(scores_path)
+    timesteps = config['timesteps']
+    data, starts, ends = pending_windows(features_path, config['bio_features'], timesteps, after=after)
+    sketches = load_sketches(sketch_path) if sketch_path else None
+    written = 0
+    for begin in range(0, len(starts), chunk_windows):
+        batch = gather_windows(data, starts[begin:begin + chunk_windows], timesteps)
+        errors = reconstruction_errors(vae, batch, batch_size=batch_size)
+        scores = errors_to_scores(errors, config['scaling_factor'])
+        written += append_scores(scores_path, ends[begin:begin + chunk_windows], errors, scores)
+        if sketches is not None:
+            save_sketches(sketch_path, update_sketches(sketches, errors, scores))
+    return written
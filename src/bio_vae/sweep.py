@@ -0,0 +1,168 @@
+"""
+Bio-Exclusive VAE hyperparameter sweeps
+Train one BioVAE per grid point in a process pool, cache each result under a key
+of (config, data fingerprint) and rank the configurations by held-out
+reconstruction error.
+"""
+
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from sequences.windows import FEATURES_FILE, WINDOW_INDEX_FILE
+
+SWEEP_PARAMS = ['latent_dim', 'hidden_dim', 'learning_rate', 'epochs', 'batch_size']
+DEFAULT_CACHE_DIR = 'bio_vae_sweep_cache'
+THREAD_ENV_VARS = [
+    'OMP_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'TF_NUM_INTRAOP_THREADS',
+    'TF_NUM_INTEROP_THREADS',
+]
+
+
+def expand_grid(grid):
+    """Cartesian product of {param: [values]} as a list of config dicts."""
+    names = [name for name in SWEEP_PARAMS if name in grid]
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def data_fingerprint(data_dir='.', features_path=None):
+    """Identify the training data by size/mtime of the files the run reads (cheap, no hashing of contents)."""
+    data_dir = Path(data_dir)
+    if (data_dir / WINDOW_INDEX_FILE).exists():
+        files = [data_dir / WINDOW_INDEX_FILE, data_dir / FEATURES_FILE]
+    else:
+        files = [data_dir / 'X_train.npy', data_dir / 'X_test.npy']
+        if features_path:
+            files.append(Path(features_path))
+    parts = []
+    for path in files:
+        stat = path.stat()
+        parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def config_key(config, fingerprint):
+    payload = json.dumps({'config': config, 'data': fingerprint}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _limit_threads(threads):
+    # Runs in each worker before TensorFlow is imported, so the limits take effect.
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '2')
+
+
+def run_config(config, data_dir, features_path, threads, input_pipeline=None):
+    """Train and evaluate one configuration (executed inside a worker process)."""
+    import numpy as np
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(threads)
+
+    from bio_vae.numpy_inference import keras_deterministic_errors
+    from bio_vae.training import load_bio_data, train_vae
+
+    started = time.perf_counter()
+    data = load_bio_data(features_path, data_dir=data_dir, verbose=False)
+    _, timesteps, num_features = data['X_test_bio'].shape
+    vae, history, _ = train_vae(
+        data, timesteps, num_features,
+        config['latent_dim'], config['hidden_dim'], config['learning_rate'],
+        config['epochs'], config['batch_size'],
+        input_pipeline=input_pipeline, verbose=0,
+    )
+    test_errors = keras_deterministic_errors(vae, np.asarray(data['X_test_bio'], dtype=np.float32))
+    return {
+        **config,
+        'reconstruction_loss': history['reconstruction_loss'][-1],
+        'kl_loss': history['kl_loss'][-1],
+        'total_loss': history['total_loss'][-1],
+        'test_reconstruction_error': float(test_errors.mean()),
+        'epochs_run': len(history['total_loss']),
+        'train_seconds': time.perf_counter() - started,
+    }
+
+
+def _read_cached(path):
+    if not path.exists():
+        return None
+    with path.open('r', encoding='utf-8') as fp:
+        return json.load(fp)
+
+
+def _write_cached(path, result):
+    tmp = path.with_name(path.name + '.tmp')
+    with tmp.open('w', encoding='utf-8') as fp:
+        json.dump(result, fp, indent=2)
+    os.replace(tmp, path)
+
+
+def run_sweep(
+    grid,
+    data_dir='.',
+    features_path=None,
+    workers=None,
+    threads_per_worker=1,
+    cache_dir=DEFAULT_CACHE_DIR,
+    use_cache=True,
+    input_pipeline=None,
+):
+    """Run every grid point not already cached and return all results ranked best-first.
+
+    Workers are spawned (TensorFlow is not fork-safe) with BLAS/TF thread pools
+    capped at `threads_per_worker`; by default workers * threads fills the CPUs.
+    """
+    configs = expand_grid(grid)
+    fingerprint = data_fingerprint(data_dir, features_path)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    results, pending = [], []
+    for config in configs:
+        path = cache_dir / f"{config_key(config, fingerprint)}.json"
+        cached = _read_cached(path) if use_cache else None
+        if cached is not None:
+            results.append({**cached, 'cached': True})
+        else:
+            pending.append((config, path))
+
+    print(f"Sweep: {len(configs)} configs, {len(configs) - len(pending)} cached, {len(pending)} to train")
+    if pending:
+        workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+        workers = min(workers, len(pending))
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=_limit_threads, initargs=(threads_per_worker,)) as pool:
+            futures = {
+                pool.submit(run_config, config, str(data_dir), features_path, threads_per_worker, input_pipeline): path
+                for config, path in pending
+            }
+            for future in as_completed(futures):
+                result = {**future.result(), 'data_fingerprint': fingerprint}
+                _write_cached(futures[future], result)
+                results.append({**result, 'cached': False})
+                print(f"  ✓ {json.dumps({k: result[k] for k in SWEEP_PARAMS})} "
+                      f"test error {result['test_reconstruction_error']:.6f} ({result['train_seconds']:.0f}s)")
+
+    return rank_results(results)
+
+
+def rank_results(results):
+    table = pd.DataFrame(results)
+    if table.empty:
+        return table
+    table = table.sort_values(['test_reconstruction_error', 'kl_loss']).reset_index(drop=True)
+    table.insert(0, 'rank', range(1, len(table) + 1))
+    return table
@@ -0,0 +1,177 @@
+"""
+Bio-Exclusive VAE training
+Load the bio windows (mmap window index or legacy X_*.npy) and fit a BioVAE.
+Shared by EXO-model/bio_exclusive_vae.py and the hyperparameter sweep; TensorFlow
+is imported only when training starts.
+"""
+
+import builtins
+import os
+from pathlib import Path
+
+import numpy as np
+
+from bio_vae.config import BIO_FEATURES
+from features.loader import feature_column_names
+from sequences.windows import WINDOW_INDEX_FILE, WindowDataset
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def load_bio_data(features_path, bio_features=BIO_FEATURES, data_dir='.', verbose=True):
+    """Training/test bio windows: mmap-backed WindowDatasets when available, legacy X_*.npy otherwise.
+
+    Returns a dict with train_windows (None on the legacy path), X_train_bio (legacy only),
+    X_test_bio, test_window_ends (UTC window-end timestamps, None when the windows
+    carry no timestamps) and num_train_samples.
+    """
+    print = builtins.print if verbose else _quiet
+    bio_features = list(bio_features)
+    data_dir = Path(data_dir)
+    if (data_dir / WINDOW_INDEX_FILE).exists():
+        # Memory-mapped base matrix + window index from create_lstm_sequences.py:
+        # windows are assembled per mini-batch and only the bio columns are read.
+        train_windows = WindowDataset(data_dir, 'train', columns=bio_features)
+        test_windows = WindowDataset(data_dir, 'test', columns=bio_features)
+        print(f"Total features in dataset: {len(train_windows.feature_columns)}")
+        print(f"\nBiological features selected: {bio_features}")
+        print(f"Feature indices: {train_windows.column_indices.tolist()}")
+
+        X_test_bio = test_windows.get_windows()
+        print(f"\nBio window shapes (from mmap):")
+        print(f"  train: {train_windows.shape}")
+        print(f"  X_test_bio: {X_test_bio.shape}")
+        return {
+            'train_windows': train_windows,
+            'X_train_bio': None,
+            'X_test_bio': X_test_bio,
+            'test_window_ends': test_windows.window_end_times() if test_windows.timestamps is not None else None,
+            'num_train_samples': len(train_windows),
+        }
+
+    # The legacy X_*.npy windows hold the feature columns only (calendar columns were dropped)
+    column_names = feature_column_names(features_path)
+    print(f"Total features in dataset: {len(column_names)}")
+
+    # Find indices of biological features
+    bio_indices = [column_names.index(feat) for feat in bio_features]
+    print(f"\nBiological features selected: {bio_features}")
+    print(f"Feature indices: {bio_indices}")
+
+    # Load training and test data (legacy fully windowed arrays)
+    X_train = np.load(data_dir / 'X_train.npy')
+    X_test = np.load(data_dir / 'X_test.npy')
+
+    print(f"\nOriginal shapes:")
+    print(f"  X_train: {X_train.shape}")
+    print(f"  X_test: {X_test.shape}")
+
+    # Slice to keep only biological features
+    X_train_bio = X_train[:, :, bio_indices]
+    X_test_bio = X_test[:, :, bio_indices]
+
+    print(f"\nBio-sliced shapes:")
+    print(f"  X_train_bio: {X_train_bio.shape}")
+    print(f"  X_test_bio: {X_test_bio.shape}")
+    return {
+        'train_windows': None,
+        'X_train_bio': X_train_bio,
+        'X_test_bio': X_test_bio,
+        'test_window_ends': None,
+        'num_train_samples': X_train_bio.shape[0],
+    }
+
+
+def train_vae(
+    data,
+    timesteps,
+    num_features,
+    latent_dim,
+    hidden_dim,
+    learning_rate,
+    epochs,
+    batch_size,
+    input_pipeline=None,
+    shuffle_buffer=10000,
+    patience=5,
+    seed=42,
+    verbose=1,
+):
+    """Build and fit a BioVAE; returns (vae, history dict, input pipeline summary)."""
+    import tensorflow as tf
+    from tensorflow import keras
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    from bio_vae.model import BioVAE, build_decoder, build_encoder
+    from sequences.tf_data import EpochResourceLogger, window_tf_dataset
+
+    print = builtins.print if verbose else _quiet
+
+    # Set random seeds for reproducibility
+    np.random.seed(seed)
+    tf.random.set_seed(seed)
+
+    print("\nBuilding encoder...")
+    encoder = build_encoder(timesteps, num_features, latent_dim, hidden_dim)
+    if verbose:
+        encoder.summary()
+
+    print("\nBuilding decoder...")
+    decoder = build_decoder(timesteps, num_features, latent_dim, hidden_dim)
+    if verbose:
+        decoder.summary()
+
+    print("\nBuilding Bio-Exclusive VAE...")
+    vae = BioVAE(encoder, decoder)
+
+    # Compile the model
+    vae.compile(optimizer=keras.optimizers.Adam(learning_rate=learning_rate))
+
+    # Early stopping callback
+    early_stopping = EarlyStopping(
+        monitor='total_loss',
+        patience=patience,
+        restore_best_weights=True,
+        verbose=verbose
+    )
+
+    # Input pipeline: 'tfdata' (mmap -> shuffle positions -> batch -> parallel gather -> prefetch),
+    # 'generator' (single-threaded mmap batches) or 'memory' (whole training set as one array).
+    train_windows = data['train_windows']
+    if input_pipeline is None:
+        input_pipeline = os.getenv("BDA_INPUT_PIPELINE", "tfdata" if train_windows is not None else "memory")
+    if train_windows is None and input_pipeline != "memory":
+        print(f"⚠ No window index found; '{input_pipeline}' input pipeline needs one, using 'memory'")
+        input_pipeline = "memory"
+    print(f"Input pipeline: {input_pipeline}")
+
+    resource_logger = EpochResourceLogger()
+    fit_kwargs = dict(epochs=epochs, callbacks=[early_stopping, resource_logger], verbose=verbose)
+
+    if input_pipeline == "tfdata":
+        history = vae.fit(
+            window_tf_dataset(train_windows, batch_size, shuffle_buffer=shuffle_buffer, seed=seed, repeat=True),
+            steps_per_epoch=train_windows.steps_per_epoch(batch_size),
+            **fit_kwargs
+        )
+    elif input_pipeline == "generator":
+        # Endless shuffled generator; Keras pulls steps_per_epoch batches per epoch
+        history = vae.fit(
+            train_windows.iter_batches(batch_size, shuffle=True, seed=seed, repeat=True),
+            steps_per_epoch=train_windows.steps_per_epoch(batch_size),
+            **fit_kwargs
+        )
+    else:
+        X_train_bio = data['X_train_bio'] if train_windows is None else train_windows.get_windows()
+        history = vae.fit(X_train_bio, batch_size=batch_size, **fit_kwargs)
+
+    pipeline_summary = {
+        **resource_logger.summary(),
+        "mode": input_pipeline,
+        "batch_size": batch_size,
+        "train_samples": data['num_train_samples'],
+    }
+    history = {key: [float(v) for v in values] for key, values in history.history.items()}
+    return vae, history, pipeline_summary
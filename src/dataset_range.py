@@ -0,0 +1,119 @@
+"""
+Dataset Date-Range Probe
+Find the first/last timestamp of a minute CSV without loading the whole file.
+
+Strategies, cheapest first:
+1. A `<file>.range.json` sidecar written by the producer (valid while the CSV's size/mtime match)
+2. The first and last data lines of a time-sorted file
+3. A chunked scan of only the timestamp column (result is saved as a sidecar)
+"""
+
+import csv
+import io
+import json
+import os
+
+import pandas as pd
+
+SIDECAR_SUFFIX = '.range.json'
+TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def sidecar_path(csv_path):
+    return csv_path + SIDECAR_SUFFIX
+
+
+def _file_signature(csv_path):
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def write_range_sidecar(csv_path, start, end, rows=None):
+    """Record the [start, end] timestamp range of a CSV the caller just wrote."""
+    payload = {
+        'start': str(pd.Timestamp(start)),
+        'end': str(pd.Timestamp(end)),
+        'rows': rows,
+        **_file_signature(csv_path),
+    }
+    with open(sidecar_path(csv_path), 'w', encoding='utf-8') as fp:
+        json.dump(payload, fp, indent=2)
+
+
+def read_range_sidecar(csv_path):
+    path = sidecar_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as fp:
+        payload = json.load(fp)
+    signature = _file_signature(csv_path)
+    if payload.get('size') != signature['size'] or payload.get('mtime_ns') != signature['mtime_ns']:
+        return None
+    return pd.Timestamp(payload['start']), pd.Timestamp(payload['end'])
+
+
+def _parse_line(line):
+    return next(csv.reader(io.StringIO(line)))
+
+
+def probe_first_last(csv_path, column='datetime'):
+    """Read the header, the first data line and the last line; assumes rows are sorted by `column`."""
+    with open(csv_path, 'rb') as fp:
+        header = _parse_line(fp.readline().decode('utf-8-sig'))
+        first_line = fp.readline().decode('utf-8')
+        if column not in header or not first_line.strip():
+            return None
+
+        size = os.fstat(fp.fileno()).st_size
+        fp.seek(max(0, size - TAIL_BLOCK_BYTES))
+        tail_lines = [ln for ln in fp.read().decode('utf-8', errors='ignore').splitlines() if ln.strip()]
+        if not tail_lines:
+            return None
+
+    idx = header.index(column)
+    first_row = _parse_line(first_line)
+    last_row = _parse_line(tail_lines[-1])
+    if len(first_row) != len(header) or len(last_row) != len(header):
+        return None
+    start = pd.Timestamp(first_row[idx])
+    end = pd.Timestamp(last_row[idx])
+    if start > end:
+        return None
+    return start, end
+
+
+def scan_column_range(csv_path, column='datetime', chunksize=500_000):
+    """Fallback for unsorted files: stream only the timestamp column."""
+    start = end = None
+    for chunk in pd.read_csv(csv_path, usecols=[column], chunksize=chunksize):
+        sample = pd.Timestamp(chunk[column].iloc[0])
+        if sample.tzinfo is not None:
+            # Offsets change across DST; compare in UTC and report in the file's own offset.
+            values = pd.to_datetime(chunk[column], utc=True).dt.tz_convert(sample.tzinfo)
+        else:
+            values = pd.to_datetime(chunk[column])
+        lo, hi = values.min(), values.max()
+        start = lo if start is None or lo < start else start
+        end = hi if end is None or hi > end else end
+    return start, end
+
+
+def probe_date_range(csv_path, column='datetime', assume_sorted=True):
+    """Return (start, end) of `column` in `csv_path`, using the cheapest strategy that applies."""
+    cached = read_range_sidecar(csv_path)
+    if cached is not None:
+        return cached
+
+    if assume_sorted:
+        probed = probe_first_last(csv_path, column)
+        if probed is not None:
+            return probed
+
+    start, end = scan_column_range(csv_path, column)
+    write_range_sidecar(csv_path, start, end)
+    return start, end
+
+
+def wall_clock(ts):
+    """Drop the timezone but keep local wall time so naive and tz-aware sources compare."""
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
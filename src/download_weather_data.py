@@ -1,137 +1,345 @@
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
 import pandas as pd
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from dataset_range import probe_date_range, wall_clock
 from streaming.config import load_config
 from streaming.kafka_event_writer import KafkaEventWriter
 
 # File paths
 ROUTERSENSE_FILE = 'data/processed/netsecfulldata/routersense_minute_processed.csv'
 GARMIN_FILE = 'data/processed/garminfulldata/health data- without  network data - garmin_minute_health_activity.csv.csv'
+# parse_garmin_complete.OUTPUT_FILE: preferred when present, its range sidecar makes the probe free
+PARSED_GARMIN_FILE = 'output/garmin_parsed/garmin_minute_health_activity.csv'
 OUTPUT_FILE = 'output/weather_data_hourly.csv'
+MINUTE_OUTPUT_FILE = 'output/weather_data_minute.csv'
+CACHE_DIR = 'output/weather_cache'
 
-# Location (you may need to adjust these coordinates)
+# Default location when config weather.locations is not set (you may need to adjust these coordinates)
 # Default: New York City area
 LATITUDE = 40.7128
 LONGITUDE = -74.0060
+TIMEZONE = 'America/New_York'
+
+ARCHIVE_API_URL = "https://archive-api.open-meteo.com/v1/archive"
+# Days the archive lags behind real time; chunks ending earlier than this are treated as final.
+ARCHIVE_LAG_DAYS = 5
+
+# Open-Meteo hourly variable -> output column
+HOURLY_COLUMNS = {
+    'temperature_2m': 'temperature_celsius',
+    'relative_humidity_2m': 'humidity_percent',
+    'precipitation': 'precipitation_mm',
+    'rain': 'rain_mm',
+    'snowfall': 'snowfall_cm',
+    'cloud_cover': 'cloud_cover_percent',
+    'wind_speed_10m': 'wind_speed_kmh',
+    'wind_direction_10m': 'wind_direction_degrees',
+    'surface_pressure': 'surface_pressure_hpa'
+}
+HOURLY_VARIABLES = list(HOURLY_COLUMNS)
+
+# Minute-grid treatment: readings are interpolated, preceding-hour totals are spread back over their hour.
+INTERPOLATED_COLUMNS = [
+    'temperature_celsius', 'humidity_percent', 'cloud_cover_percent',
+    'wind_speed_kmh', 'surface_pressure_hpa'
+]
+HOURLY_TOTAL_COLUMNS = ['precipitation_mm', 'rain_mm', 'snowfall_cm']
+MAX_LOCATION_WORKERS = 4
 
 def get_date_range():
     """Get the earliest start and latest end from both datasets"""
     print("📅 Determining date range from datasets...")
     
-    # Read RouterSense data
-    print(f"  Reading {ROUTERSENSE_FILE}...")
-    rs_df = pd.read_csv(ROUTERSENSE_FILE)
-    rs_df['datetime'] = pd.to_datetime(rs_df['datetime'])
-    rs_start = rs_df['datetime'].min()
-    rs_end = rs_df['datetime'].max()
+    # Probe RouterSense data (sidecar, first/last line, or datetime column only)
+    print(f"  Probing {ROUTERSENSE_FILE}...")
+    rs_start, rs_end = probe_date_range(ROUTERSENSE_FILE)
     print(f"    RouterSense: {rs_start} to {rs_end}")
     
-    # Read Garmin data
-    print(f"  Reading {GARMIN_FILE}...")
-    garmin_df = pd.read_csv(GARMIN_FILE)
-    garmin_df['datetime'] = pd.to_datetime(garmin_df['datetime'])
-    garmin_start = garmin_df['datetime'].min()
-    garmin_end = garmin_df['datetime'].max()
+    # Probe Garmin data (the parse_garmin_complete output when it exists)
+    garmin_file = PARSED_GARMIN_FILE if os.path.exists(PARSED_GARMIN_FILE) else GARMIN_FILE
+    print(f"  Probing {garmin_file}...")
+    garmin_start, garmin_end = probe_date_range(garmin_file)
     print(f"    Garmin: {garmin_start} to {garmin_end}")
     
     # Get earliest and latest
-    start_date = min(rs_start, garmin_start)
-    end_date = max(rs_end, garmin_end)
+    start_date = min(wall_clock(rs_start), wall_clock(garmin_start))
+    end_date = max(wall_clock(rs_end), wall_clock(garmin_end))
     
     print(f"\n  Combined range: {start_date} to {end_date}")
     
     return start_date, end_date
 
-def download_weather_data(start_date, end_date):
+def weather_api_url():
+    """Archive endpoint; BDA_WEATHER_API_URL or config weather.archiveUrl can point at a local stub."""
+    config = load_config()
+    return os.getenv("BDA_WEATHER_API_URL") or config.get("weather", {}).get("archiveUrl", ARCHIVE_API_URL)
+
+
+def build_session():
+    """Pooled HTTP session that retries throttled and transient server errors."""
+    retry = Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def month_chunks(start_date, end_date):
+    """Yield (month_key, chunk_start, chunk_end) covering [start_date, end_date] one calendar month at a time."""
+    today = pd.Timestamp.today().normalize()
+    # Months after today have no data yet and would give chunk_end < chunk_start.
+    last = min(pd.Timestamp(end_date), today)
+    for month_start in pd.date_range(pd.Timestamp(start_date).to_period('M').to_timestamp(), last, freq='MS'):
+        month_end = month_start + pd.offsets.MonthEnd(0)
+        yield month_start.strftime('%Y-%m'), month_start, min(month_end, today)
+
+
+def load_locations():
+    """Weather locations from config weather.locations, defaulting to the single LATITUDE/LONGITUDE point."""
+    config = load_config()
+    configured = config.get("weather", {}).get("locations") or [{}]
+    locations = []
+    for i, loc in enumerate(configured):
+        locations.append({
+            'id': loc.get('id', 'default' if i == 0 else f'location_{i}'),
+            'deviceId': loc.get('deviceId', 'default_device'),
+            'latitude': float(loc.get('latitude', LATITUDE)),
+            'longitude': float(loc.get('longitude', LONGITUDE)),
+            'timezone': loc.get('timezone', TIMEZONE),
+        })
+    return locations
+
+
+def chunk_cache_path(location, month_key):
+    request_hash = hashlib.sha1(
+        ",".join(HOURLY_VARIABLES + [location['timezone']]).encode("utf-8")
+    ).hexdigest()[:8]
+    return os.path.join(
+        CACHE_DIR, f"{location['latitude']:.4f}_{location['longitude']:.4f}_{request_hash}_{month_key}.json"
+    )
+
+
+def is_final_chunk(chunk_end):
+    # The archive API lags real time by a few days; newer hours may still be revised.
+    return chunk_end.normalize() + pd.Timedelta(days=ARCHIVE_LAG_DAYS) < pd.Timestamp.today().normalize()
+
+
+def fetch_chunk(session, api_url, location, chunk_start, chunk_end):
+    params = {
+        'latitude': location['latitude'],
+        'longitude': location['longitude'],
+        'start_date': chunk_start.strftime('%Y-%m-%d'),
+        'end_date': chunk_end.strftime('%Y-%m-%d'),
+        'hourly': HOURLY_VARIABLES,
+        'timezone': location['timezone']
+    }
+    try:
+        response = session.get(api_url, params=params, timeout=60)
+    except requests.RequestException as exc:
+        # Retries exhausted, offline, timeouts: let the caller fall back to its cached copy.
+        print(f"\n❌ Error downloading data: {exc}")
+        return None
+    if response.status_code != 200:
+        print(f"\n❌ Error downloading data: {response.status_code}")
+        print(f"  Response: {response.text}")
+        return None
+    return response.json()['hourly']
+
+
+def load_hourly_chunks(start_date, end_date, location, offline=False):
+    """Return the raw hourly payloads for every month in range, fetching only missing or non-final chunks."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    api_url = weather_api_url()
+    session = build_session()
+    label = location['id']
+    chunks = []
+    try:
+        for month_key, chunk_start, chunk_end in month_chunks(start_date, end_date):
+            path = chunk_cache_path(location, month_key)
+            cached = None
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as fp:
+                    cached = json.load(fp)
+
+            if cached is not None and (cached['final'] or offline):
+                print(f"  [{label}] {month_key}: cached")
+                chunks.append(cached['hourly'])
+                continue
+            if offline:
+                print(f"  [{label}] {month_key}: not cached, skipped (offline)")
+                continue
+
+            print(f"  [{label}] {month_key}: requesting {chunk_start.date()} to {chunk_end.date()}...")
+            hourly = fetch_chunk(session, api_url, location, chunk_start, chunk_end)
+            if hourly is None:
+                if cached is not None:
+                    print(f"  [{label}] {month_key}: falling back to cached copy")
+                    chunks.append(cached['hourly'])
+                continue
+
+            payload = {
+                'fetched_at': datetime.utcnow().isoformat() + "Z",
+                'final': is_final_chunk(chunk_end),
+                'hourly': hourly,
+            }
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as fp:
+                json.dump(payload, fp)
+            os.replace(tmp_path, path)
+            chunks.append(hourly)
+    finally:
+        session.close()
+    return chunks
+
+
+def hourly_chunks_to_frame(chunks):
+    frames = []
+    for hourly in chunks:
+        frame = pd.DataFrame({'datetime': pd.to_datetime(hourly['time'])})
+        for variable, column in HOURLY_COLUMNS.items():
+            frame[column] = hourly[variable]
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=['datetime'] + list(HOURLY_COLUMNS.values()))
+    return pd.concat(frames, ignore_index=True)
+
+
+def load_location_hourly(start_date, end_date, location, offline=False):
+    df = hourly_chunks_to_frame(load_hourly_chunks(start_date, end_date, location, offline=offline))
+    df.insert(0, 'location_id', location['id'])
+    df.insert(1, 'device_id', location['deviceId'])
+    return df
+
+
+def hourly_to_minute_grid(hourly):
+    """Spread hourly weather onto a 1-minute grid per location in one vectorized pass.
+
+    Continuous readings are time-interpolated between hours, wind direction is
+    interpolated on the unit circle, and Open-Meteo's preceding-hour totals
+    (precipitation, rain, snowfall) are back-filled over the minutes they cover.
+    The result is indexed by (location_id, datetime), so callers align minute
+    rows with a plain reindex instead of an as-of search.
+    """
+    frames = []
+    for location_id, loc in hourly.groupby('location_id', sort=False):
+        loc = loc.drop_duplicates(subset='datetime').set_index('datetime').sort_index()
+        grid = pd.date_range(loc.index.min(), loc.index.max(), freq='min', name='datetime')
+        minute = loc.reindex(grid)
+
+        minute[INTERPOLATED_COLUMNS] = minute[INTERPOLATED_COLUMNS].interpolate(method='time', limit_area='inside')
+        minute[HOURLY_TOTAL_COLUMNS] = minute[HOURLY_TOTAL_COLUMNS].bfill(limit=59)
+
+        radians = np.deg2rad(loc['wind_direction_degrees'].astype(float))
+        components = pd.DataFrame({'sin': np.sin(radians), 'cos': np.cos(radians)}).reindex(grid)
+        components = components.interpolate(method='time', limit_area='inside')
+        minute['wind_direction_degrees'] = np.rad2deg(np.arctan2(components['sin'], components['cos'])) % 360
+
+        minute['location_id'] = location_id
+        minute['device_id'] = minute['device_id'].ffill()
+        frames.append(minute.reset_index())
+
+    if not frames:
+        return pd.DataFrame(columns=['location_id', 'datetime', 'device_id'] + list(HOURLY_COLUMNS.values()))
+    grid = pd.concat(frames, ignore_index=True)
+    return grid.set_index(['location_id', 'datetime'])[['device_id'] + list(HOURLY_COLUMNS.values())]
+
+
+def align_minute_weather(minute_grid, location_id, minute_times):
+    """Weather for each timestamp in `minute_times` (floored to the minute) at one location."""
+    times = pd.DatetimeIndex(pd.to_datetime(minute_times)).floor('min')
+    return minute_grid.xs(location_id, level='location_id').reindex(times)
+
+
+def merge_into_output(df, output_file, key=('location_id', 'datetime')):
+    """Upsert rows into output_file keyed by location and datetime, keeping rows outside this run untouched."""
+    key = list(key)
+    if os.path.exists(output_file):
+        existing = pd.read_csv(output_file, parse_dates=['datetime'])
+        if 'location_id' not in existing.columns:
+            # Tables written before multi-location support belong to the default location.
+            existing.insert(0, 'location_id', 'default')
+            existing.insert(1, 'device_id', 'default_device')
+        df = pd.concat([existing.reindex(columns=df.columns), df], ignore_index=True)
+    df = df.drop_duplicates(subset=key, keep='last').sort_values(key).reset_index(drop=True)
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    df.to_csv(output_file, index=False)
+    return df
+
+
+def download_weather_data(start_date, end_date, offline=False, locations=None, publish_minute_grid=False):
     """Download hourly weather data from Open-Meteo API"""
     print(f"\n🌤️  Downloading weather data from Open-Meteo...")
     
     # Format dates for API (YYYY-MM-DD)
     start_str = start_date.strftime('%Y-%m-%d')
     end_str = end_date.strftime('%Y-%m-%d')
+    locations = locations or load_locations()
     
-    # Open-Meteo API endpoint
-    url = "https://archive-api.open-meteo.com/v1/archive"
-    
-    params = {
-        'latitude': LATITUDE,
-        'longitude': LONGITUDE,
-        'start_date': start_str,
-        'end_date': end_str,
-        'hourly': [
-            'temperature_2m',
-            'relative_humidity_2m',
-            'precipitation',
-            'rain',
-            'snowfall',
-            'cloud_cover',
-            'wind_speed_10m',
-            'wind_direction_10m',
-            'surface_pressure'
-        ],
-        'timezone': 'America/New_York'
-    }
-    
-    print(f"  Location: ({LATITUDE}, {LONGITUDE})")
+    for location in locations:
+        print(f"  Location {location['id']}: ({location['latitude']}, {location['longitude']}) -> {location['deviceId']}")
     print(f"  Date range: {start_str} to {end_str}")
-    print(f"  Requesting data...")
+    print(f"  Cache: {CACHE_DIR}")
     
-    response = requests.get(url, params=params)
+    # Locations are independent, so fetch them concurrently (each worker has its own session).
+    with ThreadPoolExecutor(max_workers=min(MAX_LOCATION_WORKERS, len(locations))) as pool:
+        frames = list(pool.map(lambda loc: load_location_hourly(start_date, end_date, loc, offline=offline), locations))
+    df = pd.concat(frames, ignore_index=True)
+    df = df[(df['datetime'] >= pd.Timestamp(start_str)) & (df['datetime'] < pd.Timestamp(end_str) + pd.Timedelta(days=1))]
     
-    if response.status_code == 200:
-        data = response.json()
-        
-        # Extract hourly data
-        hourly = data['hourly']
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'datetime': pd.to_datetime(hourly['time']),
-            'temperature_celsius': hourly['temperature_2m'],
-            'humidity_percent': hourly['relative_humidity_2m'],
-            'precipitation_mm': hourly['precipitation'],
-            'rain_mm': hourly['rain'],
-            'snowfall_cm': hourly['snowfall'],
-            'cloud_cover_percent': hourly['cloud_cover'],
-            'wind_speed_kmh': hourly['wind_speed_10m'],
-            'wind_direction_degrees': hourly['wind_direction_10m'],
-            'surface_pressure_hpa': hourly['surface_pressure']
-        })
-        
-        # Add time components
-        df['date'] = df['datetime'].dt.date
-        df['time'] = df['datetime'].dt.time
-        df['hour'] = df['datetime'].dt.hour
-        df['day_of_week'] = df['datetime'].dt.day_name()
-        
-        # Reorder columns
-        df = df[[
-            'datetime', 'date', 'time', 'hour', 'day_of_week',
-            'temperature_celsius', 'humidity_percent', 'precipitation_mm',
-            'rain_mm', 'snowfall_cm', 'cloud_cover_percent',
-            'wind_speed_kmh', 'wind_direction_degrees', 'surface_pressure_hpa'
-        ]]
-        
-        # Save
-        df.to_csv(OUTPUT_FILE, index=False)
-        
-        print(f"\n✅ Weather data downloaded successfully!")
-        print(f"  Saved to: {OUTPUT_FILE}")
-        print(f"  Total hours: {len(df):,}")
-        print(f"  Date range: {df['date'].min()} to {df['date'].max()}")
-        
-        # Show sample
-        print(f"\n📊 Sample data:")
-        print(df.head(10).to_string(index=False))
-
-        publish_weather_events(df)
-        
-        return df
-    else:
-        print(f"\n❌ Error downloading data: {response.status_code}")
-        print(f"  Response: {response.text}")
+    if df.empty:
+        print(f"\n❌ No weather data available for {start_str} to {end_str}")
         return None
+    
+    # Add time components
+    df = df.copy()
+    df['date'] = df['datetime'].dt.date
+    df['time'] = df['datetime'].dt.time
+    df['hour'] = df['datetime'].dt.hour
+    df['day_of_week'] = df['datetime'].dt.day_name()
+    
+    # Reorder columns
+    df = df[[
+        'location_id', 'device_id',
+        'datetime', 'date', 'time', 'hour', 'day_of_week',
+        'temperature_celsius', 'humidity_percent', 'precipitation_mm',
+        'rain_mm', 'snowfall_cm', 'cloud_cover_percent',
+        'wind_speed_kmh', 'wind_direction_degrees', 'surface_pressure_hpa'
+    ]]
+    
+    # Save
+    merged = merge_into_output(df, OUTPUT_FILE)
+    minute_grid = hourly_to_minute_grid(df)
+    minute_merged = merge_into_output(minute_grid.reset_index(), MINUTE_OUTPUT_FILE)
+    
+    print(f"\n✅ Weather data downloaded successfully!")
+    print(f"  Saved to: {OUTPUT_FILE}")
+    print(f"  Hours in range: {len(df):,} (table now {len(merged):,})")
+    print(f"  Minute grid: {MINUTE_OUTPUT_FILE} ({len(minute_grid):,} rows in range, table now {len(minute_merged):,})")
+    print(f"  Date range: {df['date'].min()} to {df['date'].max()}")
+    
+    # Show sample
+    print(f"\n📊 Sample data:")
+    print(df.head(10).to_string(index=False))
+
+    publish_weather_events(minute_grid.reset_index() if publish_minute_grid else df)
+    
+    return df
 
 
 def publish_weather_events(df: pd.DataFrame):
@@ -151,6 +359,8 @@ def publish_weather_events(df: pd.DataFrame):
     for row in df.to_dict(orient="records"):
         event = {
             "source": "weather",
+            "location_id": row.get("location_id"),
+            "device_id": row.get("device_id"),
             "datetime": str(row.get("datetime")),
             "temperature_celsius": row.get("temperature_celsius"),
             "humidity_percent": row.get("humidity_percent"),
@@ -163,12 +373,17 @@ def publish_weather_events(df: pd.DataFrame):
             "surface_pressure_hpa": row.get("surface_pressure_hpa"),
             "captured_at": datetime.utcnow().isoformat() + "Z",
         }
-        writer.publish(weather_topic, event, key=str(row.get("datetime")))
+        writer.publish(weather_topic, event, key=f"{row.get('location_id')}|{row.get('datetime')}")
         published += 1
 
     writer.flush()
     print(f"📤 Published {published} weather events to Kafka topic '{weather_topic}'")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download hourly Open-Meteo weather for the dataset range")
+    parser.add_argument("--offline", action="store_true", help="Only use cached monthly chunks, never call the API")
+    parser.add_argument("--publish-minute-grid", action="store_true", help="Publish interpolated minute rows instead of hourly rows")
+    args = parser.parse_args()
+
     start_date, end_date = get_date_range()
-    download_weather_data(start_date, end_date)
+    download_weather_data(start_date, end_date, offline=args.offline, publish_minute_grid=args.publish_minute_grid)
@@ -0,0 +1,161 @@
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from features.normalization import NON_FEATURE_COLUMNS
+
+DATETIME_COLUMN = 'datetime'
+DEFAULT_TZ = 'US/Eastern'
+
+# Cassandra exports (store.export_cache) key rows by minute_ts and carry bookkeeping columns.
+EXPORT_DATETIME_COLUMN = 'minute_ts'
+# bio_stability_score is a model output written by the stream, never a model input.
+EXPORT_METADATA_COLUMNS = [
+    'device_id', 'day_bucket', 'minute_ts', 'row_count', 'file_path', 'stress_band', 'bio_stability_score',
+]
+
+# Declared schema of the fused minute feature table. Every feature column is read
+# straight into float32; calendar helper columns keep a compact declared type.
+FEATURE_DTYPES = {
+    'heart_rate': np.float32,
+    'stress_level': np.float32,
+    'body_battery': np.float32,
+    'respiration_rate': np.float32,
+    'steps_per_minute': np.float32,
+    'calories_per_minute': np.float32,
+    'sleep_duration_of_day': np.float32,
+    'stress_rolling_mean_30': np.float32,
+    'stress_volatility_30': np.float32,
+    'temperature_celsius': np.float32,
+    'humidity_percent': np.float32,
+    'precipitation_mm': np.float32,
+    'rain_mm': np.float32,
+    'snowfall_cm': np.float32,
+    'cloud_cover_percent': np.float32,
+    'wind_speed_kmh': np.float32,
+    'wind_direction_degrees': np.float32,
+    'surface_pressure_hpa': np.float32,
+    'screen_streak_minutes': np.float32,
+    'phone_active': np.float32,
+}
+CALENDAR_DTYPES = {
+    'date': 'string',
+    'time': 'string',
+    'day_of_week': 'category',
+    'hour': np.int8,
+    'minute': np.int8,
+    'day_numeric': np.int8,
+}
+
+
+def read_columns(path: str) -> List[str]:
+    """Column names of a CSV or Parquet feature file without reading any rows."""
+    if str(path).endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def datetime_column(columns: Iterable[str]) -> str:
+    columns = list(columns)
+    if DATETIME_COLUMN in columns:
+        return DATETIME_COLUMN
+    if EXPORT_DATETIME_COLUMN in columns:
+        return EXPORT_DATETIME_COLUMN
+    raise KeyError(f"No '{DATETIME_COLUMN}' or '{EXPORT_DATETIME_COLUMN}' column found")
+
+
+def _is_feature(col: str) -> bool:
+    return col not in NON_FEATURE_COLUMNS and col not in EXPORT_METADATA_COLUMNS
+
+
+def feature_column_names(path: str) -> List[str]:
+    """Model feature columns of a file, i.e. everything except the calendar/time/export key columns."""
+    return [c for c in read_columns(path) if _is_feature(c)]
+
+
+def parse_datetimes(values, tz: Optional[str] = DEFAULT_TZ) -> pd.Series:
+    """Parse the datetime column; mixed DST offsets are resolved through UTC, then shown in `tz`."""
+    try:
+        parsed = pd.to_datetime(values)
+    except ValueError:
+        parsed = pd.to_datetime(values, utc=True)
+    if not pd.api.types.is_datetime64_any_dtype(parsed):
+        parsed = pd.to_datetime(values, utc=True)
+    if tz and parsed.dt.tz is not None:
+        parsed = parsed.dt.tz_convert(tz)
+    return parsed
+
+
+def _dtypes_for(columns: Iterable[str], feature_dtype=None) -> dict:
+    # Undeclared feature columns (e.g. newly added ones) are read as float32 too.
+    dtypes = {}
+    for col in columns:
+        if col in CALENDAR_DTYPES:
+            dtypes[col] = CALENDAR_DTYPES[col]
+        else:
+            dtypes[col] = feature_dtype or FEATURE_DTYPES.get(col, np.float32)
+    return dtypes
+
+
+def load_features(
+    path: str,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = 200_000,
+    tz: Optional[str] = DEFAULT_TZ,
+    feature_dtype=None,
+    include_calendar: bool = False,
+    since=None,
+) -> pd.DataFrame:
+    """Load the minute feature table indexed by a parsed datetime.
+
+    Only `columns` (default: every feature column) are read, CSVs are read in
+    chunks with declared dtypes so numbers land directly in float32, and
+    `.parquet` files are read column-selectively via pyarrow. With `since`,
+    rows before that timestamp (naive means UTC) are dropped chunk by chunk.
+    """
+    available = read_columns(path)
+    time_col = datetime_column(available)
+    if columns is None:
+        wanted = [c for c in available if _is_feature(c)]
+        if include_calendar:
+            wanted = [c for c in available if c in CALENDAR_DTYPES] + wanted
+    else:
+        wanted = [c for c in columns if c not in (DATETIME_COLUMN, time_col)]
+        missing = [c for c in wanted if c not in available]
+        if missing:
+            raise KeyError(f"Columns not found in {path}: {missing}")
+    usecols = [time_col] + wanted
+    dtypes = _dtypes_for(wanted, feature_dtype)
+
+    if str(path).endswith('.parquet'):
+        chunks = [pd.read_parquet(path, columns=usecols).astype(dtypes)]
+    else:
+        chunks = pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunksize)
+
+    if since is not None:
+        since = pd.Timestamp(since)
+        since = since.tz_localize('UTC') if since.tzinfo is None else since
+
+    # Timestamps are parsed per chunk so the raw strings never exist for the whole file at once.
+    parts = []
+    for chunk in chunks:
+        chunk.index = pd.DatetimeIndex(parse_datetimes(chunk.pop(time_col), tz=tz), name=DATETIME_COLUMN)
+        if since is not None:
+            index = chunk.index if chunk.index.tz is not None else chunk.index.tz_localize('UTC')
+            chunk = chunk[index >= since]
+        parts.append(chunk[wanted])
+    if not parts:
+        return pd.DataFrame({c: pd.Series(dtype=dtypes[c]) for c in wanted}, index=pd.DatetimeIndex([], name=DATETIME_COLUMN))
+    return pd.concat(parts)
+
+
+def convert_to_parquet(csv_path: str, parquet_path: Optional[str] = None, tz: Optional[str] = DEFAULT_TZ) -> str:
+    """One-off conversion of a feature CSV to Parquet (float32 features, parsed datetime)."""
+    out = Path(parquet_path) if parquet_path else Path(csv_path).with_suffix('.parquet')
+    df = load_features(csv_path, tz=tz, include_calendar=True)
+    df.reset_index().to_parquet(out, index=False)
+    return str(out)
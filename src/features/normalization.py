@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Calendar/time columns that are never scaled.
+NON_FEATURE_COLUMNS = ['datetime', 'date', 'time', 'hour', 'minute', 'day_of_week', 'day_numeric']
+# normalize_csv() leaves the stats it applied next to its output, so consumers know what produced the file.
+STATS_SIDECAR_SUFFIX = '.normalization.json'
+
+
+class RunningStats:
+    """Per-feature count/mean/M2 (Welford), updatable chunk by chunk and mergeable across workers.
+
+    NaNs are skipped per feature, so each column keeps its own count.
+    """
+
+    def __init__(self, n_features: int):
+        self.count = np.zeros(n_features, dtype=np.float64)
+        self.mean = np.zeros(n_features, dtype=np.float64)
+        self.m2 = np.zeros(n_features, dtype=np.float64)
+
+    def update(self, values: np.ndarray) -> "RunningStats":
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+        mask = ~np.isnan(values)
+        count = mask.sum(axis=0).astype(np.float64)
+        safe_count = np.where(count > 0, count, 1.0)
+        mean = np.where(mask, values, 0.0).sum(axis=0) / safe_count
+        m2 = np.where(mask, (values - mean) ** 2, 0.0).sum(axis=0)
+        return self._combine(count, mean, m2)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        return self._combine(other.count, other.mean, other.m2)
+
+    def _combine(self, count: np.ndarray, mean: np.ndarray, m2: np.ndarray) -> "RunningStats":
+        # Chan et al. parallel update of two partial (count, mean, M2) summaries.
+        total = self.count + count
+        safe_total = np.where(total > 0, total, 1.0)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        return np.where(self.count > 1, self.m2 / np.maximum(self.count - 1, 1), 0.0)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, list]:
+        return {'count': self.count.tolist(), 'mean': self.mean.tolist(), 'm2': self.m2.tolist()}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, list]) -> "RunningStats":
+        stats = cls(len(payload['count']))
+        stats.count = np.asarray(payload['count'], dtype=np.float64)
+        stats.mean = np.asarray(payload['mean'], dtype=np.float64)
+        stats.m2 = np.asarray(payload['m2'], dtype=np.float64)
+        return stats
+
+
+class NormalizationStats:
+    """Z-score parameters for a fixed column list, fitted on the training range only."""
+
+    def __init__(self, columns: List[str], stats: Optional[RunningStats] = None, train_end: Optional[str] = None):
+        self.columns = list(columns)
+        self.stats = stats or RunningStats(len(self.columns))
+        self.train_end = train_end
+
+    def update(self, df: pd.DataFrame) -> "NormalizationStats":
+        self.stats.update(df[self.columns].to_numpy(dtype=np.float64))
+        return self
+
+    def merge(self, other: "NormalizationStats") -> "NormalizationStats":
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge normalization stats fitted on different columns")
+        self.stats.merge(other.stats)
+        return self
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = df.copy()
+        std = self.stats.std
+        # Constant (or unseen) features are centred but not scaled.
+        std = np.where(std > 0, std, 1.0)
+        out[self.columns] = (df[self.columns].to_numpy(dtype=np.float64) - self.stats.mean) / std
+        return out
+
+    def params(self, columns: List[str]) -> Dict[str, list]:
+        """Mean/std (constant features get std 1, as in apply) of `columns`, in that order."""
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise KeyError(f"Normalization stats do not cover {missing}")
+        index = [self.columns.index(c) for c in columns]
+        std = np.where(self.stats.std > 0, self.stats.std, 1.0)
+        return {'columns': list(columns), 'mean': self.stats.mean[index].tolist(), 'std': std[index].tolist()}
+
+    def save(self, path: str) -> str:
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'columns': self.columns, 'train_end': self.train_end, **self.stats.to_dict()}
+        with out.open('w', encoding='utf-8') as fp:
+            json.dump(payload, fp, indent=2)
+        return str(out)
+
+    @classmethod
+    def load(cls, path: str) -> "NormalizationStats":
+        with open(path, 'r', encoding='utf-8') as fp:
+            payload = json.load(fp)
+        return cls(payload['columns'], RunningStats.from_dict(payload), payload.get('train_end'))
+
+
+def stats_sidecar(path: str) -> Path:
+    return Path(f"{path}{STATS_SIDECAR_SUFFIX}")
+
+
+def _utc(values) -> pd.Series:
+    return pd.to_datetime(values, utc=True)
+
+
+def _utc_timestamp(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+def feature_columns(csv_path: str, exclude: Iterable[str] = NON_FEATURE_COLUMNS) -> List[str]:
+    """Numeric columns of the CSV, judged from its first rows."""
+    sample = pd.read_csv(csv_path, nrows=1000)
+    exclude = set(exclude)
+    return [c for c in sample.select_dtypes(include='number').columns if c not in exclude]
+
+
+def fit_normalization(
+    csv_path: str,
+    train_end,
+    columns: Optional[List[str]] = None,
+    chunksize: int = 200_000,
+) -> NormalizationStats:
+    """Stream the CSV and accumulate stats over rows strictly before train_end (naive values are UTC)."""
+    columns = columns or feature_columns(csv_path)
+    cutoff = _utc_timestamp(train_end)
+    norm = NormalizationStats(columns, train_end=str(cutoff))
+    for chunk in pd.read_csv(csv_path, usecols=['datetime'] + columns, chunksize=chunksize):
+        train_rows = chunk[_utc(chunk['datetime']) < cutoff]
+        if not train_rows.empty:
+            norm.update(train_rows)
+    return norm
+
+
+def normalize_csv(
+    csv_path: str,
+    output_path: str,
+    norm: NormalizationStats,
+    after=None,
+    chunksize: int = 200_000,
+) -> int:
+    """Write normalized rows chunk by chunk; with `after`, only rows newer than it are appended."""
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    cutoff = _utc_timestamp(after) if after is not None and out.exists() else None
+    append = cutoff is not None
+    written = 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+        if cutoff is not None:
+            chunk = chunk[_utc(chunk['datetime']) > cutoff]
+        if chunk.empty:
+            continue
+        norm.apply(chunk).to_csv(out, mode='a' if append else 'w', header=not append, index=False)
+        append = True
+        written += len(chunk)
+    if written:
+        norm.save(stats_sidecar(output_path))
+    return written
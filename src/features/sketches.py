@@ -0,0 +1,179 @@
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from features.normalization import RunningStats
+
+DEFAULT_COMPRESSION = 200.0
+
+
+class TDigest:
+    """Merging t-digest: a few hundred weighted centroids that answer quantile queries.
+
+    Centroids are kept sorted by mean. Each compression packs points so that no
+    centroid spans more than one unit of the k1 scale function
+    k(q) = compression / (2 pi) * asin(2q - 1). This keeps the tails nearly
+    exact and the size bounded by about compression / 2 centroids, whatever
+    the stream length. Two digests merge by compressing their combined
+    centroids, so per-chunk or per-worker digests can be folded together.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION):
+        self.compression = float(compression)
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values: np.ndarray) -> "TDigest":
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.min = min(self.min, float(values.min()))
+            self.max = max(self.max, float(values.max()))
+            self._compress(np.concatenate([self.means, values]),
+                           np.concatenate([self.weights, np.ones(len(values))]))
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if other.weights.size:
+            self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        # Bucket every point by the integer part of k at its weight midpoint;
+        # runs of one bucket collapse into a single weighted centroid.
+        q = (cumulative - weights / 2) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+        bucket = np.floor(k - k.min()).astype(np.int64)
+        starts = np.flatnonzero(np.concatenate([[True], bucket[1:] != bucket[:-1]]))
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _knots(self):
+        """(cumulative weight, value) interpolation knots from min through the centroids to max."""
+        position = np.cumsum(self.weights) - self.weights / 2
+        return (np.concatenate([[0.0], position, [self.count]]),
+                np.concatenate([[self.min], self.means, [self.max]]))
+
+    def quantile(self, q):
+        """Value below which a fraction `q` (scalar or array in [0, 1]) of the stream falls."""
+        if not self.weights.size:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+        position, value = self._knots()
+        return np.interp(np.asarray(q, dtype=np.float64) * self.count, position, value)
+
+    def cdf(self, x):
+        """Fraction of the stream at or below `x` (scalar or array)."""
+        if not self.weights.size:
+            return np.full(np.shape(x), np.nan) if np.ndim(x) else np.nan
+        position, value = self._knots()
+        return np.interp(np.asarray(x, dtype=np.float64), value, position) / self.count
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'compression': self.compression, 'min': self.min if self.weights.size else None,
+                'max': self.max if self.weights.size else None,
+                'means': self.means.tolist(), 'weights': self.weights.tolist()}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "TDigest":
+        digest = cls(payload['compression'])
+        digest.means = np.asarray(payload['means'], dtype=np.float64)
+        digest.weights = np.asarray(payload['weights'], dtype=np.float64)
+        if digest.weights.size:
+            digest.min, digest.max = float(payload['min']), float(payload['max'])
+        return digest
+
+
+class StreamSketch:
+    """Quantiles (TDigest) plus exact running moments (RunningStats) of one value stream.
+
+    Updatable chunk by chunk, mergeable, and a few KB on disk whatever the history length.
+    """
+
+    def __init__(self, compression: float = DEFAULT_COMPRESSION,
+                 digest: Optional[TDigest] = None, moments: Optional[RunningStats] = None):
+        self.digest = digest or TDigest(compression)
+        self.moments = moments or RunningStats(1)
+
+    def update(self, values: np.ndarray) -> "StreamSketch":
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.digest.update(values)
+        self.moments.update(values)
+        return self
+
+    def merge(self, other: "StreamSketch") -> "StreamSketch":
+        self.digest.merge(other.digest)
+        self.moments.merge(other.moments)
+        return self
+
+    def copy(self) -> "StreamSketch":
+        return StreamSketch.from_dict(self.to_dict())
+
+    @property
+    def count(self) -> int:
+        return int(self.moments.count[0])
+
+    @property
+    def mean(self) -> float:
+        return float(self.moments.mean[0]) if self.count else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(self.moments.std[0]) if self.count else np.nan
+
+    @property
+    def min(self) -> float:
+        return self.digest.min if self.count else np.nan
+
+    @property
+    def max(self) -> float:
+        return self.digest.max if self.count else np.nan
+
+    def quantile(self, q):
+        return self.digest.quantile(q)
+
+    def summary(self, quantiles: Iterable[float] = (0.05, 0.5, 0.95)) -> Dict[str, float]:
+        """count, mean, std, min, max and the requested quantiles (keyed p05, p50, ...)."""
+        quantiles = list(quantiles)
+        values = self.quantile(quantiles) if quantiles else []
+        return {'count': self.count, 'mean': self.mean, 'std': self.std, 'min': self.min, 'max': self.max,
+                **{f"p{round(q * 100):02d}": float(v) for q, v in zip(quantiles, values)}}
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'digest': self.digest.to_dict(), 'moments': self.moments.to_dict()}
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "StreamSketch":
+        return cls(digest=TDigest.from_dict(payload['digest']), moments=RunningStats.from_dict(payload['moments']))
+
+
+def save_sketches(path: str, sketches: Dict[str, StreamSketch]) -> str:
+    """Write named sketches to one JSON file (atomically)."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + '.tmp')
+    with tmp.open('w', encoding='utf-8') as fp:
+        json.dump({name: sketch.to_dict() for name, sketch in sketches.items()}, fp)
+    tmp.replace(out)
+    return str(out)
+
+
+def load_sketches(path: str) -> Dict[str, StreamSketch]:
+    """Named sketches from save_sketches(); an empty dict when the file does not exist yet."""
+    if not Path(path).exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as fp:
+        return {name: StreamSketch.from_dict(payload) for name, payload in json.load(fp).items()}
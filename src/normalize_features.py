@@ -0,0 +1,87 @@
+"""
+Feature Normalization Stage
+Fit z-score statistics on the training range only, then normalize the fused feature CSV chunk by chunk.
+
+Usage:
+    python src/normalize_features.py fit --input <raw.csv> --train-fraction 0.8
+    python src/normalize_features.py apply --input <raw.csv> --output health_net_features_2_normalize.csv
+    python src/normalize_features.py apply ... --incremental   # append only minutes newer than the output
+    python src/normalize_features.py parquet --input health_net_features_2_normalize.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dataset_range import probe_date_range, probe_first_last
+from features.loader import convert_to_parquet
+from features.normalization import NormalizationStats, fit_normalization, normalize_csv
+
+DEFAULT_STATS_FILE = 'output/normalization_stats.json'
+
+
+def train_cutoff(csv_path, train_end, train_fraction):
+    if train_end:
+        return train_end
+    start, end = probe_date_range(csv_path)
+    return start + (end - start) * train_fraction
+
+
+def cmd_fit(args):
+    cutoff = train_cutoff(args.input, args.train_end, args.train_fraction)
+    print(f"📐 Fitting normalization stats on rows before {cutoff}...")
+    norm = fit_normalization(args.input, cutoff, chunksize=args.chunksize)
+    norm.save(args.stats)
+    print(f"✅ Saved stats for {len(norm.columns)} features to {args.stats}")
+    print(f"   Training rows per feature: {int(norm.stats.count.min()):,} - {int(norm.stats.count.max()):,}")
+
+
+def cmd_apply(args):
+    norm = NormalizationStats.load(args.stats)
+    after = None
+    if args.incremental and Path(args.output).exists():
+        probed = probe_first_last(args.output)
+        after = probed[1] if probed else None
+        print(f"➕ Appending minutes after {after}")
+    written = normalize_csv(args.input, args.output, norm, after=after, chunksize=args.chunksize)
+    print(f"✅ Normalized {written:,} rows -> {args.output}")
+
+
+def cmd_parquet(args):
+    out = convert_to_parquet(args.input, args.output)
+    print(f"✅ Wrote float32 Parquet copy -> {out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train-only streaming feature normalization")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fit = sub.add_parser("fit", help="Accumulate mean/variance over the training range")
+    fit.add_argument("--input", required=True)
+    fit.add_argument("--stats", default=DEFAULT_STATS_FILE)
+    fit.add_argument("--train-end", default=None, help="Exclusive end of the training range (UTC if no offset)")
+    fit.add_argument("--train-fraction", type=float, default=0.8, help="Used when --train-end is not given")
+    fit.add_argument("--chunksize", type=int, default=200_000)
+    fit.set_defaults(func=cmd_fit)
+
+    apply = sub.add_parser("apply", help="Normalize rows with saved stats")
+    apply.add_argument("--input", required=True)
+    apply.add_argument("--output", required=True)
+    apply.add_argument("--stats", default=DEFAULT_STATS_FILE)
+    apply.add_argument("--incremental", action="store_true", help="Only append rows newer than the output's last row")
+    apply.add_argument("--chunksize", type=int, default=200_000)
+    apply.set_defaults(func=cmd_apply)
+
+    parquet = sub.add_parser("parquet", help="Write a float32 Parquet copy for features.loader.load_features")
+    parquet.add_argument("--input", required=True)
+    parquet.add_argument("--output", default=None, help="Defaults to the input path with a .parquet suffix")
+    parquet.set_defaults(func=cmd_parquet)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import glob
 from datetime import datetime, timedelta
 import pytz
 
+from dataset_range import write_range_sidecar
 from streaming.config import load_config
 from streaming.kafka_event_writer import KafkaEventWriter
 
@@ -191,6 +192,7 @@ def process_all_files():
         os.makedirs(OUTPUT_DIR)
         
     combined.to_csv(OUTPUT_FILE, index=False)
+    write_range_sidecar(OUTPUT_FILE, combined['datetime'].min(), combined['datetime'].max(), rows=len(combined))
     print(f"\n✅ Saved consolidated data to: {OUTPUT_FILE}")
     print(f"   Total Rows: {len(combined)}")
     print(f"   Columns: {', '.join(combined.columns)}")
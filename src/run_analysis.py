@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from analyze_data import DataAnalyzer
 from correlation_analysis import CorrelationAnalyzer
-from store.cassandra_client import export_minute_features_csv
+from store.export_cache import cached_minute_features_csv
 
 def main():
     print("\n" + "="*70)
@@ -23,9 +23,8 @@ def main():
     # Optional Cassandra export path for additive compatibility with existing analysis scripts.
     cassandra_enabled = os.getenv("BDA_USE_CASSANDRA", "0") == "1"
     if cassandra_enabled:
-        export_path = "output/analysis_results/cassandra_minute_features.csv"
         try:
-            exported = export_minute_features_csv(export_path, limit=200000)
+            exported = cached_minute_features_csv()
             if Path(exported).exists():
                 df = pd.read_csv(exported)
                 print(f"  Cassandra export ready: {exported} ({len(df)} rows)")
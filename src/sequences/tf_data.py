@@ -0,0 +1,112 @@
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from sequences.windows import WindowDataset
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+def window_tf_dataset(
+    windows: WindowDataset,
+    batch_size: int,
+    shuffle_buffer: Optional[int] = 10_000,
+    seed: Optional[int] = None,
+    repeat: bool = False,
+    with_targets: bool = False,
+) -> tf.data.Dataset:
+    """tf.data pipeline over a memory-mapped WindowDataset.
+
+    Only window positions flow through shuffle/batch, so the shuffle buffer
+    holds integers rather than windows. Each batch of positions is gathered
+    from the mmap (already restricted to `windows.columns`) in parallel map
+    calls and prefetched while the previous step trains.
+    """
+    _, timesteps, n_columns = windows.shape
+
+    def gather(positions):
+        positions = np.sort(positions)
+        batch = windows.get_windows(positions).astype(np.float32, copy=False)
+        if with_targets:
+            return batch, windows.get_targets(positions).astype(np.float32, copy=False)
+        return batch
+
+    def load(positions):
+        if with_targets:
+            x, y = tf.numpy_function(gather, [positions], [tf.float32, tf.float32])
+            x.set_shape([None, timesteps, n_columns])
+            y.set_shape([None])
+            return x, y
+        x = tf.numpy_function(gather, [positions], tf.float32)
+        x.set_shape([None, timesteps, n_columns])
+        return x
+
+    ds = tf.data.Dataset.range(len(windows))
+    if shuffle_buffer:
+        ds = ds.shuffle(min(shuffle_buffer, len(windows)), seed=seed, reshuffle_each_iteration=True)
+    if repeat:
+        ds = ds.repeat()
+    ds = ds.batch(batch_size).map(load, num_parallel_calls=AUTOTUNE, deterministic=False)
+    return ds.prefetch(AUTOTUNE)
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None if the platform does not expose it)."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+class EpochResourceLogger(keras.callbacks.Callback):
+    """Record wall time and process peak RSS for every training epoch."""
+
+    def __init__(self):
+        super().__init__()
+        self.epoch_seconds: List[float] = []
+        self.peak_rss_mb: List[Optional[float]] = []
+        self._started = 0.0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        self.epoch_seconds.append(time.perf_counter() - self._started)
+        self.peak_rss_mb.append(peak_rss_mb())
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        seconds = self.epoch_seconds
+        peaks = [p for p in self.peak_rss_mb if p is not None]
+        return {
+            "epochs": len(seconds),
+            "first_epoch_seconds": seconds[0] if seconds else None,
+            # The first epoch includes graph tracing; later epochs reflect steady-state input cost.
+            "mean_epoch_seconds": float(np.mean(seconds[1:] if len(seconds) > 1 else seconds)) if seconds else None,
+            "peak_rss_mb": max(peaks) if peaks else None,
+        }
+
+
+def record_pipeline_run(report_path: str, mode: str, summary: Dict) -> Dict[str, Dict]:
+    """Store this run's summary under `mode` and return all recorded modes for comparison."""
+    path = Path(report_path)
+    report = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+    report[mode] = summary
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
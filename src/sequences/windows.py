@@ -0,0 +1,247 @@
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(data: np.ndarray, window_size: int) -> np.ndarray:
+    """Read-only view of every window: shape (len(data) - window_size + 1, window_size, features).
+
+    No data is copied; window i is data[i:i + window_size].
+    """
+    if data.ndim != 2:
+        raise ValueError(f"Expected a 2D (samples, features) array, got shape {data.shape}")
+    if len(data) < window_size:
+        raise ValueError(f"Need at least {window_size} rows to build one window, got {len(data)}")
+    # sliding_window_view appends the window axis last; swap it in front of the feature axis.
+    return sliding_window_view(data, window_size, axis=0).transpose(0, 2, 1)
+
+
+def create_sequences(data: np.ndarray, target_column_index: int, window_size: int = 60, materialize: bool = False):
+    """
+    Create sliding window sequences for LSTM.
+
+    Parameters:
+    - data: numpy array of shape (samples, features)
+    - target_column_index: index of the target column in the data
+    - window_size: number of time steps to look back
+    - materialize: copy the windows into a new contiguous array (window_size times
+      the memory of `data`); by default X is a strided view over `data`
+
+    Returns:
+    - X: 3D array of shape (num_sequences, window_size, num_features)
+    - y: 1D array of shape (num_sequences,) containing the target value right after each window
+    """
+    # The last window has no following minute to predict, so drop it.
+    X = sliding_windows(data, window_size)[:-1]
+    y = data[window_size:, target_column_index]
+    if materialize:
+        return np.ascontiguousarray(X), y.copy()
+    return X, y
+
+
+FEATURES_FILE = "features.npy"
+WINDOW_INDEX_FILE = "window_index.npz"
+
+
+def as_datetime_index(timestamps) -> pd.DatetimeIndex:
+    """Parse timestamps at ns resolution; strings with mixed UTC offsets (DST) are normalised to UTC."""
+    try:
+        ts = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    except ValueError:
+        ts = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True))
+    return ts.as_unit("ns")
+
+
+def valid_window_starts(
+    timestamps,
+    window_size: int,
+    horizons: Sequence[int] = (1,),
+    stride: int = 1,
+    freq: str = "1min",
+    break_on_day: bool = False,
+) -> np.ndarray:
+    """Start rows of every window whose inputs and targets lie on one unbroken minute run.
+
+    A run breaks wherever consecutive timestamps are not exactly `freq` apart
+    (watch-off gaps, duplicates, out-of-order rows) and, with break_on_day, at
+    each calendar-day change. A window starting at row s reads rows
+    s .. s + window_size - 1 and targets rows s + window_size - 1 + h for every
+    horizon h, so the whole span must share one run id.
+    """
+    ts = as_datetime_index(timestamps)
+    if len(ts) == 0:
+        return np.empty(0, dtype=np.int64)
+    step = pd.Timedelta(freq).value
+    values = ts.asi8
+    breaks = np.diff(values) != step
+    if break_on_day:
+        days = ts.normalize().asi8
+        breaks |= np.diff(days) != 0
+    run_id = np.concatenate([[0], np.cumsum(breaks)])
+
+    span = window_size - 1 + max(horizons)
+    candidates = np.arange(0, len(ts) - span, stride, dtype=np.int64)
+    return candidates[run_id[candidates] == run_id[candidates + span]]
+
+
+def chronological_split(n_windows: int, train_fraction: float = 0.8, purge: int = 0) -> Dict[str, Tuple[int, int]]:
+    """Train/test as [lo, hi) position ranges into the window index.
+
+    `purge` windows are dropped between the two ranges so training targets
+    cannot overlap the first test inputs (use window_size + max horizon - 1).
+    """
+    split = int(n_windows * train_fraction)
+    return {"train": (0, max(0, split - purge)), "test": (split, n_windows)}
+
+
+def walk_forward_folds(n_windows: int, n_folds: int = 5, min_train_fraction: float = 0.5, purge: int = 0) -> np.ndarray:
+    """Expanding-window folds as rows of [train_lo, train_hi, test_lo, test_hi) positions.
+
+    The first min_train_fraction of windows always trains; the remainder is cut
+    into n_folds consecutive test blocks, each trained on everything before it.
+    """
+    first_test = int(n_windows * min_train_fraction)
+    edges = np.linspace(first_test, n_windows, n_folds + 1).astype(np.int64)
+    folds = [
+        (0, max(0, test_lo - purge), test_lo, test_hi)
+        for test_lo, test_hi in zip(edges[:-1], edges[1:])
+        if test_hi > test_lo
+    ]
+    return np.array(folds, dtype=np.int64).reshape(-1, 4)
+
+
+def save_window_dataset(
+    output_dir: str,
+    features: np.ndarray,
+    feature_columns: Sequence[str],
+    starts: np.ndarray,
+    splits: Dict[str, Tuple[int, int]],
+    window_size: int,
+    target_columns: Sequence[str],
+    horizons: Sequence[int] = (1,),
+    folds: Optional[np.ndarray] = None,
+    timestamps=None,
+) -> Tuple[str, str]:
+    """Persist the base feature matrix once plus the valid-window index.
+
+    The matrix is written as float32 .npy so it can be opened with mmap_mode;
+    windows are rebuilt on demand as features[start:start + window_size].
+    Splits and folds are stored as position ranges into `starts`, not as copies.
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    features_path = out / FEATURES_FILE
+    index_path = out / WINDOW_INDEX_FILE
+    feature_columns = list(feature_columns)
+    np.save(features_path, np.ascontiguousarray(features, dtype=np.float32))
+
+    extra = {}
+    if timestamps is not None:
+        ts = as_datetime_index(timestamps)
+        extra["timestamps"] = (ts.tz_convert("UTC") if ts.tz is not None else ts).asi8
+    np.savez(
+        index_path,
+        window_size=np.int64(window_size),
+        feature_columns=np.array(feature_columns),
+        target_columns=np.array(list(target_columns)),
+        target_column_index=np.int64(feature_columns.index(target_columns[0])),
+        horizons=np.asarray(horizons, dtype=np.int64),
+        starts=np.asarray(starts, dtype=np.int64),
+        split_names=np.array(list(splits)),
+        split_ranges=np.array([splits[name] for name in splits], dtype=np.int64).reshape(-1, 2),
+        folds=np.zeros((0, 4), dtype=np.int64) if folds is None else np.asarray(folds, dtype=np.int64),
+        **extra,
+    )
+    return str(features_path), str(index_path)
+
+
+class WindowDataset:
+    """Windows of one split (or walk-forward fold), assembled per batch from the memory-mapped base matrix."""
+
+    def __init__(
+        self,
+        directory: str = ".",
+        split: str = "train",
+        columns: Optional[Sequence[str]] = None,
+        mmap: bool = True,
+        fold: Optional[int] = None,
+    ):
+        directory = Path(directory)
+        index = np.load(directory / WINDOW_INDEX_FILE)
+        self.split = split
+        self.window_size = int(index["window_size"])
+        self.feature_columns = [str(c) for c in index["feature_columns"]]
+        self.target_column_index = int(index["target_column_index"])
+        self.target_columns = [str(c) for c in index["target_columns"]]
+        self.horizons = index["horizons"]
+        self.timestamps = index["timestamps"] if "timestamps" in index.files else None
+
+        if fold is not None:
+            train_lo, train_hi, test_lo, test_hi = index["folds"][fold]
+            lo, hi = (train_lo, train_hi) if split == "train" else (test_lo, test_hi)
+        else:
+            names = [str(n) for n in index["split_names"]]
+            lo, hi = index["split_ranges"][names.index(split)]
+        self.starts = index["starts"][lo:hi]
+
+        self.base = np.load(directory / FEATURES_FILE, mmap_mode="r" if mmap else None)
+        self.columns = list(columns) if columns else list(self.feature_columns)
+        self.column_indices = np.array([self.feature_columns.index(c) for c in self.columns], dtype=np.int64)
+        self._target_indices = np.array([self.feature_columns.index(c) for c in self.target_columns], dtype=np.int64)
+        self._offsets = np.arange(self.window_size, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return len(self), self.window_size, len(self.column_indices)
+
+    def _starts(self, positions: Optional[np.ndarray]) -> np.ndarray:
+        return self.starts if positions is None else self.starts[positions]
+
+    def get_windows(self, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Gather windows (batch, window_size, n_columns) for the given split positions."""
+        rows = self._starts(positions)[:, None] + self._offsets
+        return self.base[rows[..., None], self.column_indices]
+
+    def get_targets(self, positions: Optional[np.ndarray] = None, column: Optional[str] = None) -> np.ndarray:
+        """Value of the (first) target column in the row right after each window."""
+        target = self.target_column_index if column is None else self.feature_columns.index(column)
+        return np.asarray(self.base[self._starts(positions) + self.window_size, target])
+
+    def get_multi_targets(self, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """Targets for every horizon and target column: (batch, n_horizons, n_targets)."""
+        rows = self._starts(positions)[:, None] + (self.window_size - 1) + self.horizons
+        return self.base[rows[..., None], self._target_indices]
+
+    def window_end_times(self, positions: Optional[np.ndarray] = None) -> pd.DatetimeIndex:
+        """UTC timestamp of the last input row of each window (requires saved timestamps)."""
+        if self.timestamps is None:
+            raise ValueError("Window index was saved without timestamps")
+        ends = self.timestamps[self._starts(positions) + self.window_size - 1]
+        return pd.DatetimeIndex(pd.to_datetime(ends, utc=True))
+
+    def steps_per_epoch(self, batch_size: int) -> int:
+        return int(np.ceil(len(self) / batch_size))
+
+    def iter_batches(
+        self,
+        batch_size: int,
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        repeat: bool = False,
+        with_targets: bool = False,
+    ) -> Iterator:
+        rng = np.random.default_rng(seed)
+        while True:
+            order = rng.permutation(len(self)) if shuffle else np.arange(len(self))
+            for begin in range(0, len(order), batch_size):
+                positions = np.sort(order[begin:begin + batch_size]) if shuffle else order[begin:begin + batch_size]
+                windows = self.get_windows(positions)
+                yield (windows, self.get_targets(positions)) if with_targets else windows
+            if not repeat:
+                return
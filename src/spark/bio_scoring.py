@@ -0,0 +1,131 @@
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from pyspark.sql.types import ArrayType, DoubleType, LongType, StructField, StructType
+
+BIO_SCORE_COLUMN = "bio_stability_score"
+MINUTE_NS = 60 * 1_000_000_000
+
+# Per-device state: the last (window - 1) minutes of bio features, flattened row-major.
+BIO_WINDOW_STATE_SCHEMA = StructType(
+    [
+        StructField("minute_ns", ArrayType(LongType()), False),
+        StructField("values", ArrayType(DoubleType()), False),
+    ]
+)
+
+_MODEL_CACHE = {}
+
+
+def _load_model(weights_path: str):
+    # One model per executor Python worker; the numpy forward pass needs no TensorFlow.
+    if weights_path not in _MODEL_CACHE:
+        from bio_vae.numpy_inference import NumpyBioVAE
+
+        _MODEL_CACHE[weights_path] = NumpyBioVAE.load(weights_path)
+    return _MODEL_CACHE[weights_path]
+
+
+def _load_normalization(model, stats_path: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean/std the model's training windows were z-scored with.
+
+    They come from the exported model config (`normalization`, recorded at training
+    time); `stats_path` overrides them with a saved NormalizationStats. Without
+    either the raw stream cannot be scored, so this raises instead of guessing.
+    """
+    columns: List[str] = model.config["bio_features"]
+    if stats_path:
+        from features.normalization import NormalizationStats
+
+        params = NormalizationStats.load(stats_path).params(columns)
+    else:
+        params = model.config.get("normalization")
+        if not params:
+            raise ValueError(
+                "The BioVAE export carries no training normalization; retrain with bio_exclusive_vae.py on a "
+                "normalize_features.py output (or pass --normalization-stats), or set spark.bioVae.normalizationStats"
+            )
+        if list(params["columns"]) != list(columns):
+            raise ValueError(f"Model normalization covers {params['columns']}, expected {columns}")
+    return np.asarray(params["mean"], dtype=np.float64), np.asarray(params["std"], dtype=np.float64)
+
+
+def bio_output_schema(input_schema: StructType) -> StructType:
+    return StructType(list(input_schema.fields) + [StructField(BIO_SCORE_COLUMN, DoubleType(), True)])
+
+
+def make_bio_window_scorer(weights_path: str, stats_path: Optional[str] = None):
+    """Build the applyInPandasWithState function that scores each fused minute.
+
+    For every device the state carries the previous (window - 1) minutes of bio
+    features. Each micro-batch's rows are appended, every new minute that closes
+    an unbroken window is scored in one vectorized numpy pass, and the rows are
+    emitted with bio_stability_score (null while the window is still filling or
+    spans a gap). Features are z-scored with the normalization the model was
+    trained with; features missing from the stream (e.g. sleep) sit at the training mean.
+    """
+
+    def score(key, pdf_iter: Iterator[pd.DataFrame], state) -> Iterator[pd.DataFrame]:
+        model = _load_model(weights_path)
+        columns = model.config["bio_features"]
+        window = model.timesteps
+        mean, std = _load_normalization(model, stats_path)
+
+        new = pd.concat(list(pdf_iter), ignore_index=True).sort_values("minute_ts", kind="stable")
+        new_ns = pd.to_datetime(new["minute_ts"]).dt.as_unit("ns").astype("int64").to_numpy()
+        new_values = new.reindex(columns=columns).to_numpy(dtype=np.float64)
+        new_values = np.nan_to_num((new_values - mean) / std, nan=0.0)
+
+        if state.exists:
+            minute_ns, flat = state.get
+            hist_ns = np.asarray(minute_ns, dtype=np.int64)
+            hist_values = np.asarray(flat, dtype=np.float64).reshape(len(hist_ns), len(columns))
+        else:
+            hist_ns = np.empty(0, dtype=np.int64)
+            hist_values = np.empty((0, len(columns)))
+
+        # Rows at or before the newest remembered minute cannot extend the window.
+        fresh = new_ns > (hist_ns[-1] if len(hist_ns) else np.iinfo(np.int64).min)
+        fresh &= np.concatenate([[True], np.diff(new_ns) != 0])
+        all_ns = np.concatenate([hist_ns, new_ns[fresh]])
+        all_values = np.concatenate([hist_values, new_values[fresh]])
+
+        scores = np.full(len(new), np.nan)
+        if len(all_ns) >= window:
+            # Window ending at row j is complete when it spans exactly window - 1 minutes.
+            ends = np.arange(window - 1, len(all_ns))
+            complete = (all_ns[ends] - all_ns[ends - window + 1]) == (window - 1) * MINUTE_NS
+            ends = ends[complete & (ends >= len(hist_ns))]
+            if len(ends):
+                windows = sliding_window_view(all_values, window, axis=0).transpose(0, 2, 1)
+                errors = model.reconstruction_errors(windows[ends - window + 1])
+                end_scores = pd.Series(
+                    np.maximum(0.0, 100.0 - errors * model.config["scaling_factor"]), index=all_ns[ends]
+                )
+                scores = pd.Series(new_ns).map(end_scores).to_numpy(dtype=np.float64, copy=True)
+                scores[~fresh] = np.nan
+
+        keep = min(window - 1, len(all_ns))
+        state.update((all_ns[len(all_ns) - keep:].tolist(), all_values[len(all_ns) - keep:].ravel().tolist()))
+
+        new[BIO_SCORE_COLUMN] = scores
+        yield new
+
+    return score
+
+
+def with_bio_stability_score(df, weights_path: str, stats_path: Optional[str] = None):
+    """Attach bio_stability_score to a streaming fused-minute DataFrame, per device_id."""
+    from pyspark.sql.streaming.state import GroupStateTimeout
+
+    # Fail on the driver, before the query starts, when the inputs cannot be normalized.
+    _load_normalization(_load_model(weights_path), stats_path)
+    return df.groupBy("device_id").applyInPandasWithState(
+        make_bio_window_scorer(weights_path, stats_path),
+        outputStructType=bio_output_schema(df.schema),
+        stateStructType=BIO_WINDOW_STATE_SCHEMA,
+        outputMode="append",
+        timeoutConf=GroupStateTimeout.NoTimeout,
+    )
@@ -1,11 +1,17 @@
 import argparse
+import tempfile
+import zipfile
 from pathlib import Path
 
 from pyspark.sql import SparkSession
 from pyspark.sql import functions as F
 from pyspark.sql.types import DoubleType, IntegerType, StringType, StructField, StructType
 
-from streaming.config import load_config
+from store.rollups import RESOLUTIONS, ROLLUP_METRICS
+from streaming.config import load_config, repo_root
+
+# Packages the in-stream bio scorer imports on the executors.
+BIO_SCORING_PACKAGES = ["bio_vae", "features", "spark"]
 
 
 def build_session(app_name: str, master: str, cassandra_host: str) -> SparkSession:
@@ -22,9 +28,45 @@ def build_session(app_name: str, master: str, cassandra_host: str) -> SparkSessi
     )
 
 
+def write_rollups_batch(batch_df, batch_id: int) -> None:
+    # Imported lazily so --skip-rollups runs do not need the Cassandra Python driver.
+    from store.cassandra_client import get_session, upsert_rollups
+    from store.rollups import compute_rollups
+
+    columns = ["device_id", "minute_ts"] + [c for c in ROLLUP_METRICS if c in batch_df.columns]
+    minutes = batch_df.select(*columns).toPandas()
+    if minutes.empty:
+        return
+    # One connection per micro-batch; batch_id makes a replayed batch a no-op for buckets it already reached.
+    cluster, session, cfg = get_session()
+    try:
+        for resolution in RESOLUTIONS:
+            upsert_rollups(compute_rollups(minutes, resolution), resolution, batch_id=batch_id, session=session, cfg=cfg)
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+def ship_bio_scoring_sources(spark: SparkSession) -> None:
+    # Executors on a remote cluster do not have src/ on their path; zip the scorer's packages and ship them.
+    src_root = Path(__file__).resolve().parents[1]
+    archive = Path(tempfile.mkdtemp(prefix="bda-bio-")) / "bio_scoring_src.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for package in BIO_SCORING_PACKAGES:
+            for path in (src_root / package).rglob("*.py"):
+                zf.write(path, path.relative_to(src_root).as_posix())
+    spark.sparkContext.addPyFile(str(archive))
+
+
 def main():
     parser = argparse.ArgumentParser(description="Spark streaming fusion job")
     parser.add_argument("--master", default=None)
+    parser.add_argument("--skip-rollups", action="store_true", help="Do not maintain hourly/daily rollup tables")
+    parser.add_argument(
+        "--score-bio",
+        action="store_true",
+        help="Score each device's last 60 minutes with the exported BioVAE and write bio_stability_score",
+    )
     args = parser.parse_args()
 
     cfg = load_config()
@@ -153,6 +195,27 @@ def main():
         )
     )
 
+    bio_cfg = spark_cfg.get("bioVae", {})
+    if args.score_bio or bio_cfg.get("enabled", False):
+        from spark.bio_scoring import with_bio_stability_score
+
+        weights_path = repo_root() / bio_cfg.get("weights", "EXO-model/bio_vae_weights.npz")
+        # Normalization normally comes from the model export; normalizationStats only overrides it.
+        stats_path = bio_cfg.get("normalizationStats")
+        stats_path = repo_root() / stats_path if stats_path else None
+        if not weights_path.exists():
+            raise FileNotFoundError(
+                f"BioVAE weights not found at {weights_path}; train the model with EXO-model/bio_exclusive_vae.py to export them"
+            )
+        if stats_path and not stats_path.exists():
+            raise FileNotFoundError(f"spark.bioVae.normalizationStats points at missing {stats_path}")
+        ship_bio_scoring_sources(spark)
+        joined = with_bio_stability_score(
+            joined,
+            str(weights_path),
+            str(stats_path) if stats_path else None,
+        )
+
     checkpoint_root = Path(spark_cfg.get("checkpointRoot", "output/streaming/checkpoints"))
     output_root = Path(cfg.get("paths", {}).get("streamingDir", "output/streaming"))
 
@@ -176,8 +239,19 @@ def main():
         .start()
     )
 
-    csv_query.awaitTermination()
-    cassandra_query.awaitTermination()
+    queries = [csv_query, cassandra_query]
+    if not args.skip_rollups:
+        rollup_query = (
+            joined.writeStream.outputMode("append")
+            .foreachBatch(write_rollups_batch)
+            .option("checkpointLocation", str(checkpoint_root / "rollups"))
+            .trigger(processingTime="30 seconds")
+            .start()
+        )
+        queries.append(rollup_query)
+
+    for query in queries:
+        query.awaitTermination()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+import argparse
+
+from store.cassandra_client import DEFAULT_DEVICE_ID, fetch_minute_range, upsert_rollups
+from store.rollups import RESOLUTIONS, compute_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild hourly/daily rollups from Cassandra minute features")
+    parser.add_argument("--start", required=True, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="Last day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--device-id", default=DEFAULT_DEVICE_ID)
+    parser.add_argument("--resolution", choices=sorted(RESOLUTIONS), action="append")
+    args = parser.parse_args()
+
+    start = f"{args.start} 00:00:00"
+    end = f"{args.end} 23:59:59"
+    minutes = fetch_minute_range(start, end, device_id=args.device_id)
+    print(f"Loaded {len(minutes)} minute rows for {args.device_id} ({args.start} to {args.end})")
+
+    for resolution in args.resolution or ["hour", "day"]:
+        rollups = compute_rollups(minutes, resolution)
+        written = upsert_rollups(rollups, resolution, merge=False)
+        print(f"Wrote {written} {resolution} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
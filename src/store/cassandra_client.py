@@ -1,11 +1,23 @@
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional
 
 import pandas as pd
+from cassandra import InvalidRequest
 from cassandra.cluster import Cluster
 from cassandra.query import dict_factory
 
-from streaming.config import load_config
+from store.rollups import RESOLUTIONS, STAT_FIELDS, empty_rollups, merge_rollups, rollups_to_wide
+from streaming.config import load_config, repo_root
+
+DEFAULT_DEVICE_ID = "default_device"
+DEFAULT_PARTITION_CACHE_DIR = "output/streaming/cache/partitions"
+
+# Resolution -> (config table key, default table name, partition column, clustering column).
+ROLLUP_TABLES = {
+    "hour": ("rollupHourly", "minute_rollup_hourly_v1", "month_bucket", "hour_ts"),
+    "day": ("rollupDaily", "minute_rollup_daily_v1", "year_bucket", "day_bucket"),
+}
 
 
 def get_session():
@@ -29,8 +41,14 @@ def run_schema():
         statements = schema_path.read_text(encoding="utf-8").split(";")
         for statement in statements:
             stmt = statement.strip()
-            if stmt:
+            if not stmt:
+                continue
+            try:
                 session.execute(stmt)
+            except InvalidRequest as exc:
+                # ALTER ... ADD is not idempotent; the column is already there on re-runs.
+                if not stmt.upper().startswith("ALTER") or "already exist" not in str(exc).lower():
+                    raise
     finally:
         session.shutdown()
         cluster.shutdown()
@@ -58,3 +76,283 @@ def export_minute_features_csv(output_path: str, limit: int = 50000, device_id:
     out.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(out, index=False)
     return str(out)
+
+
+def _minute_table(cfg) -> str:
+    return cfg.get("cassandra", {}).get("tables", {}).get("minuteFeatures", "minute_features_v1")
+
+
+def _day_buckets(start, end) -> List:
+    return [ts.date() for ts in pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")]
+
+
+def list_day_buckets(device_id: str = DEFAULT_DEVICE_ID, start=None, end=None) -> List:
+    """Return the sorted day_bucket partitions stored for a device.
+
+    With `start`, only the candidate days from start to `end` (default: today,
+    UTC) are probed, one LIMIT 1 read per (device_id, day_bucket) partition.
+    Without it the partition keys of the whole table are scanned, which only
+    a first full export should need.
+    """
+    cluster, session, cfg = get_session()
+    try:
+        table = _minute_table(cfg)
+        if start is not None:
+            end = end if end is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+            probe = session.prepare(f"SELECT day_bucket FROM {table} WHERE device_id = ? AND day_bucket = ? LIMIT 1")
+            return [day for day in _day_buckets(start, end) if session.execute(probe, [device_id, day]).one()]
+        rows = session.execute(f"SELECT DISTINCT device_id, day_bucket FROM {table}")
+        days = [pd.Timestamp(str(row["day_bucket"])).date() for row in rows if row["device_id"] == device_id]
+        return sorted(days)
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+def _partition_cache_root(cfg) -> Path:
+    cache_cfg = cfg.get("cassandra", {}).get("partitionCache", {})
+    return repo_root() / cache_cfg.get("dir", DEFAULT_PARTITION_CACHE_DIR)
+
+
+def _partition_cache_path(cfg, device_id: str, day) -> Path:
+    return _partition_cache_root(cfg) / device_id / f"{day.isoformat()}.parquet"
+
+
+def _is_closed_day(cfg, day, now: Optional[pd.Timestamp] = None) -> bool:
+    # A day only becomes immutable once the fusion watermark can no longer emit rows into it.
+    grace_hours = cfg.get("cassandra", {}).get("partitionCache", {}).get("closeAfterHours", 2)
+    now = now if now is not None else pd.Timestamp.now(tz="UTC").tz_localize(None)
+    return pd.Timestamp(day) + pd.Timedelta(days=1, hours=grace_hours) <= now
+
+
+def _rows_to_frame(rows) -> pd.DataFrame:
+    df = pd.DataFrame(rows)
+    if "day_bucket" in df.columns:
+        df["day_bucket"] = pd.to_datetime(df["day_bucket"].astype(str)).dt.date
+    return df
+
+
+def _read_closed_partition(session, full_stmt, cfg, device_id: str, day) -> pd.DataFrame:
+    path = _partition_cache_path(cfg, device_id, day)
+    if path.exists():
+        return pd.read_parquet(path)
+    df = _rows_to_frame(session.execute(full_stmt, [device_id, day]))
+    # Empty closed days are cached too (as an empty file) so gaps are not re-queried on every read.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+    return df
+
+
+def fetch_minute_range(
+    start,
+    end,
+    device_id: str = DEFAULT_DEVICE_ID,
+    columns: Optional[Iterable[str]] = None,
+    use_cache: bool = True,
+) -> pd.DataFrame:
+    """Read [start, end] by walking (device_id, day_bucket) partitions instead of scanning the table.
+
+    Closed days are served from the local Parquet partition cache (filled on
+    first read); today and days still inside the grace window are always read
+    live. Use invalidate_partition_cache() when late rows land in a closed day.
+    """
+    cluster, session, cfg = get_session()
+    try:
+        keys = ["device_id", "day_bucket", "minute_ts"]
+        select_cols = "*"
+        if columns:
+            select_cols = ", ".join(keys + [c for c in columns if c not in keys])
+        table = _minute_table(cfg)
+        range_stmt = session.prepare(
+            f"SELECT {select_cols} FROM {table} "
+            "WHERE device_id = ? AND day_bucket = ? AND minute_ts >= ? AND minute_ts <= ?"
+        )
+        full_stmt = session.prepare(f"SELECT * FROM {table} WHERE device_id = ? AND day_bucket = ?")
+        start_ts = pd.Timestamp(start)
+        end_ts = pd.Timestamp(end)
+        frames = []
+        for day in _day_buckets(start, end):
+            if use_cache and _is_closed_day(cfg, day):
+                df = _read_closed_partition(session, full_stmt, cfg, device_id, day)
+                if df.empty:
+                    continue
+                df = df[(df["minute_ts"] >= start_ts) & (df["minute_ts"] <= end_ts)]
+                if columns:
+                    df = df[keys + [c for c in columns if c not in keys and c in df.columns]]
+            else:
+                rows = session.execute(range_stmt, [device_id, day, start_ts.to_pydatetime(), end_ts.to_pydatetime()])
+                df = _rows_to_frame(rows)
+            frames.append(df)
+        frames = [f for f in frames if not f.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    finally:
+        session.shutdown()
+        cluster.shutdown()
+
+
+def invalidate_partition_cache(device_id: Optional[str] = None, start=None, end=None) -> int:
+    """Delete cached closed-day partitions; with no arguments the whole cache is cleared."""
+    root = _partition_cache_root(load_config())
+    if not root.exists():
+        return 0
+    device_dirs = [root / device_id] if device_id else [p for p in root.iterdir() if p.is_dir()]
+    lower = pd.Timestamp(start).date() if start is not None else None
+    upper = pd.Timestamp(end).date() if end is not None else None
+    removed = 0
+    for device_dir in device_dirs:
+        for path in device_dir.glob("*.parquet"):
+            day = pd.Timestamp(path.stem).date()
+            if (lower is None or day >= lower) and (upper is None or day <= upper):
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def _rollup_table(cfg, resolution: str):
+    if resolution not in ROLLUP_TABLES:
+        raise ValueError(f"Unknown rollup resolution '{resolution}', expected one of {list(ROLLUP_TABLES)}")
+    cfg_key, default_table, partition_col, clustering_col = ROLLUP_TABLES[resolution]
+    table = cfg.get("cassandra", {}).get("tables", {}).get(cfg_key, default_table)
+    return table, partition_col, clustering_col
+
+
+def _rollup_partition(resolution: str, bucket_ts: pd.Timestamp):
+    return bucket_ts.strftime("%Y-%m") if resolution == "hour" else int(bucket_ts.year)
+
+
+def _rollup_partitions(resolution: str, start, end) -> list:
+    freq = "MS" if resolution == "hour" else "YS"
+    first = pd.Timestamp(start).to_period("M" if resolution == "hour" else "Y").to_timestamp()
+    return [_rollup_partition(resolution, ts) for ts in pd.date_range(first, pd.Timestamp(end), freq=freq)]
+
+
+def _clustering_value(resolution: str, bucket_ts: pd.Timestamp):
+    return bucket_ts.to_pydatetime() if resolution == "hour" else bucket_ts.date()
+
+
+def _rollup_rows_to_long(rows, clustering_col: str) -> pd.DataFrame:
+    records = []
+    for row in rows:
+        bucket_ts = pd.Timestamp(str(row[clustering_col]))
+        for metric, stats in (row.get("metrics") or {}).items():
+            record = {"device_id": row["device_id"], "bucket_ts": bucket_ts, "metric": metric, "minute_count": row["minute_count"]}
+            record.update(zip(STAT_FIELDS, tuple(stats)))
+            records.append(record)
+    return pd.DataFrame(records) if records else empty_rollups()
+
+
+def _select_rollup_rows(session, table, partition_col, clustering_col, resolution, device_id, partition, lower, upper):
+    query = (
+        f"SELECT * FROM {table} WHERE device_id = %s AND {partition_col} = %s "
+        f"AND {clustering_col} >= %s AND {clustering_col} <= %s"
+    )
+    return session.execute(
+        query,
+        [device_id, partition, _clustering_value(resolution, lower), _clustering_value(resolution, upper)],
+    )
+
+
+def upsert_rollups(
+    rollups: pd.DataFrame,
+    resolution: str = "hour",
+    merge: bool = True,
+    batch_id: Optional[int] = None,
+    session=None,
+    cfg=None,
+) -> int:
+    """Write long-format rollups (see store.rollups.compute_rollups).
+
+    With merge=True the existing stats for the touched buckets are read back and
+    combined first, so micro-batches can be applied one after another. With
+    merge=False the buckets are overwritten, which is what a full rebuild wants.
+
+    Pass the streaming batch_id to make merges idempotent: each bucket row records
+    the last batch folded into it, and a replayed batch (foreachBatch may deliver
+    one more than once) skips every bucket that already holds it. Pass an open
+    session/cfg (from get_session) to reuse one connection across calls.
+    """
+    if rollups.empty:
+        return 0
+    own_session = session is None
+    if own_session:
+        cluster, session, cfg = get_session()
+    try:
+        table, partition_col, clustering_col = _rollup_table(cfg, resolution)
+        batch_col = ", last_batch_id" if batch_id is not None else ""
+        insert = session.prepare(
+            f"INSERT INTO {table} (device_id, {partition_col}, {clustering_col}, minute_count, metrics{batch_col}) "
+            f"VALUES (?, ?, ?, ?, ?{', ?' if batch_id is not None else ''})"
+        )
+        frame = rollups.copy()
+        frame["bucket_ts"] = pd.to_datetime(frame["bucket_ts"])
+        frame["partition"] = frame["bucket_ts"].map(lambda ts: _rollup_partition(resolution, ts))
+
+        written = 0
+        for (device_id, partition), part in frame.groupby(["device_id", "partition"]):
+            part = part.drop(columns=["partition"])
+            if merge:
+                rows = list(_select_rollup_rows(
+                    session, table, partition_col, clustering_col, resolution,
+                    device_id, partition, part["bucket_ts"].min(), part["bucket_ts"].max(),
+                ))
+                if batch_id is not None:
+                    applied = {
+                        pd.Timestamp(str(row[clustering_col])) for row in rows
+                        if row.get("last_batch_id") is not None and row["last_batch_id"] >= batch_id
+                    }
+                    part = part[~part["bucket_ts"].isin(applied)]
+                    if part.empty:
+                        continue
+                existing = _rollup_rows_to_long(rows, clustering_col)
+                existing = existing[existing["bucket_ts"].isin(part["bucket_ts"].unique())]
+                part = merge_rollups(existing, part)
+
+            for bucket_ts, bucket in part.groupby("bucket_ts"):
+                metrics = {
+                    row.metric: (
+                        int(row.value_count),
+                        float(row.value_sum),
+                        float(row.value_min),
+                        float(row.value_max),
+                        float(row.value_sum_sq),
+                    )
+                    for row in bucket.itertuples(index=False)
+                }
+                values = [device_id, partition, _clustering_value(resolution, bucket_ts), int(bucket["minute_count"].max()), metrics]
+                if batch_id is not None:
+                    values.append(int(batch_id))
+                session.execute(insert, values)
+                written += 1
+        return written
+    finally:
+        if own_session:
+            session.shutdown()
+            cluster.shutdown()
+
+
+def fetch_rollups(
+    start,
+    end,
+    resolution: str = "hour",
+    device_id: str = DEFAULT_DEVICE_ID,
+    wide: bool = True,
+) -> pd.DataFrame:
+    """Read hourly/daily rollups for [start, end]; wide=True adds per-metric mean/std columns."""
+    cluster, session, cfg = get_session()
+    try:
+        table, partition_col, clustering_col = _rollup_table(cfg, resolution)
+        freq = RESOLUTIONS[resolution]
+        lower = pd.Timestamp(start).floor(freq)
+        upper = pd.Timestamp(end).floor(freq)
+        rows = []
+        for partition in _rollup_partitions(resolution, lower, upper):
+            rows.extend(
+                _select_rollup_rows(session, table, partition_col, clustering_col, resolution, device_id, partition, lower, upper)
+            )
+        long = _rollup_rows_to_long(rows, clustering_col)
+        return rollups_to_wide(long) if wide else long
+    finally:
+        session.shutdown()
+        cluster.shutdown()
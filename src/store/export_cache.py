@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+from store.cassandra_client import DEFAULT_DEVICE_ID, fetch_minute_range, list_day_buckets
+from streaming.config import load_config, repo_root
+
+DEFAULT_CACHE_DIR = "output/streaming/cache/exports"
+# Consumers started together share one freshness check instead of each probing Cassandra.
+DEFAULT_MAX_AGE_SECONDS = 300.0
+
+
+def _cache_dir(cache_dir: Optional[str]) -> Path:
+    if cache_dir:
+        return Path(cache_dir)
+    cfg = load_config()
+    configured = cfg.get("paths", {}).get("exportCacheDir", DEFAULT_CACHE_DIR)
+    return repo_root() / configured
+
+
+def export_cache_key(device_id: str, start, end, columns: Optional[Iterable[str]]) -> Dict[str, Any]:
+    return {
+        "device_id": device_id,
+        "start": str(pd.Timestamp(start)) if start is not None else None,
+        "end": str(pd.Timestamp(end)) if end is not None else None,
+        "columns": list(columns) if columns else None,
+    }
+
+
+def _key_digest(key: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _write_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, indent=2)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _exclusive_lock(path: Path):
+    """Cross-process lock on `path` held for the with block (fcntl, or msvcrt on Windows)."""
+    with path.open("a+b") as fp:
+        try:
+            import fcntl
+
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            unlock = lambda: fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+        except ImportError:
+            import msvcrt
+
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+            unlock = lambda: (fp.seek(0), msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1))
+        try:
+            yield
+        finally:
+            unlock()
+
+
+def _fetch_since(device_id: str, start, end, columns, watermark: Optional[pd.Timestamp]) -> pd.DataFrame:
+    lower = pd.Timestamp(start) if start is not None else None
+    if watermark is not None:
+        lower = watermark if lower is None else max(lower, watermark)
+    upper = pd.Timestamp(end) if end is not None else None
+    # Refreshes only probe the days from the watermark on; the whole partition-key scan is for first exports.
+    days = list_day_buckets(device_id, start=lower, end=upper)
+    days = [d for d in days if (lower is None or d >= lower.date()) and (upper is None or d <= upper.date())]
+    if not days:
+        return pd.DataFrame()
+
+    fetch_start = lower if lower is not None else pd.Timestamp(days[0])
+    fetch_end = upper if upper is not None else pd.Timestamp(days[-1]) + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    df = fetch_minute_range(fetch_start, fetch_end, device_id=device_id, columns=columns)
+    if df.empty:
+        return df
+    df = df.sort_values("minute_ts")
+    if watermark is not None:
+        df = df[pd.to_datetime(df["minute_ts"]) > watermark]
+    return df
+
+
+def cached_minute_features_csv(
+    start=None,
+    end=None,
+    device_id: str = DEFAULT_DEVICE_ID,
+    columns: Optional[Iterable[str]] = None,
+    cache_dir: Optional[str] = None,
+    max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+) -> str:
+    """Return a shared CSV snapshot of minute_features_v1 for the given query.
+
+    Snapshots are keyed by (device_id, start, end, columns) and carry a
+    watermark on the newest exported minute_ts. A snapshot younger than
+    max_age_seconds is reused as is; otherwise only partitions from the
+    watermark's day onward are read and rows newer than the watermark are
+    appended. Rows that land behind the watermark are not picked up; delete
+    the snapshot (or its manifest) to force a full re-export. The check and
+    append run under a per-snapshot file lock, so concurrent consumers never
+    append the same tail twice.
+    """
+    columns = list(columns) if columns else None
+    key = export_cache_key(device_id, start, end, columns)
+    root = _cache_dir(cache_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    digest = _key_digest(key)
+    csv_path = root / f"minute_features_{digest}.csv"
+    manifest_path = root / f"minute_features_{digest}.json"
+
+    with _exclusive_lock(root / f"minute_features_{digest}.lock"):
+        manifest = _read_manifest(manifest_path)
+        if manifest is not None and (not csv_path.exists() or manifest.get("key") != key):
+            manifest = None
+
+        if manifest is not None:
+            # Drop a partially appended tail left behind by an interrupted refresh.
+            if csv_path.stat().st_size > manifest["bytes"]:
+                os.truncate(csv_path, manifest["bytes"])
+            if time.time() - manifest["checked_at"] < max_age_seconds:
+                return str(csv_path)
+
+        watermark = pd.Timestamp(manifest["watermark"]) if manifest and manifest.get("watermark") else None
+        new_rows = _fetch_since(device_id, start, end, columns, watermark)
+
+        if manifest is None or manifest["rows"] == 0:
+            tmp = csv_path.with_name(csv_path.name + ".tmp")
+            new_rows.to_csv(tmp, index=False)
+            os.replace(tmp, csv_path)
+            manifest = {"key": key, "rows": 0, "watermark": None}
+        elif not new_rows.empty:
+            header = pd.read_csv(csv_path, nrows=0).columns
+            new_rows.reindex(columns=header).to_csv(csv_path, mode="a", header=False, index=False)
+
+        if not new_rows.empty:
+            manifest["watermark"] = str(pd.to_datetime(new_rows["minute_ts"]).max())
+            manifest["rows"] += len(new_rows)
+        manifest["bytes"] = csv_path.stat().st_size
+        manifest["checked_at"] = time.time()
+        _write_manifest(manifest_path, manifest)
+    return str(csv_path)
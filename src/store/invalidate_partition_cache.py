@@ -0,0 +1,21 @@
+import argparse
+
+from store.cassandra_client import invalidate_partition_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drop cached closed-day minute_features_v1 partitions")
+    parser.add_argument("--device-id", default=None, help="Only this device (default: all devices)")
+    parser.add_argument("--start", default=None, help="First day to drop (YYYY-MM-DD)")
+    parser.add_argument("--end", default=None, help="Last day to drop (YYYY-MM-DD)")
+    parser.add_argument("--day", default=None, help="Single day to drop (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    start = args.day or args.start
+    end = args.day or args.end
+    removed = invalidate_partition_cache(device_id=args.device_id, start=start, end=end)
+    print(f"Removed {removed} cached partition(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+ROLLUP_METRICS = [
+    "heart_rate",
+    "stress_level",
+    "body_battery",
+    "respiration_rate",
+    "steps_per_minute",
+    "calories_per_minute",
+    "temperature_celsius",
+    "humidity_percent",
+    "precipitation_mm",
+    "rain_mm",
+    "snowfall_cm",
+    "cloud_cover_percent",
+    "wind_speed_kmh",
+    "wind_direction_degrees",
+    "surface_pressure_hpa",
+    "stress_rolling_mean_30",
+    "stress_volatility_30",
+    "bio_stability_score",
+]
+
+STAT_FIELDS = ["value_count", "value_sum", "value_min", "value_max", "value_sum_sq"]
+
+# Resolution name -> pandas floor frequency.
+RESOLUTIONS = {"hour": "h", "day": "D"}
+
+ROLLUP_KEYS = ["device_id", "bucket_ts", "metric"]
+
+
+def empty_rollups() -> pd.DataFrame:
+    return pd.DataFrame(columns=ROLLUP_KEYS + ["minute_count"] + STAT_FIELDS)
+
+
+def compute_rollups(
+    df: pd.DataFrame,
+    resolution: str = "hour",
+    metrics: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Aggregate fused minute rows into long-format rollups.
+
+    Returns one row per (device_id, bucket_ts, metric) with the mergeable
+    statistics in STAT_FIELDS plus the number of minutes seen in the bucket.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown rollup resolution '{resolution}', expected one of {list(RESOLUTIONS)}")
+    if df.empty:
+        return empty_rollups()
+
+    metrics = [m for m in (metrics or ROLLUP_METRICS) if m in df.columns]
+    frame = df[["device_id", "minute_ts"] + metrics].copy()
+    frame["bucket_ts"] = pd.to_datetime(frame["minute_ts"]).dt.floor(RESOLUTIONS[resolution])
+
+    minute_counts = (
+        frame.groupby(["device_id", "bucket_ts"])["minute_ts"].nunique().rename("minute_count").reset_index()
+    )
+
+    long = frame.melt(
+        id_vars=["device_id", "bucket_ts"],
+        value_vars=metrics,
+        var_name="metric",
+        value_name="value",
+    ).dropna(subset=["value"])
+    long["value"] = long["value"].astype("float64")
+    long["value_sq"] = long["value"] ** 2
+
+    stats = (
+        long.groupby(ROLLUP_KEYS)
+        .agg(
+            value_count=("value", "size"),
+            value_sum=("value", "sum"),
+            value_min=("value", "min"),
+            value_max=("value", "max"),
+            value_sum_sq=("value_sq", "sum"),
+        )
+        .reset_index()
+    )
+    return stats.merge(minute_counts, on=["device_id", "bucket_ts"], how="left")[
+        ROLLUP_KEYS + ["minute_count"] + STAT_FIELDS
+    ]
+
+
+def merge_rollups(*frames: pd.DataFrame) -> pd.DataFrame:
+    """Combine partial rollups for the same buckets (associative and commutative)."""
+    parts = [f for f in frames if f is not None and not f.empty]
+    if not parts:
+        return empty_rollups()
+    combined = pd.concat(parts, ignore_index=True)
+    merged = (
+        combined.groupby(ROLLUP_KEYS)
+        .agg(
+            minute_count=("minute_count", "sum"),
+            value_count=("value_count", "sum"),
+            value_sum=("value_sum", "sum"),
+            value_min=("value_min", "min"),
+            value_max=("value_max", "max"),
+            value_sum_sq=("value_sum_sq", "sum"),
+        )
+        .reset_index()
+    )
+    # A bucket's minute_count is shared by all of its metrics; keep the widest view.
+    merged["minute_count"] = merged.groupby(["device_id", "bucket_ts"])["minute_count"].transform("max")
+    return merged
+
+
+def rollups_to_wide(rollups: pd.DataFrame) -> pd.DataFrame:
+    """Pivot long rollups to one row per bucket with <metric>_{count,mean,std,min,max} columns."""
+    if rollups.empty:
+        return pd.DataFrame(columns=["device_id", "bucket_ts", "minute_count"])
+
+    stats = rollups.copy()
+    count = stats["value_count"].astype("float64")
+    stats["count"] = stats["value_count"]
+    stats["mean"] = stats["value_sum"] / count
+    variance = (stats["value_sum_sq"] / count) - stats["mean"] ** 2
+    stats["std"] = np.sqrt(variance.clip(lower=0.0))
+    stats["min"] = stats["value_min"]
+    stats["max"] = stats["value_max"]
+
+    wide = stats.pivot_table(
+        index=["device_id", "bucket_ts"],
+        columns="metric",
+        values=["count", "mean", "std", "min", "max"],
+        aggfunc="first",
+    )
+    wide.columns = [f"{metric}_{stat}" for stat, metric in wide.columns]
+    wide = wide[sorted(wide.columns)]
+
+    minute_counts = stats.groupby(["device_id", "bucket_ts"])["minute_count"].max()
+    wide.insert(0, "minute_count", minute_counts)
+    return wide.reset_index()
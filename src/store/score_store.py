@@ -0,0 +1,111 @@
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+SCORE_KEY = "window_end"
+PARTITION_FILE = "scores.parquet"
+
+
+def _utc(values) -> pd.DatetimeIndex:
+    ts = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    return ts.as_unit("ns")
+
+
+def _month_dir(root: Path, month: str) -> Path:
+    return root / f"month={month}"
+
+
+def list_partitions(root) -> List[str]:
+    """Months present in the store, oldest first ("YYYY-MM")."""
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p.name.split("=", 1)[1] for p in root.glob("month=*") if (p / PARTITION_FILE).exists())
+
+
+def _read_partition(root: Path, month: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    frame = pd.read_parquet(_month_dir(root, month) / PARTITION_FILE, columns=list(columns) if columns else None)
+    if SCORE_KEY in frame.columns:
+        frame[SCORE_KEY] = _utc(frame[SCORE_KEY])
+    return frame
+
+
+def write_scores(root, scores: pd.DataFrame) -> int:
+    """Upsert score rows keyed by window_end into the month-partitioned Parquet store.
+
+    Rows for a window_end already in the store replace the stored ones, so a
+    partial rerun of any upstream stage is merged without rewriting other months.
+    Returns the number of rows written.
+    """
+    if scores.empty:
+        return 0
+    root = Path(root)
+    frame = scores.copy()
+    frame[SCORE_KEY] = _utc(frame[SCORE_KEY])
+    frame = frame.drop_duplicates(subset=[SCORE_KEY], keep="last")
+    months = frame[SCORE_KEY].dt.strftime("%Y-%m")
+
+    existing = set(list_partitions(root))
+    for month, part in frame.groupby(months, sort=True):
+        if month in existing:
+            part = pd.concat([_read_partition(root, month), part], ignore_index=True)
+            part = part.drop_duplicates(subset=[SCORE_KEY], keep="last")
+        part = part.sort_values(SCORE_KEY).reset_index(drop=True)
+
+        target = _month_dir(root, month) / PARTITION_FILE
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        part.to_parquet(tmp, index=False)
+        tmp.replace(target)
+    return len(frame)
+
+
+def read_scores(root, start=None, end=None, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Scores with start <= window_end <= end (UTC), sorted by window_end; only overlapping months are read."""
+    root = Path(root)
+    start = None if start is None else _utc([start])[0]
+    end = None if end is None else _utc([end])[0]
+    columns = None if columns is None else [SCORE_KEY] + [c for c in columns if c != SCORE_KEY]
+
+    months = list_partitions(root)
+    if start is not None:
+        months = [m for m in months if m >= start.strftime("%Y-%m")]
+    if end is not None:
+        months = [m for m in months if m <= end.strftime("%Y-%m")]
+    if not months:
+        return pd.DataFrame({SCORE_KEY: pd.DatetimeIndex([], tz="UTC")})
+
+    frame = pd.concat([_read_partition(root, m, columns) for m in months], ignore_index=True)
+    if start is not None:
+        frame = frame[frame[SCORE_KEY] >= start]
+    if end is not None:
+        frame = frame[frame[SCORE_KEY] <= end]
+    return frame.sort_values(SCORE_KEY).reset_index(drop=True)
+
+
+def last_window_end(root) -> Optional[pd.Timestamp]:
+    months = list_partitions(root)
+    if not months:
+        return None
+    latest = _read_partition(Path(root), months[-1], columns=[SCORE_KEY])
+    return latest[SCORE_KEY].max() if not latest.empty else None
+
+
+def join_scores(
+    df: pd.DataFrame,
+    scores: pd.DataFrame,
+    on: str = "datetime",
+    columns: Optional[Iterable[str]] = None,
+    how: str = "inner",
+) -> pd.DataFrame:
+    """Attach score columns to `df` by matching df[on] to window_end at the same instant.
+
+    `df[on]` may be in any timezone; it is compared in UTC and left unchanged in
+    the result. how="inner" keeps only rows that have a score.
+    """
+    columns = [c for c in (columns or scores.columns) if c != SCORE_KEY]
+    right = scores[[SCORE_KEY] + columns].set_index(SCORE_KEY)
+    keys = _utc(df[on])
+    joined = df.set_axis(keys).join(right, how=how)
+    return joined.reset_index(drop=True)
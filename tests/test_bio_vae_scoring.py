@@ -0,0 +1,53 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.scoring import pending_windows, score_new_windows
+from store.score_store import read_scores
+
+BIO_FEATURES = ["stress_level", "heart_rate"]
+TIMESTEPS = 5
+
+
+class MeanErrorVAE:
+    """Stands in for NumpyBioVAE: the error of a window is its mean value."""
+
+    def reconstruction_errors(self, windows, batch_size=4096):
+        return windows.mean(axis=(1, 2))
+
+
+def write_naive_csv(path, minutes=30):
+    # Naive timestamps, as in a Cassandra export's minute_ts
+    frame = pd.DataFrame({
+        "datetime": pd.date_range("2024-03-01 10:00", periods=minutes, freq="1min").strftime("%Y-%m-%d %H:%M:%S"),
+        "stress_level": np.linspace(0.0, 1.0, minutes),
+        "heart_rate": np.linspace(1.0, 0.0, minutes),
+    })
+    frame.to_csv(path, index=False)
+    return path
+
+
+def test_pending_windows_reads_naive_times_as_utc(tmp_path):
+    csv = write_naive_csv(tmp_path / "naive.csv")
+    _, starts, ends = pending_windows(csv, BIO_FEATURES, TIMESTEPS)
+    assert len(starts) == 30 - TIMESTEPS + 1
+    assert str(ends.tz) == "UTC"
+    assert ends[0] == pd.Timestamp("2024-03-01 10:04", tz="UTC")
+
+
+def test_score_new_windows_on_naive_csv(tmp_path):
+    csv = write_naive_csv(tmp_path / "naive.csv")
+    store = tmp_path / "scores"
+    config = {"timesteps": TIMESTEPS, "bio_features": BIO_FEATURES, "scaling_factor": 10.0}
+
+    assert score_new_windows(MeanErrorVAE(), config, csv, scores_path=store) == 26
+    # A second run finds nothing newer than the last scored window
+    assert score_new_windows(MeanErrorVAE(), config, csv, scores_path=store) == 0
+
+    scores = read_scores(store)
+    assert len(scores) == 26
+    np.testing.assert_allclose(scores["bio_stability_score"], 95.0, rtol=1e-6)
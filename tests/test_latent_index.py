@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bio_vae.latent_index import latents_fingerprint, load_latents, update_latents
+from bio_vae.numpy_inference import NumpyBioVAE
+
+BIO_FEATURES = ["stress_level", "heart_rate"]
+TIMESTEPS = 5
+
+
+def make_model(seed, hidden=4, latent=2):
+    rng = np.random.default_rng(seed)
+    inputs = TIMESTEPS * len(BIO_FEATURES)
+    weights = {
+        "encoder_hidden/kernel": rng.normal(size=(inputs, hidden)), "encoder_hidden/bias": np.zeros(hidden),
+        "z_mean/kernel": rng.normal(size=(hidden, latent)), "z_mean/bias": np.zeros(latent),
+    }
+    return NumpyBioVAE(weights, {"timesteps": TIMESTEPS, "bio_features": BIO_FEATURES})
+
+
+def write_naive_csv(path, minutes):
+    pd.DataFrame({
+        "datetime": pd.date_range("2024-03-01 10:00", periods=minutes, freq="1min").strftime("%Y-%m-%d %H:%M:%S"),
+        "stress_level": np.linspace(0.0, 1.0, minutes),
+        "heart_rate": np.linspace(1.0, 0.0, minutes),
+    }).to_csv(path, index=False)
+    return path
+
+
+def test_update_appends_naive_minutes(tmp_path):
+    latents = tmp_path / "latents.npz"
+    model = make_model(0)
+    assert update_latents(model, write_naive_csv(tmp_path / "a.csv", 20), path=latents) == 16
+    assert update_latents(model, write_naive_csv(tmp_path / "b.csv", 30), path=latents) == 10
+    z_mean, window_end = load_latents(latents)
+    assert z_mean.shape == (26, 2) and window_end.is_monotonic_increasing
+    assert latents_fingerprint(latents) == model.fingerprint
+
+
+def test_update_refuses_latents_of_another_model(tmp_path):
+    latents = tmp_path / "latents.npz"
+    csv = write_naive_csv(tmp_path / "a.csv", 20)
+    update_latents(make_model(0), csv, path=latents)
+
+    retrained = make_model(1)
+    with pytest.raises(ValueError):
+        update_latents(retrained, csv, path=latents)
+    assert update_latents(retrained, csv, path=latents, rebuild=True) == 16
+    assert latents_fingerprint(latents) == retrained.fingerprint